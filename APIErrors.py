@@ -26,5 +26,6 @@ class RealtimeNotDefinedError(__APIError):  pass
 class TROutputTypeError(__APIError):    pass
 class RqIdNotExistError(__APIError):    pass
 class TimeOutError(__APIError):         pass
+class TRCreationError(__APIError):      pass
 
 
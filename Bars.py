@@ -0,0 +1,216 @@
+import time
+
+import numpy as np
+
+from . import Logger, Decoders, TRRT
+
+
+def seconds_of_day(hhmmss: str) -> int:
+    """ 체결시간('HHMMSS', 'HHMMSSss', 'HH:MM:SS') -> 0시부터의 초. 읽을 수 없으면 None """
+    digits = str(hhmmss).replace(':', '').strip()[:6]
+    if len(digits) < 6 or not digits.isdigit():
+        return None
+    return int(digits[:2]) * 3600 + int(digits[2:4]) * 60 + int(digits[4:6])
+
+
+def _to_float(value) -> float:
+    return Decoders.parse_float(value) if isinstance(value, str) else float(value)
+
+
+def _to_int(value) -> int:
+    return Decoders.parse_int(value) if isinstance(value, str) else int(value)
+
+
+class _Bar:
+    __slots__ = ('date', 'key', 'start', 'open', 'high', 'low', 'close', 'volume', 'amount', 'n_ticks')
+
+    def __init__(self, date: str, key: int, start: int, price: float):
+        self.date, self.key, self.start = date, key, start
+        self.open = self.high = self.low = self.close = price
+        self.volume, self.amount, self.n_ticks = 0, 0, 0
+
+
+class _CodeState:
+    __slots__ = ('bar', 'cum_volume', 'cum_amount', 'bars')
+
+    def __init__(self):
+        self.bar: _Bar = None
+        self.cum_volume, self.cum_amount = None, None
+        self.bars = []      # 완성된 봉 (dtype 순서의 tuple)
+
+
+class BarAggregator:
+    """
+    실시간 체결 tick(SC, FC, QC, LC 등)으로 code별 OHLCV 봉을 만든다.
+    봉의 dtype은 차트 TR(기본 TR_SCHART)의 multi_output dtype과 같아서, 차트 TR로 받은 당일 데이터에 이어붙일 수 있다.
+    - seconds : N초 봉 (60 = 1분 봉), ticks : N틱 봉 (둘 중 하나만 지정)
+    - 봉의 일자/시간은 봉의 시작 시각이다. (틱 봉은 첫 tick의 체결시간)
+    - 거래량/거래대금은 누적거래량/누적거래대금의 차이로 계산한다. (code의 첫 tick은 단위체결량)
+    - 체결시간이 현재 봉보다 이른(지연/역순) tick은 현재 봉에 포함하며, 이미 완성된 봉은 바꾸지 않는다.
+    - 봉은 다음 봉 구간의 tick이 오거나 close_due()/flush()를 호출하면 완성되어 subscribe()한 callback에 전달된다.
+    - 실시간 tick에는 일자가 없으므로 봉의 일자는 clock()의 시각으로 정한다. Replay에는 clock=replay.clock을 지정한다.
+    realtime instance의 구독에 연결하여 사용한다. ex) sc.subscribe(bar_aggregator.on_tick)
+    """
+    TIME_FIELD = '체결시간'
+    PRICE_FIELD = '현재가'
+    CUM_VOLUME_FIELD = '누적거래량'
+    CUM_AMOUNT_FIELD = '누적거래대금'
+    UNIT_VOLUME_FIELD = '단위체결량'
+
+    def __init__(self, seconds: int = None, ticks: int = None, dtype: np.dtype = None, clock=None):
+        """ :param clock: 현재 시각(time.time() 형식)을 반환하는 함수 (기본값 time.time, 재생 시 replay.clock) """
+        if (seconds is None) == (ticks is None):
+            raise ValueError("BarAggregator : specify exactly one of seconds or ticks")
+        self.seconds, self.ticks = seconds, ticks
+        self.clock = time.time if clock is None else clock
+        self.dtype = TRRT.TR_SCHART.get_multi_decoder().dtype if dtype is None else dtype
+        names = self.dtype.names
+        self._time_field = next(name for name in ('시간', '체결시간') if name in names)
+        self._close_field = '종가' if '종가' in names else '현재가'
+        self._defaults = {name: np.zeros([], dtype=self.dtype[name]).item() for name in names}
+        self._defaults.update({'주가수정계수': 1., '거래량수정계수': 1.})
+        self._states = {}
+        self._callbacks = []
+
+    @classmethod
+    def for_chart(cls, chart_tr_cls, seconds: int = None, ticks: int = None, clock=None) -> 'BarAggregator':
+        """ 차트 TR class(ex. api.TR_FCHART)의 multi_output dtype으로 봉을 만든다. """
+        return cls(seconds, ticks, chart_tr_cls.get_multi_decoder().dtype, clock)
+
+    def subscribe(self, callback) -> None:
+        """ 봉이 완성되면 callback(code, bar)을 호출한다. (bar : shape [1] 배열) """
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def on_tick(self, code: str, tick: np.ndarray) -> None:
+        """ BaseRealtime.subscribe(batch=False) callback 형식 """
+        self.update(code, tick[0], self.clock())
+
+    def on_ticks(self, codes: list, ticks: np.ndarray) -> None:
+        """ BaseRealtime.subscribe(batch=True) callback 형식 """
+        now = self.clock()
+        for code, tick in zip(codes, ticks):
+            self.update(code, tick, now)
+
+    def update(self, code: str, tick, rcv_time: float = None) -> None:
+        """
+        tick 하나를 반영한다.
+        :param tick: 실시간 데이터의 record (체결시간, 현재가, 누적거래량, 누적거래대금, 단위체결량 field)
+        :param rcv_time: 수신시각. 봉의 일자와, 체결시간을 읽을 수 없을 때의 시간에 사용한다. (기본값 clock())
+        """
+        rcv_time = self.clock() if rcv_time is None else rcv_time
+        local = time.localtime(rcv_time)
+        date = time.strftime('%Y%m%d', local)
+        second = seconds_of_day(tick[self.TIME_FIELD])
+        if second is None:
+            second = local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec
+        price = _to_float(tick[self.PRICE_FIELD])
+
+        state = self._states.get(code)
+        if state is None:
+            state = self._states[code] = _CodeState()
+        volume, amount = self._volume_amount(state, tick, price)
+
+        bar = state.bar
+        if self.seconds is not None:
+            key = second // self.seconds
+            if bar is not None and (date, key) > (bar.date, bar.key):
+                self._close(code, state)
+                bar = None
+            if bar is None:
+                bar = state.bar = _Bar(date, key, key * self.seconds, price)
+        else:
+            if bar is not None and (bar.n_ticks >= self.ticks or date > bar.date):
+                self._close(code, state)
+                bar = None
+            if bar is None:
+                bar = state.bar = _Bar(date, 0, second, price)
+
+        if price > bar.high:
+            bar.high = price
+        if price < bar.low:
+            bar.low = price
+        bar.close = price
+        bar.volume += volume
+        bar.amount += amount
+        bar.n_ticks += 1
+
+    def _volume_amount(self, state: _CodeState, tick, price: float) -> tuple:
+        cum_volume = _to_int(tick[self.CUM_VOLUME_FIELD])
+        cum_amount = _to_int(tick[self.CUM_AMOUNT_FIELD])
+        if state.cum_volume is None or cum_volume < state.cum_volume:
+            # code의 첫 tick 또는 누적값 초기화(장 변경 등)
+            volume = _to_int(tick[self.UNIT_VOLUME_FIELD])
+            amount = int(price * volume)
+        else:
+            volume = cum_volume - state.cum_volume
+            amount = max(0, cum_amount - state.cum_amount)
+        state.cum_volume, state.cum_amount = cum_volume, cum_amount
+        return volume, amount
+
+    def _to_record(self, bar: _Bar) -> tuple:
+        start = bar.start
+        values = dict(self._defaults)
+        values.update({
+            '일자': bar.date,
+            self._time_field: f'{start // 3600:02d}{start // 60 % 60:02d}{start % 60:02d}',
+            '시가': bar.open, '고가': bar.high, '저가': bar.low, self._close_field: bar.close,
+            '단위거래량': bar.volume, '단위거래대금': bar.amount,
+        })
+        return tuple(values[name] for name in self.dtype.names)
+
+    def _close(self, code: str, state: _CodeState) -> None:
+        record = self._to_record(state.bar)
+        state.bar = None
+        state.bars.append(record)
+        if self._callbacks:
+            bar = np.array([record], dtype=self.dtype)
+            for callback in self._callbacks:
+                try:
+                    callback(code, bar)
+                except Exception as e:
+                    Logger.write_log(f"BarAggregator : {callback!r} raised an exception", repr(e))
+
+    def close_due(self, now: float = None) -> None:
+        """ 시간 봉 중 now(기본값 clock())에 이미 끝난 봉을 완성한다. (tick이 뜸한 code용, timer로 호출) """
+        if self.seconds is None:
+            return
+        now = self.clock() if now is None else now
+        local = time.localtime(now)
+        date = time.strftime('%Y%m%d', local)
+        second = local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec
+        for code, state in self._states.items():
+            bar = state.bar
+            if bar is not None and (bar.date < date or bar.start + self.seconds <= second):
+                self._close(code, state)
+
+    def flush(self, code: str = None) -> None:
+        """ 진행 중인 봉을 완성한다. (장 종료 등) """
+        for bar_code, state in self._states.items():
+            if state.bar is not None and (code is None or bar_code == code):
+                self._close(bar_code, state)
+
+    def bars(self, code: str, include_current: bool = False) -> np.ndarray:
+        """ code의 완성된 봉 (시간순, 차트 TR의 multi_output과 같은 dtype) """
+        state = self._states.get(code)
+        if state is None:
+            return np.empty([0], dtype=self.dtype)
+        records = state.bars
+        if include_current and state.bar is not None:
+            records = records + [self._to_record(state.bar)]
+        return np.array(records, dtype=self.dtype)
+
+    def extend(self, history: np.ndarray, code: str) -> np.ndarray:
+        """ 차트 TR로 받은 history(시간순) 뒤에 code의 봉(history 이후 구간)을 이어붙인다. """
+        bars = self.bars(code)
+        if len(history) and len(bars):
+            last = np.char.add(history['일자'][-1:], history[self._time_field][-1:])[0]
+            bars = bars[np.char.add(bars['일자'], bars[self._time_field]) > last]
+        extended = np.empty([len(history) + len(bars)], dtype=self.dtype)
+        for name in self.dtype.names:
+            extended[name][:len(history)] = history[name]
+        extended[len(history):] = bars
+        return extended
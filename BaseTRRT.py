@@ -1,8 +1,17 @@
+import time
+import asyncio
+import threading
+from functools import partial
+
 import numpy as np
-from time import time
-import pythoncom
+try:
+    from PyQt5.QtCore import QEventLoop, QTimer
+except ImportError:
+    # PyQt5가 없는 환경(Linux 등) : Replay 등 Qt/COM을 쓰지 않는 기능만 사용할 수 있다.
+    QEventLoop = QTimer = None
 
-from . import APIErrors, Logger
+from . import APIErrors, Logger, Config, Scheduler, Decoders, Cache, TickStore, Recorder
+from .ParameterBooks import InputParameterBook as Ibook
 
 try:
     import TelegramBot
@@ -15,6 +24,236 @@ except ImportError:
     channel_id = ""
 
 
+def read_multi_raw(indi_instance, n_fields: int) -> list:
+    """
+    수신된 멀티데이터의 원(raw) 문자열 값을 column 단위로 읽는다.
+    서버는 최신 데이터부터 보내므로 역순으로 읽어 시간순으로 반환한다.
+    """
+    call = indi_instance.dynamicCall
+    nCnt = call("GetMultiRowCount()")
+    rows = range(nCnt - 1, -1, -1)
+    return [[call("GetMultiData(int, int)", i, j) for i in rows] for j in range(n_fields)]
+
+
+def read_single_raw(indi_instance, n_fields: int, indexes: list = None) -> list:
+    """
+    수신된 싱글데이터의 원(raw) 문자열 값을 읽는다.
+    indexes를 지정하면 해당 field만 읽고, 나머지 field는 ''로 채운다.
+    """
+    call = indi_instance.dynamicCall
+    if indexes is None:
+        return [call("GetSingleData(int)", j) for j in range(n_fields)]
+    single_raw = [''] * n_fields
+    for j in indexes:
+        single_raw[j] = call("GetSingleData(int)", j)
+    return single_raw
+
+
+def read_multi_columns(indi_instance, plan: Decoders.DecoderPlan) -> np.ndarray:
+    """
+    수신된 멀티데이터를 column 단위로 읽어 structured array를 한 번에 만든다.
+    cell마다 numpy scalar에 대입하는 대신 column별로 값을 모아 plan으로 한 번에 변환하며,
+    시간순, C-contiguous 배열을 반환한다.
+    """
+    return plan.decode_columns(read_multi_raw(indi_instance, len(plan)))
+
+
+def read_single_row(indi_instance, plan: Decoders.DecoderPlan) -> tuple:
+    """ 수신된 싱글데이터를 읽어 structured array의 한 행(tuple)으로 변환한다. """
+    return plan.decode_row(read_single_raw(indi_instance, len(plan)))
+
+
+class ResponseWaiter:
+    """
+    응답 대기 primitive.
+    PumpWaitingMessages() busy-spin 대신 local QEventLoop에서 메시지 큐를 block하며 대기하고,
+    set()(응답 수신) 또는 timeout 시 깨어난다.
+    """
+
+    def __init__(self):
+        self.is_set: bool = False
+        self._loop = None
+
+    def set(self) -> None:
+        self.is_set = True
+        if self._loop is not None:
+            self._loop.quit()
+
+    def clear(self) -> None:
+        self.is_set = False
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        set() 되거나 timeout(초)이 지날 때까지 대기한다.
+        :return: set 여부 (False이면 timeout)
+        """
+        if self.is_set:
+            return True
+        self._loop = QEventLoop()
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(self._loop.quit)
+        if timeout is not None:
+            timer.start(int(timeout * 1000))
+        self._loop.exec_()
+        timer.stop()
+        self._loop = None
+        return self.is_set
+
+
+class TRFuture:
+    """
+    비동기 TR 요청(BaseTR.rq_data_async)의 결과 객체.
+    응답은 요청별 output buffer(single_output / multi_output)로 decode되며,
+    Core의 TR 수신 핸들러가 proc_rcvd_data()를 호출하여 resolve한다.
+    """
+
+    def __init__(self, tr_inst: 'BaseTR'):
+        self.tr_inst = tr_inst
+        self.rqid: int = None
+        self.single_output: np.ndarray = None
+        self.multi_output: np.ndarray = None
+        self._done: bool = False
+        self._exception: Exception = None
+        self._callbacks = []
+        self._sent_callbacks = []
+        self._waiter = ResponseWaiter()
+        self._sent_waiter = ResponseWaiter()
+        self._primary: 'TRFuture' = None
+
+    def _set_sent(self, rqid: int) -> None:
+        """ scheduler queue를 떠나 RequestData()로 요청이 전송되었음을 기록한다. """
+        self.rqid = rqid
+        self._fire_sent()
+
+    def _fire_sent(self) -> None:
+        self._sent_waiter.set()
+        callbacks, self._sent_callbacks = self._sent_callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def _follow(self, primary: 'TRFuture') -> None:
+        """ 동일한 in-flight 요청(primary)에 합류하여, primary의 결과를 복사본으로 받는다. (coalescing) """
+        self._primary = primary
+        if primary.rqid is not None:
+            self._set_sent(primary.rqid)
+        else:
+            primary._sent_callbacks.append(lambda p: self._set_sent(p.rqid))
+        primary.add_done_callback(self._copy_result)
+
+    def _copy_result(self, primary: 'TRFuture') -> None:
+        if self._done:
+            return
+        if primary._exception is not None:
+            self.set_exception(primary._exception)
+        else:
+            self.set_result(None if primary.single_output is None else primary.single_output.copy(),
+                            None if primary.multi_output is None else primary.multi_output.copy())
+
+    def proc_rcvd_data(self) -> None:
+        """ 수신된 데이터를 본 요청의 output buffer로 decode한다. """
+        try:
+            self.single_output, self.multi_output = self.tr_inst._read_rcvd_data()
+        except Exception as e:
+            self.set_exception(e)
+        else:
+            self._set_done()
+
+    def set_result(self, single_output: np.ndarray, multi_output: np.ndarray) -> None:
+        """ 서버 요청 없이 주어진 output으로 resolve한다. (ex. cache 적중) """
+        self.single_output, self.multi_output = single_output, multi_output
+        self._set_done()
+
+    def set_exception(self, exception: Exception) -> None:
+        self._exception = exception
+        self._set_done()
+
+    def _set_done(self) -> None:
+        self._done = True
+        self._waiter.set()
+        self._fire_sent()
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def done(self) -> bool:
+        return self._done
+
+    def add_done_callback(self, fn) -> None:
+        """ 응답 수신(또는 실패) 시 fn(future)를 호출한다. 이미 완료된 경우 즉시 호출한다. """
+        if self._done:
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def cancel(self) -> bool:
+        """ 아직 응답을 받지 못한 요청을 취소한다. 이후 도착하는 응답은 무시된다. """
+        if self._done:
+            return False
+        if self.rqid is not None and self._primary is None:
+            self.tr_inst._indi_instance._rqidD.pop(self.rqid, None)
+        self.set_exception(APIErrors.NoResponseError(f"rqid : {self.rqid} tr_name: {self.tr_inst.NAME} is cancelled"))
+        return True
+
+    def exception(self, timeout: float = None) -> Exception:
+        self._wait(timeout)
+        return self._exception
+
+    def result(self, timeout: float = None):
+        """
+        응답을 수신할 때까지 대기한 후 output을 반환한다.
+        output의 형태는 BaseTR.rq_data()와 같다.
+        timeout(초) 내에 응답이 없으면 TimeOutError를 발생시킨다.
+        """
+        self._wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self.tr_inst._pack_output(self.single_output, self.multi_output)
+
+    def __await__(self):
+        """ asyncio coroutine에서 await future 로 결과를 기다릴 수 있다. """
+        return self._as_asyncio_future().__await__()
+
+    def _as_asyncio_sent(self) -> asyncio.Future:
+        """ 요청이 전송(또는 완료)되면 resolve되는 asyncio future """
+        loop = asyncio.get_running_loop()
+        aio_future = loop.create_future()
+
+        def _resolve(aio_future: asyncio.Future) -> None:
+            if not aio_future.done():
+                aio_future.set_result(self.rqid)
+
+        if self.rqid is not None or self._done:
+            _resolve(aio_future)
+        else:
+            self._sent_callbacks.append(lambda _: loop.call_soon_threadsafe(_resolve, aio_future))
+        return aio_future
+
+    def _as_asyncio_future(self) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        aio_future = loop.create_future()
+
+        def _resolve(aio_future: asyncio.Future) -> None:
+            if aio_future.done():
+                return
+            if self._exception is not None:
+                aio_future.set_exception(self._exception)
+            else:
+                aio_future.set_result(self.tr_inst._pack_output(self.single_output, self.multi_output))
+
+        self.add_done_callback(lambda _: loop.call_soon_threadsafe(_resolve, aio_future))
+        return aio_future
+
+    def _wait(self, timeout: float = None) -> None:
+        # scheduler queue에서 대기하는 시간은 timeout에 포함하지 않는다.
+        while self.rqid is None and not self._done:
+            self._sent_waiter.wait()
+        if not self._done and not self._waiter.wait(timeout):
+            tr_inst = self.tr_inst
+            raise APIErrors.TimeOutError(
+                f'A TimeOutError has occured. rqid : {self.rqid} str_name: {tr_inst._indi_instance._owner} tr_name: {tr_inst.NAME}')
+
+
 class Base:
     NAME, DESCRIPTION = None, None
     IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, False
@@ -30,10 +269,28 @@ class Base:
         self.INSTANCES[self.NAME] = self
 
     def _initialize_base(self):
-        if self.IS_SINGLE_OUTPUT:
-            self.single_output: np.ndarray = np.empty([1], dtype=self.SINGLE_OUTPUT_DTYPE)
-        if self.IS_MULTI_OUTPUT:
-            self.multi_output: np.ndarray = np.empty([1], dtype=self.MULTI_OUTPUT_DTYPE)        
+        if self.IS_SINGLE_OUTPUT and self.SINGLE_OUTPUT_DTYPE is not None:
+            self.single_output: np.ndarray = np.empty([1], dtype=self.get_single_decoder().dtype)
+        if self.IS_MULTI_OUTPUT and self.MULTI_OUTPUT_DTYPE is not None:
+            self.multi_output: np.ndarray = np.empty([1], dtype=self.get_multi_decoder().dtype)
+
+    @classmethod
+    def get_single_decoder(cls) -> Decoders.DecoderPlan:
+        """ SINGLE_OUTPUT_DTYPE의 DecoderPlan. class별로 처음 사용할 때 만들고 재사용한다. """
+        plan = cls.__dict__.get('_single_decoder')
+        if plan is None:
+            plan = Decoders.get_plan(cls.SINGLE_OUTPUT_DTYPE)
+            cls._single_decoder = plan
+        return plan
+
+    @classmethod
+    def get_multi_decoder(cls) -> Decoders.DecoderPlan:
+        """ MULTI_OUTPUT_DTYPE의 DecoderPlan. class별로 처음 사용할 때 만들고 재사용한다. """
+        plan = cls.__dict__.get('_multi_decoder')
+        if plan is None:
+            plan = Decoders.get_plan(cls.MULTI_OUTPUT_DTYPE)
+            cls._multi_decoder = plan
+        return plan
 
 
 class BaseTR(Base):
@@ -43,6 +300,9 @@ class BaseTR(Base):
     Override할 variables : class variables
     Override할 methods : _set_input_data()
     """
+    RQ_PRIORITY = Scheduler.PRIORITY_NORMAL
+    CACHE_TTL = None    # 응답 cache TTL (초 또는 Cache.TTL_TRADING_DAY). None이면 cache하지 않는다.
+    COALESCE = True     # 동일한(NAME, 입력값) in-flight 요청을 하나로 합쳐 보낸다. 주문 TR은 False
 
     def __init__(self, indi_instance, implicit_wait: int = 3, *args, **kwargs):
         super().__init__(indi_instance, *args, **kwargs)
@@ -51,91 +311,158 @@ class BaseTR(Base):
         self._initialize_tr_inst()
 
     def _initialize_tr_inst(self):
+        if not (self.IS_SINGLE_OUTPUT or self.IS_MULTI_OUTPUT):
+            raise APIErrors.TRCreationError(
+                f"{self.__class__.__name__} : Both IS_SINGLE_OUTPUT and IS_MULTI_OUTPUT are Falses")
 
-        if self.IS_SINGLE_OUTPUT:
-            if self.IS_MULTI_OUTPUT:
-                self.proc_rcvd_data = self._proc_rcvd_single_multi_data
-            else:
-                self.proc_rcvd_data = self._proc_rcvd_single_data
-        else:
-            if self.IS_MULTI_OUTPUT:
-                self.proc_rcvd_data = self._proc_rcvd_multi_data
-            else:
-                raise APIErrors.TRCreationError(
-                    f"{self.__class__.__name__} : Both IS_SINGLE_OUTPUT and IS_MULTI_OUTPUT are Falses")
-
-    def _proc_rcvd_single_data(self) -> None:
-        self._get_rcvd_single_data()
-        self.is_waiting = False
-
-    def _proc_rcvd_multi_data(self) -> None:
-        self._get_rcvd_multi_data()
-        self.is_waiting = False
-
-    def _proc_rcvd_single_multi_data(self) -> None:
-        self._get_rcvd_single_data()
-        self._get_rcvd_multi_data()
-        self.is_waiting = False
+    def _read_rcvd_data(self) -> tuple:
+        """
+        수신된 데이터를 새 output buffer로 decode한다.
+        :return: (single_output, multi_output) - 제공되지 않는 output은 None
+        """
+        single_output = self._read_single_data() if self.IS_SINGLE_OUTPUT else None
+        multi_output = self._read_multi_data() if self.IS_MULTI_OUTPUT else None
+        return single_output, multi_output
 
-    def _get_rcvd_single_data(self) -> None:
+    def _read_single_data(self) -> np.ndarray:
         """
         싱글데이터(single_data)를 수신(received)한 경우의 처리 루틴
-        :param indi_inst: tr_instance
-        :return:    None
+        :return:    single_output (shape [1])
         """
-        for j in range(len(self.SINGLE_OUTPUT_DTYPE)):
-            self.single_output[0][j] = self._indi_instance.dynamicCall("GetSingleData(int)", j)
-        return
+        plan = self.get_single_decoder()
+        single_output = np.empty([1], dtype=plan.dtype)
+        single_output[0] = read_single_row(self._indi_instance, plan)
+        return single_output
 
-    def _get_rcvd_multi_data(self) -> None:
+    def _read_multi_data(self) -> np.ndarray:
         """
         멀티데이터(multi_data)를 수신(Received)한 경우의 처리 루틴
-        :param indi_inst:
-        :return:
+        :return:    multi_output (shape [nCnt], 시간순)
         """
-        nCnt = self._indi_instance.dynamicCall("GetMultiRowCount()")
-        if self.multi_output.shape[0] != nCnt:
-            del self.multi_output
-            self.multi_output = np.empty([nCnt], dtype=self.MULTI_OUTPUT_DTYPE)
-        for i in range(nCnt):
-            for j in range(len(self.MULTI_OUTPUT_DTYPE)):
-                self.multi_output[i][j] = self._indi_instance.dynamicCall("GetMultiData(int, int)", i, j)
-        self.multi_output = self.multi_output[::-1]
-        return
+        return read_multi_columns(self._indi_instance, self.get_multi_decoder())
 
     def rq_data(self, *args, **kwargs):
         """
-        데이터를 요청한다.
-
+        데이터를 요청하고, 응답을 수신할 때까지 대기한다.
+        수신한 데이터는 self.single_output / self.multi_output에 저장된다.
         """
-        #self._pre_rq_func()
-        #self._set_input_data(*args, **kwargs)
-        #rqid = self._indi_instance.dynamicCall("RequestData()")
-        #self._post_rq_func(rqid)
-        #return self._get_output_data()
         try:
-            self._pre_rq_func()
-            self._set_input_data(*args, **kwargs)
-            rqid = self._indi_instance.dynamicCall("RequestData()")
-            self._post_rq_func(rqid)
-            return self._get_output_data()
+            return self._rq_data(*args, **kwargs)
         except APIErrors.TimeOutError as toe:
             print(toe)
-            self._pre_rq_func()
-            self._set_input_data(*args, **kwargs)
-            rqid = self._indi_instance.dynamicCall("RequestData()")
-            self._post_rq_func(rqid)
-            return self._get_output_data()
+            return self._rq_data(*args, **kwargs)
+
+    def _rq_data(self, *args, **kwargs):
+        future = self.rq_data_async(*args, **kwargs)
+        self.is_waiting = True
+        try:
+            future.result(self.implicit_wait)
+        except APIErrors.TimeOutError as toe:
+            # implicit_wait 초 이상 응답 안오면 에러로 간주
+            future.cancel()
+            bot.sendMessage(chat_id=channel_id, text=toe.message)
+            raise
+        finally:
+            self.is_waiting = False
+        if self.IS_SINGLE_OUTPUT:
+            self.single_output = future.single_output
+        if self.IS_MULTI_OUTPUT:
+            self.multi_output = future.multi_output
+        return self._get_output_data()
+
+    async def arq_data(self, *args, **kwargs):
+        """
+        rq_data()의 asyncio 버전. (await tr.arq_data(...))
+        Core.run_async()로 구동되는 이벤트 루프에서 사용하며, 대기 중에도 다른 요청/실시간 처리가 block되지 않는다.
+        """
+        future = self.rq_data_async(*args, **kwargs)
+        # scheduler queue에서 대기하는 시간은 timeout에 포함하지 않는다.
+        await future._as_asyncio_sent()
+        try:
+            return await asyncio.wait_for(future._as_asyncio_future(), self.implicit_wait)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise APIErrors.TimeOutError(
+                f'A TimeOutError has occured. rqid : {future.rqid} str_name: {self._indi_instance._owner} tr_name: {self.NAME}')
+
+    def rq_data_async(self, *args, **kwargs) -> 'TRFuture':
+        """
+        데이터를 요청하고, 응답을 기다리지 않고 TRFuture를 반환한다.
+        하나의 indi instance에서 여러 요청을 동시에(in-flight) 보낼 수 있으며,
+        각 응답은 self.multi_output이 아닌 요청별 output buffer(TRFuture)로 decode된다.
+        indi instance에 scheduler가 있으면 요청 한도(quota)와 우선순위(RQ_PRIORITY)에 따라 전송된다.
+        CACHE_TTL이 지정된 TR은 cache에 유효한 응답이 있으면 요청하지 않고 완료된 TRFuture를 반환한다.
+        COALESCE인 TR은 같은 indi instance에 동일한 요청이 in-flight이면 새로 보내지 않고,
+        그 응답의 복사본을 받는 TRFuture를 반환한다.
+        """
+        future = TRFuture(self)
+        cache = getattr(self._indi_instance, '_cache', None)
+        if cache is not None and cache.ttl_of(self) is None:
+            cache = None
+        if cache is not None:
+            cached = cache.get(self, args, kwargs)
+            if cached is not None:
+                future.set_result(*cached)
+                return future
+
+        inflight = getattr(self._indi_instance, '_inflight', None)
+        if self.COALESCE and inflight is not None:
+            key = self._request_key(args, kwargs)
+            primary = inflight.get(key)
+            if primary is not None:
+                future._follow(primary)
+                return future
+            inflight[key] = future
+            future.add_done_callback(partial(self._pop_inflight, inflight, key))
+
+        if cache is not None:
+            future.add_done_callback(partial(self._put_cache, cache, args, kwargs))
+        scheduler = getattr(self._indi_instance, '_scheduler', None)
+        if scheduler is None:
+            self._send_scheduled_request(future, args, kwargs)
+        else:
+            scheduler.submit(self.NAME, self.RQ_PRIORITY, partial(self._send_scheduled_request, future, args, kwargs))
+        return future
+
+    def _request_key(self, args: tuple, kwargs: dict) -> str:
+        """ coalescing key : 같은 key의 요청은 같은 응답을 받는다. """
+        return Cache.make_key(self.NAME, args, kwargs)
+
+    @staticmethod
+    def _pop_inflight(inflight: dict, key: str, future: 'TRFuture') -> None:
+        if inflight.get(key) is future:
+            del inflight[key]
+
+    def _put_cache(self, cache, args: tuple, kwargs: dict, future: 'TRFuture') -> None:
+        if future._exception is None:
+            cache.put(self, args, kwargs, future.single_output, future.multi_output)
+
+    def _send_scheduled_request(self, future: 'TRFuture', args: tuple, kwargs: dict) -> None:
+        """ 요청을 보낸다. 실패하면 future를 예외로 완료하여 in-flight 목록에서도 뺀다. """
+        if future.done():   # queue에서 대기 중 취소된 요청
+            return
+        try:
+            self._send_request(future, *args, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+
+    def _send_request(self, future: 'TRFuture', *args, **kwargs) -> int:
+        self._pre_rq_func()
+        self._set_input_data(*args, **kwargs)
+        rqid = self._indi_instance.dynamicCall("RequestData()")
+        if not rqid:
+            raise APIErrors.RequestDataError(f"{self.__class__.__name__} : RequestData() failed")
+        self._indi_instance._rqidD[rqid] = future
+        future._set_sent(rqid)
+        return rqid
 
     def _pre_rq_func(self) -> int:
         """
         쿼리를 준비한다.
-        :param indi_inst: TR_instance
         :return: (bool) is_ok
         """
         ok = self._indi_instance.dynamicCall("SetQueryName(QString)", self.NAME)
         if not ok: raise APIErrors.SetQueryNameError(self.__class__.__name__)
-        self.is_waiting = True
         return ok
 
     def _set_input_data(self, *args, **kwargs) -> None:
@@ -150,36 +477,283 @@ class BaseTR(Base):
         else:
             pass
 
-    def _post_rq_func(self, rqid) -> None:
-        self._indi_instance._rqidD[rqid] = self
-
-        s = time()
-        while self.is_waiting:
-            pythoncom.PumpWaitingMessages()
-
-            # implicit_wait 초 이상 응답 안오면 에러로 간주
-            if time() - s > self.implicit_wait:
-                self.is_waiting = False
-                errstr = f'A TimeOutError has occured. rqid : {rqid} str_name: {self._indi_instance._owner} tr_name: {self.NAME}'
-                Logger.write_log(errstr)
-                bot.sendMessage(chat_id=channel_id, text=errstr)
-                raise APIErrors.TimeOutError("Time Out!!!")
-
-
     def _get_output_data(self):
+        return self._pack_output(getattr(self, 'single_output', None), getattr(self, 'multi_output', None))
+
+    def _pack_output(self, single_output, multi_output):
         if self.IS_SINGLE_OUTPUT:
             if self.IS_MULTI_OUTPUT:
-                return self.single_output, self.multi_output
+                return single_output, multi_output
             else:
-                return self.single_output
+                return single_output
         else:
             if self.IS_MULTI_OUTPUT:
-                return self.multi_output
+                return multi_output
             else:
                 raise APIErrors.TROutputTypeError(
                     f"{self.__class__.__name__} : Both IS_SINGLE_OUTPUT and IS_MULTI_OUTPUT are Falses")
 
 
+def adjust_multipliers(factors: np.ndarray) -> np.ndarray:
+    """
+    수정계수 column으로부터 행별 누적 수정배수를 계산한다.
+    i번째 행에는 0 ~ i-1번째 행에서 발생한 수정계수의 곱이 적용된다.
+    (서버 수신 순서로는 뒤쪽 행들의 수정계수를 누적곱한 reversed cumulative product)
+    빈 값, 0 등 유효하지 않은 수정계수는 1.0으로 간주한다.
+    """
+    factors = Decoders.to_float_array(factors)
+    factors[~np.isfinite(factors) | (factors == 0.)] = 1.
+    multipliers = np.ones_like(factors)
+    if factors.shape[0] > 1:
+        np.cumprod(factors[:-1], out=multipliers[1:])
+    return multipliers
+
+
+class BaseChartTR(BaseTR):
+    """
+    차트(분/일/주/월) TR Base class.
+    adjust=True 이면 수정계수로 계산한 수정주가/수정거래량을 float64 column('수정' + field명)으로
+    multi_output에 추가한다. 원(raw) column의 값은 바꾸지 않는다.
+    수정계수 field가 없는 차트 TR의 수정 column은 raw 값과 같다.
+    """
+    PRICE_FIELDS = ('시가', '고가', '저가', '종가', '현재가')
+    VOLUME_FIELDS = ('단위거래량', )
+    PRICE_FACTOR_FIELD = '주가수정계수'
+    VOLUME_FACTOR_FIELD = '거래량수정계수'
+    ADJ_PREFIX = '수정'
+    ADJUST = False
+    DATE_FIELD = '일자'
+    TIME_FIELDS = ('시간', '체결시간')
+    MAX_PAGE_SIZE = 9999
+
+    def __init__(self, indi_instance, implicit_wait: int = 3, adjust: bool = None, *args, **kwargs):
+        self.adjust: bool = self.ADJUST if adjust is None else adjust
+        self._paging: bool = False
+        super().__init__(indi_instance, implicit_wait, *args, **kwargs)
+
+    def _read_multi_data(self) -> np.ndarray:
+        multi_output = super()._read_multi_data()
+        if self.adjust and not self._paging:
+            multi_output = self.add_adjusted_columns(multi_output)
+        return multi_output
+
+    def _request_key(self, args: tuple, kwargs: dict) -> str:
+        # 수정 column 여부에 따라 응답의 dtype이 다르다.
+        return f"{super()._request_key(args, kwargs)}\x1fadjust={self.adjust and not self._paging}"
+
+    @classmethod
+    def time_field(cls, dtype: np.dtype) -> str:
+        """ 행 식별에 쓰는 시간 field. 없거나 값을 담지 못하는 field('U0')이면 None """
+        for field in cls.TIME_FIELDS:
+            if field in dtype.names and dtype[field].itemsize > 0:
+                return field
+        return None
+
+    @classmethod
+    def _row_keys(cls, multi_output: np.ndarray) -> np.ndarray:
+        """ 행 식별 key (일자 + 시간, 시간 field가 없으면 일자) """
+        keys = multi_output[cls.DATE_FIELD]
+        field = cls.time_field(multi_output.dtype)
+        return keys if field is None else np.char.add(keys, multi_output[field])
+
+    def iter_pages(self,
+                   code: str,
+                   그래프종류: str = Ibook.그래프종류.일데이터,
+                   시간간격: str = '1',
+                   시작일: str = '00000000',
+                   종료일: str = '99999999',
+                   page_size: int = MAX_PAGE_SIZE,
+                   max_pages: int = None):
+        """
+        조회갯수(최대 9999) 제한을 넘는 구간을 page 단위로 나누어 최신 구간부터 과거 방향으로 요청한다.
+        직전 page의 가장 이른 일자를 다음 요청의 종료일로 사용하고, 이미 받은 행(일자 + 시간)은 제외한다.
+        받은 행이 page_size보다 적거나 새로운 행이 없으면 종료한다.
+        시간 field가 없으면 page의 가장 이른 일자는 일부만 받았을 수 있으므로, 그 일자의 행은 다음 page에서 모두 받는다.
+        page_size는 하루치 행 수보다 커야 한다. (하루치가 한 page를 넘으면 더 과거로 진행하지 못한다.)
+        :return: multi_output generator (page 내부는 시간순, page는 최신 -> 과거 순, 수정 column 없음)
+        """
+        page_size = min(int(page_size), self.MAX_PAGE_SIZE)
+        oldest_key = None
+        n_pages = 0
+        while max_pages is None or n_pages < max_pages:
+            self._paging = True
+            try:
+                self.rq_data(code, 그래프종류, 시간간격, 시작일, 종료일, str(page_size))
+            finally:
+                self._paging = False
+            page = self.multi_output
+            n_pages += 1
+            n_rcvd = len(page)
+
+            keys = self._row_keys(page)
+            mask = page[self.DATE_FIELD] >= 시작일
+            if oldest_key is not None:
+                mask &= keys < oldest_key
+            if not mask.all():
+                page, keys = page[mask], keys[mask]
+            if not len(page):
+                return
+            oldest_key = str(keys[0])
+            종료일 = str(page[self.DATE_FIELD][0])
+            if n_rcvd >= page_size and self.time_field(page.dtype) is None:
+                partial = page[self.DATE_FIELD] == 종료일
+                if not partial.all():
+                    page = page[~partial]
+                    oldest_key = str(int(종료일) + 1)     # 다음 page에서 종료일의 행까지 받는다.
+            yield page
+            if n_rcvd < page_size:
+                return
+
+    def rq_range(self,
+                 code: str,
+                 그래프종류: str = Ibook.그래프종류.일데이터,
+                 시간간격: str = '1',
+                 시작일: str = '00000000',
+                 종료일: str = '99999999',
+                 page_size: int = MAX_PAGE_SIZE,
+                 max_pages: int = None) -> np.ndarray:
+        """
+        iter_pages()의 page들을 하나의 배열(시간순, 중복 제거)로 합쳐 self.multi_output에 저장하고 반환한다.
+        adjust=True이면 합쳐진 전체 구간에 대해 수정 column을 계산한다.
+        """
+        pages = list(self.iter_pages(code, 그래프종류, 시간간격, 시작일, 종료일, page_size, max_pages))
+        multi_output = np.empty([sum(len(page) for page in pages)], dtype=self.get_multi_decoder().dtype)
+        end = len(multi_output)
+        for page in pages:
+            multi_output[end - len(page):end] = page
+            end -= len(page)
+        if self.adjust:
+            multi_output = self.add_adjusted_columns(multi_output)
+        self.multi_output = multi_output
+        return multi_output
+
+    @classmethod
+    def add_adjusted_columns(cls, multi_output: np.ndarray) -> np.ndarray:
+        """
+        multi_output(시간순)에 수정주가/수정거래량 float64 column을 추가한 새 배열을 반환한다.
+        """
+        names = multi_output.dtype.names
+        adj_fields = []
+        for fields, factor_field in ((cls.PRICE_FIELDS, cls.PRICE_FACTOR_FIELD),
+                                     (cls.VOLUME_FIELDS, cls.VOLUME_FACTOR_FIELD)):
+            fields = [field for field in fields if field in names]
+            if not fields:
+                continue
+            if factor_field in names:
+                multipliers = adjust_multipliers(multi_output[factor_field])
+            else:
+                multipliers = None
+            adj_fields.extend((field, multipliers) for field in fields)
+
+        dtype = np.dtype(multi_output.dtype.descr + [(cls.ADJ_PREFIX + field, np.float64) for field, _ in adj_fields])
+        adjusted = np.empty(multi_output.shape, dtype=dtype)
+        for name in names:
+            adjusted[name] = multi_output[name]
+        for field, multipliers in adj_fields:
+            values = Decoders.to_float_array(multi_output[field])
+            adjusted[cls.ADJ_PREFIX + field] = values if multipliers is None else values * multipliers
+        return adjusted
+
+
+class Subscription:
+    """
+    실시간 데이터 구독. (BaseRealtime.subscribe()가 반환)
+    batch=False : 수신할 때마다 callback(code, tick)
+    batch=True  : interval(ms)마다 또는 max_batch개가 쌓이면 callback(codes, ticks)
+                  (codes는 tick별 code list, ticks는 tick들을 시간순으로 이어붙인 배열)
+    tick은 single_output(IS_MULTI_OUTPUT만 제공하면 multi_output)의 복사본이다.
+    callback에서 발생한 예외는 Logger로 기록하고 무시하므로, 다른 구독에 영향을 주지 않는다.
+    """
+
+    def __init__(self, callback, code: str = None, batch: bool = False,
+                 interval: int = Config.RT_BATCH_INTERVAL_MS, max_batch: int = Config.RT_BATCH_MAX):
+        self.callback = callback
+        self.code = code
+        self.batch = batch
+        self.interval = interval
+        self.max_batch = max_batch
+        self.n_delivered, self.n_errors = 0, 0
+        self._codes, self._ticks = [], []
+        self._timer_pending = False
+
+    def __call__(self, rt_inst: 'BaseRealtime', code: str) -> None:
+        if self.code is not None and code != self.code:
+            return
+        tick = rt_inst.single_output.copy() if rt_inst.IS_SINGLE_OUTPUT else rt_inst.multi_output.copy()
+        if not self.batch:
+            self._deliver(code, tick)
+            return
+        self._codes.append(code)
+        self._ticks.append(tick)
+        if len(self._ticks) >= self.max_batch:
+            self.flush()
+        elif not self._timer_pending:
+            self._timer_pending = True
+            ingestor = getattr(rt_inst._indi_instance, '_ingestor', None)
+            if ingestor is not None and ingestor.in_worker():
+                ingestor.call_later(self.interval / 1000, self._on_timer)
+            else:
+                QTimer.singleShot(self.interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer_pending = False
+        self.flush()
+
+    def flush(self) -> None:
+        """ 쌓여 있는 tick을 즉시 전달한다. """
+        if not self._ticks:
+            return
+        codes, ticks = self._codes, self._ticks
+        self._codes, self._ticks = [], []
+        self._deliver(codes, np.concatenate(ticks))
+
+    def _deliver(self, *args) -> None:
+        try:
+            self.callback(*args)
+        except Exception as e:
+            self.n_errors += 1
+            Logger.write_log(f"Subscription : {self.callback!r} raised an exception", repr(e))
+        else:
+            self.n_delivered += 1
+
+
+def route_targets(routes: dict, code: str) -> list:
+    """
+    code(CODE_FIELD 값)의 실시간 데이터를 전달할 realtime instance들.
+    code로 등록된 instance와 '*'로 등록된 instance이며, 어느 쪽에도 해당하지 않거나 code가 None이면 NAME의 모든 instance이다.
+    :param routes:  {등록 code: [realtime_inst, ...]} (indi_instance._rtD[NAME])
+    """
+    if code is not None:
+        targets = routes.get(code.strip(), []) + routes.get('*', [])
+        if len(targets) == 1:
+            return targets
+        if targets:
+            return list(dict.fromkeys(targets))
+    return list(dict.fromkeys(inst for insts in routes.values() for inst in insts))
+
+
+def route_realtime(indi_instance, routes: dict) -> tuple:
+    """
+    수신한 실시간 데이터를 읽고, code(CODE_FIELD)로 전달할 realtime instance들을 찾는다.
+    routes의 instance들이 필요로 하는 field(fields)만 읽는다.
+    code로 등록된 instance와 '*'로 등록된 instance에 전달하며,
+    어느 쪽에도 해당하지 않거나 CODE_FIELD가 없는 실시간 데이터는 NAME의 모든 instance에 전달한다.
+    :param routes:  {등록 code: [realtime_inst, ...]} (indi_instance._rtD[NAME])
+    :return:        (code, [realtime_inst, ...], single_raw, multi_raw)
+    """
+    realtime_insts = list(dict.fromkeys(inst for insts in routes.values() for inst in insts))
+    subsets = [inst._single_indexes for inst in realtime_insts]
+    indexes = None if None in subsets else sorted(set().union(*subsets))
+    realtime_cls = type(realtime_insts[0])
+    single_raw, multi_raw = realtime_cls.read_raw(indi_instance, indexes)
+
+    code_index = realtime_cls.get_code_index()
+    if code_index is None:
+        return None, realtime_insts, single_raw, multi_raw
+    code = single_raw[code_index].strip()
+    return code, route_targets(routes, code), single_raw, multi_raw
+
+
 class BaseRealtime(Base):
     """
     Realtime Base class.
@@ -188,62 +762,235 @@ class BaseRealtime(Base):
     Override할 methods : request_data()
     """
     REALTIME_AVAILABLE = True
+    CODE_FIELD = '단축코드'  # 실시간 데이터에서 종목(등록 code)을 나타내는 field
 
-    def __init__(self, indi_instance, *args, **kwargs):
+    def __init__(self, indi_instance, *args, fields: list = None, ring_size: int = None,
+                 arena: 'TickStore.TickArena' = None, conflator: 'TickStore.Conflator' = None,
+                 recorder: 'Recorder.TickRecorder' = None, **kwargs):
+        """
+        :param fields: 지정하면 SINGLE_OUTPUT_DTYPE 중 해당 field(와 CODE_FIELD)만 읽어 저장한다.
+                       single_output은 해당 field만 갖는 dtype이 된다. ex) SC(indi, fields=['체결시간', '현재가'])
+        :param ring_size: 지정하면 code별로 최근 ring_size개의 tick(single_output)을 TickRing에 보관한다.
+        :param arena: 지정하면 모든 code의 tick(single_output)을 TickArena에 추가한다. (여러 instance가 공유 가능)
+        :param conflator: 지정하면 code별 최신 tick(single_output)을 Conflator에 갱신한다. (여러 instance가 공유 가능)
+        :param recorder: 지정하면 모든 tick(single_output)을 TickRecorder의 거래일별, NAME별 파일에 기록한다. (여러 instance가 공유 가능)
+        """
         #assert indi_instance._is_realtime
         super().__init__(indi_instance, *args, **kwargs)
         self._registered = False
-        self._initialize_rt_inst()
+        self._listeners = []
+        self._codes = set()             # 이 instance로 등록된 code
+        self._single_outputs = {}       # code -> code별 single_output
+        self._multi_outputs = {}        # code -> code별 multi_output
+        self.ring_size: int = ring_size
+        self._rings = {}                # code -> TickStore.TickRing
+        self.arena: TickStore.TickArena = arena
+        self.conflator: TickStore.Conflator = conflator
+        self.recorder: Recorder.TickRecorder = recorder
+        self._initialize_rt_inst(fields)
+
+    def _initialize_rt_inst(self, fields: list = None):
+        if not (self.IS_SINGLE_OUTPUT or self.IS_MULTI_OUTPUT):
+            raise APIErrors.TRCreationError(
+                f"{self.__class__.__name__} : Both IS_SINGLE_OUTPUT and IS_MULTI_OUTPUT are Falses")
+        self.fields: tuple = None
+        self._single_indexes: list = None   # 읽을 싱글데이터 field index (None이면 전체)
+        self._single_plan: Decoders.DecoderPlan = None
+        if not self.IS_SINGLE_OUTPUT or self.SINGLE_OUTPUT_DTYPE is None:
+            return
+        self._single_plan = self.get_single_decoder()
+        if fields is None:
+            return
+        names = self.SINGLE_OUTPUT_DTYPE.names
+        unknown = [field for field in fields if field not in names]
+        if unknown:
+            raise APIErrors.TRCreationError(f"{self.__class__.__name__} : unknown fields {unknown}")
+        selected = set(fields)
+        if self.CODE_FIELD in names:
+            selected.add(self.CODE_FIELD)
+        self._single_indexes = [j for j, name in enumerate(names) if name in selected]
+        self.fields = tuple(names[j] for j in self._single_indexes)
+        self._single_plan = Decoders.get_plan(np.dtype([(name, self.SINGLE_OUTPUT_DTYPE[name]) for name in self.fields]))
+        self.single_output = np.empty([1], dtype=self._single_plan.dtype)
 
-    def _initialize_rt_inst(self):
+    @classmethod
+    def read_raw(cls, indi_instance, single_indexes: list = None) -> tuple:
+        """
+        수신된 실시간 데이터의 원(raw) 문자열 값을 읽는다. (COM 호출이므로 Qt thread에서 호출)
+        :param single_indexes: 읽을 싱글데이터 field index (None이면 전체)
+        :return: (single_raw, multi_raw) - 제공되지 않는 output은 None
+        """
+        single_raw = read_single_raw(indi_instance, len(cls.get_single_decoder()), single_indexes) \
+            if cls.IS_SINGLE_OUTPUT else None
+        multi_raw = read_multi_raw(indi_instance, len(cls.get_multi_decoder())) if cls.IS_MULTI_OUTPUT else None
+        return single_raw, multi_raw
+
+    def proc_rcvd_real_data(self, code: str = None) -> None:
+        """ 수신된 실시간 데이터를 읽어 처리한다. """
+        self._apply_raw(code, *self.read_raw(self._indi_instance, self._single_indexes), time.time())
+
+    def _apply_raw(self, code: str, single_raw: list, multi_raw: list, rcv_time: float) -> None:
+        """ 원(raw) 값을 decode하여 output에 저장하고 listener(구독)들에게 알린다. COM을 호출하지 않는다. """
         if self.IS_SINGLE_OUTPUT:
-            if self.IS_MULTI_OUTPUT:
-                self.proc_rcvd_real_data = self._proc_rcvd_single_multi_real_data
-            else:
-                self.proc_rcvd_real_data = self._proc_rcvd_single_real_data
-        else:
-            if self.IS_MULTI_OUTPUT:
-                self.proc_rcvd_real_data = self._proc_rcvd_multi_real_data
-            else:
-                raise APIErrors.TRCreationError(
-                    f"{self.__class__.__name__} : Both IS_SINGLE_OUTPUT and IS_MULTI_OUTPUT are Falses")
+            self._apply_single_raw(code, single_raw, rcv_time)
+        if self.IS_MULTI_OUTPUT:
+            self._apply_multi_raw(code, multi_raw)
+        self._notify_listeners(code)
+
+    def _notify_listeners(self, code: str = None) -> None:
+        if self._listeners:
+            code = self._get_tick_code() if code is None else code
+            for listener in self._listeners:
+                try:
+                    listener(self, code)
+                except Exception as e:
+                    Logger.write_log(f"{self.NAME} : listener {listener!r} raised an exception", repr(e))
 
-    def _proc_rcvd_single_real_data(self) -> None:
-        self._get_rcvd_single_real_data()
+    def subscribe(self, callback, code: str = None, batch: bool = False,
+                  interval: int = Config.RT_BATCH_INTERVAL_MS, max_batch: int = Config.RT_BATCH_MAX) -> Subscription:
+        """
+        실시간 데이터를 수신하면 callback을 호출한다. (polling 불필요)
+        :param code: 지정하면 해당 code의 데이터만 전달한다.
+        :param batch: True이면 tick을 모아 interval(ms)마다 callback(codes, ticks)로 전달한다. (SH 등 고빈도 데이터)
+                      False이면 수신할 때마다 callback(code, tick)을 호출한다.
+        :return: Subscription (unsubscribe()에 사용)
+        """
+        subscription = Subscription(callback, code, batch, interval, max_batch)
+        self._listeners.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """ 구독을 해지한다. 쌓여 있는 batch는 전달 후 해지한다. """
+        if subscription in self._listeners:
+            self._listeners.remove(subscription)
+            subscription.flush()
 
-    def _proc_rcvd_multi_real_data(self) -> None:
-        self._get_rcvd_multi_real_data()
+    @classmethod
+    def get_code_index(cls) -> int:
+        """ SINGLE_OUTPUT_DTYPE에서 CODE_FIELD의 index. CODE_FIELD가 없으면 None """
+        if '_code_index' not in cls.__dict__:
+            names = cls.SINGLE_OUTPUT_DTYPE.names if cls.IS_SINGLE_OUTPUT and cls.SINGLE_OUTPUT_DTYPE is not None else ()
+            cls._code_index = names.index(cls.CODE_FIELD) if cls.CODE_FIELD in names else None
+        return cls._code_index
 
-    def _proc_rcvd_single_multi_real_data(self) -> None:
-        self._get_rcvd_single_real_data()
-        self._get_rcvd_multi_real_data()
+    def _get_tick_code(self) -> str:
+        """ 마지막으로 수신한 실시간 데이터의 code(CODE_FIELD). CODE_FIELD가 없으면 None """
+        if self.get_code_index() is not None:
+            return self.single_output[0][self.CODE_FIELD]
+        return None
 
-    def _get_rcvd_single_real_data(self) -> None:
+    def get_ring(self, code: str) -> 'TickStore.TickRing':
+        """ code의 TickRing (ring_size를 지정하지 않았거나 수신 전이면 None) """
+        return self._rings.get(code)
+
+    def get_output(self, code: str):
+        """
+        code별로 마지막으로 수신한 실시간 데이터.
+        (self.single_output / self.multi_output에는 code와 무관하게 마지막으로 수신한 데이터가 저장된다.)
+        :return: single_output 또는 multi_output (둘 다 제공하면 (single_output, multi_output)), 수신 전이면 None
+        """
+        single_output, multi_output = self._single_outputs.get(code), self._multi_outputs.get(code)
+        if self.IS_SINGLE_OUTPUT and self.IS_MULTI_OUTPUT:
+            return None if single_output is None else (single_output, multi_output)
+        return single_output if self.IS_SINGLE_OUTPUT else multi_output
+
+    async def stream(self, code: str = None, maxsize: int = 0):
+        """
+        실시간 데이터를 asyncio async generator로 받는다. (async for tick in rt.stream(code))
+        code를 지정하면 해당 code의 데이터만 받는다.
+        maxsize > 0 이면 소비가 늦을 때 오래된 tick부터 버린다.
+        :yield: single_output (IS_MULTI_OUTPUT이면 multi_output)의 copy
+        """
+        queue = asyncio.Queue(maxsize)
+        loop = asyncio.get_running_loop()
+        loop_thread = threading.get_ident()
+
+        def put(tick):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(tick)
+
+        def listener(rt_inst, tick_code):
+            if code is not None and tick_code != code:
+                return
+            tick = rt_inst.single_output.copy() if rt_inst.IS_SINGLE_OUTPUT else rt_inst.multi_output.copy()
+            if threading.get_ident() == loop_thread:
+                put(tick)
+            else:   # Ingest worker thread
+                loop.call_soon_threadsafe(put, tick)
+
+        self._listeners.append(listener)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._listeners.remove(listener)
+
+    def _apply_single_raw(self, code: str, single_raw: list, rcv_time: float) -> None:
         """
         싱글데이터(single_data)를 수신(received)한 경우의 처리 루틴
-        :param indi_inst: tr_instance
+        :param code: 실시간 데이터의 code. code별 single_output에도 저장한다.
         :return:    None
         """
-        for j in range(len(self.SINGLE_OUTPUT_DTYPE)):
-            self.single_output[0][j] = self._indi_instance.dynamicCall("GetSingleData(int)", j)
+        plan = self._single_plan
+        if self._single_indexes is not None:
+            single_raw = [single_raw[j] for j in self._single_indexes]
+        if self.single_output.dtype != plan.dtype:     # rq_data()로 전체 field output을 받은 경우
+            self.single_output = np.empty([1], dtype=plan.dtype)
+        self.single_output[0] = plan.decode_row(single_raw)
+        self._store_single(code, rcv_time)
+
+    def _store_single(self, code: str, rcv_time: float) -> None:
+        """ single_output의 tick을 code별 single_output, ring, arena, conflator, recorder에 반영한다. """
+        if code is not None:
+            single_output = self._single_outputs.get(code)
+            if single_output is None or single_output.dtype is not self.single_output.dtype:
+                single_output = self._single_outputs[code] = np.empty([1], dtype=self.single_output.dtype)
+            single_output[0] = self.single_output[0]
+        if self.ring_size:
+            ring = self._rings.get(code)
+            if ring is None:
+                ring = self._rings[code] = TickStore.TickRing(self.single_output.dtype, self.ring_size)
+            ring.append(self.single_output[0], rcv_time)
+        if self.arena is not None:
+            self.arena.append(self.single_output[0], rcv_time, code)
+        if self.conflator is not None:
+            self.conflator.update(self.single_output[0], rcv_time, code)
+        if self.recorder is not None:
+            self.recorder.append(self, self.single_output[0], rcv_time)
         return
 
-    def _get_rcvd_multi_real_data(self) -> None:
+    def _apply_multi_raw(self, code: str, multi_raw: list) -> None:
         """
         멀티데이터(multi_data)를 수신(Received)한 경우의 처리 루틴
-        :param indi_inst:
+        :param code: 실시간 데이터의 code. code별 multi_output에도 저장한다.
         :return:
         """
-        nCnt = self._indi_instance.dynamicCall("GetMultiRowCount()")
-        if self.multi_output.shape[0] != nCnt:
-            del self.multi_output
-            self.multi_output = np.empty([nCnt], dtype=self.MULTI_OUTPUT_DTYPE)
-        for i in range(nCnt):
-            for j in range(len(self.MULTI_OUTPUT_DTYPE)):
-                self.multi_output[i][j] = self._indi_instance.dynamicCall("GetMultiData(int, int)", i, j)
-        self.multi_output = self.multi_output[::-1]
+        self.multi_output = self.get_multi_decoder().decode_columns(multi_raw)
+        if code is not None:
+            self._multi_outputs[code] = self.multi_output
         return
 
+    def _add_route(self, code: str) -> None:
+        """ indi instance의 routing table((NAME, code) -> realtime instances)에 등록한다. """
+        self._codes.add(code)
+        rtD = getattr(self._indi_instance, '_rtD', None)
+        if rtD is not None:
+            insts = rtD.setdefault(self.NAME, {}).setdefault(code, [])
+            if self not in insts:
+                insts.append(self)
+
+    def _remove_route(self, code: str) -> None:
+        self._codes.discard(code)
+        rtD = getattr(self._indi_instance, '_rtD', None)
+        routes = None if rtD is None else rtD.get(self.NAME)
+        if routes and self in routes.get(code, ()):
+            routes[code].remove(self)
+            if not routes[code]:
+                del routes[code]
+            if not routes:
+                del rtD[self.NAME]
+
     def reg_realtime(self, code: str) -> bool:
         """
         realtime을 등록한다.
@@ -254,6 +1001,8 @@ class BaseRealtime(Base):
         if self.REALTIME_AVAILABLE:
             ok = self._indi_instance.dynamicCall("RequestRTReg(QString, QString)", self.NAME, code)
             self._registered = True if ok else self._registered
+            if ok:
+                self._add_route(code)
             return ok
         return False
 
@@ -264,17 +1013,28 @@ class BaseRealtime(Base):
         """
         if self.REALTIME_AVAILABLE:
             ok = self._indi_instance.dynamicCall("UnRequestRTReg(QString, QString)", self.NAME, code)
-            self._registered = False if ok else self._registered
+            if ok:
+                self._remove_route(code)
+                self._registered = bool(self._codes)
             return ok
         return False
 
     def unreg_realtime_all(self) -> bool:
         """
         모든 realtime의 등록을 해지한다.
+        (indi instance 단위로 해지되므로, 같은 indi instance의 다른 realtime instance의 등록도 해지된다.)
         """
         if self.REALTIME_AVAILABLE:
             ok = self._indi_instance.UnRequestRTRegAll()
-            self._registered = False if ok else self._registered
+            if ok:
+                rtD = getattr(self._indi_instance, '_rtD', None)
+                realtime_insts = {self}
+                if rtD is not None:
+                    realtime_insts.update(inst for routes in rtD.values() for insts in routes.values() for inst in insts)
+                    rtD.clear()
+                for inst in realtime_insts:
+                    inst._codes.clear()
+                    inst._registered = False
             return ok
         return False
 
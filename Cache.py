@@ -0,0 +1,197 @@
+import os
+import re
+import time
+import shutil
+import warnings
+import hashlib
+import datetime
+from collections import OrderedDict
+
+import numpy as np
+
+from . import Config, Logger
+
+
+# TTL 정책 : 초(float) 또는 TTL_TRADING_DAY (같은 거래일 동안 유효, 디스크에도 저장)
+TTL_TRADING_DAY = 'trading_day'
+
+_DATE_DIR = re.compile(r'^\d{8}$')
+
+
+def trading_date(now: datetime.datetime = None) -> str:
+    """ 캐시 기준 거래일(YYYYMMDD). Config.CACHE_ROLLOVER_HOUR 이전은 전일로 간주한다. """
+    now = datetime.datetime.now() if now is None else now
+    return (now - datetime.timedelta(hours=Config.CACHE_ROLLOVER_HOUR)).strftime('%Y%m%d')
+
+
+def make_key(name: str, args: tuple, kwargs: dict) -> str:
+    """ (TR NAME, 입력값) -> cache key. 입력값은 SetSingleData처럼 str로 정규화한다. """
+    parts = [name]
+    parts.extend(str(arg) for arg in args)
+    parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
+    return '\x1f'.join(parts)
+
+
+class _Entry:
+    __slots__ = ('single_output', 'multi_output', 'expires_at', 'date')
+
+    def __init__(self, single_output, multi_output, expires_at, date):
+        self.single_output, self.multi_output = single_output, multi_output
+        self.expires_at, self.date = expires_at, date
+
+    def is_valid(self, now: float, date: str) -> bool:
+        if self.date is not None:
+            return self.date == date
+        return now < self.expires_at
+
+
+class ResponseCache:
+    """
+    TR 응답 cache. key는 (TR NAME, 입력값)이다.
+    - TTL은 TR class의 CACHE_TTL (Config.CACHE_TTL_BY_NAME이 우선)을 따르며, None이면 cache하지 않는다.
+    - 메모리(LRU) tier : 최대 maxsize개의 응답을 보관한다.
+    - 디스크 tier : TTL_TRADING_DAY인 응답은 cache_dir/<거래일>/ 에 .npz로 저장하여
+      프로세스를 재시작해도 같은 거래일 동안은 디스크에서 읽는다.
+    반환하는 output은 cache된 배열의 복사본이다.
+    <parameters>
+    cache_dir(str)  : 디스크 cache 경로
+    maxsize(int)    : 메모리 cache 최대 항목 수
+    clock(callable) : 현재 시각(time.time() 형식)을 반환하는 함수 (TTL과 거래일 판단에 사용)
+    """
+
+    def __init__(self, cache_dir: str = Config.CACHE_DIR, maxsize: int = Config.CACHE_MAXSIZE, clock=time.time):
+        self.cache_dir = cache_dir
+        self.maxsize = maxsize
+        self.clock = clock
+        self._lru = OrderedDict()
+        self.hits, self.disk_hits, self.misses = 0, 0, 0
+
+    @staticmethod
+    def ttl_of(tr) -> object:
+        """ TR(class 또는 instance)의 TTL 정책 """
+        return Config.CACHE_TTL_BY_NAME.get(tr.NAME, tr.CACHE_TTL)
+
+    def get(self, tr, args: tuple, kwargs: dict):
+        """
+        :return: (single_output, multi_output) 또는 None (cache 미적중)
+        """
+        ttl = self.ttl_of(tr)
+        if ttl is None:
+            return None
+        key = make_key(tr.NAME, args, kwargs)
+        now = self.clock()
+        date = self._trading_date(now)
+        entry = self._lru.get(key)
+        if entry is not None:
+            if entry.is_valid(now, date):
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return self._copy(entry)
+            del self._lru[key]
+        if ttl == TTL_TRADING_DAY:
+            entry = self._load(tr.NAME, key, date)
+            if entry is not None:
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return self._copy(entry)
+        self.misses += 1
+        return None
+
+    def put(self, tr, args: tuple, kwargs: dict, single_output: np.ndarray, multi_output: np.ndarray) -> None:
+        ttl = self.ttl_of(tr)
+        if ttl is None:
+            return
+        key = make_key(tr.NAME, args, kwargs)
+        single_output = None if single_output is None else single_output.copy()
+        multi_output = None if multi_output is None else multi_output.copy()
+        if ttl == TTL_TRADING_DAY:
+            entry = _Entry(single_output, multi_output, None, self._trading_date())
+            try:
+                self._save(tr.NAME, key, entry)
+            except OSError as e:
+                Logger.write_log(f"ResponseCache : failed to save {tr.NAME}", e)
+        else:
+            entry = _Entry(single_output, multi_output, self.clock() + ttl, None)
+        self._remember(key, entry)
+
+    def invalidate(self, name: str = None, disk: bool = False) -> None:
+        """
+        메모리 cache를 비운다. name을 지정하면 해당 TR의 항목만 비운다.
+        disk=True이면 현재 거래일의 디스크 cache도 지운다. (장중에 master를 다시 받는 경우 등)
+        """
+        if name is None:
+            self._lru.clear()
+        else:
+            prefix = name + '\x1f'
+            for key in [key for key in self._lru if key == name or key.startswith(prefix)]:
+                del self._lru[key]
+        if disk:
+            date_dir = os.path.join(self.cache_dir, self._trading_date())
+            if not os.path.isdir(date_dir):
+                return
+            for filename in os.listdir(date_dir):
+                if name is None or filename.rsplit('_', 1)[0] == name:
+                    try:
+                        os.remove(os.path.join(date_dir, filename))
+                    except OSError as e:
+                        Logger.write_log(f"ResponseCache : failed to remove {filename}", e)
+
+    def _trading_date(self, now: float = None) -> str:
+        return trading_date(datetime.datetime.fromtimestamp(self.clock() if now is None else now))
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _copy(entry: _Entry) -> tuple:
+        return (None if entry.single_output is None else entry.single_output.copy(),
+                None if entry.multi_output is None else entry.multi_output.copy())
+
+    def _filepath(self, name: str, key: str, date: str) -> str:
+        digest = hashlib.sha1(key.encode('utf8')).hexdigest()[:20]
+        return os.path.join(self.cache_dir, date, f'{name}_{digest}.npz')
+
+    def _load(self, name: str, key: str, date: str):
+        filepath = self._filepath(name, key, date)
+        if not os.path.isfile(filepath):
+            return None
+        try:
+            with np.load(filepath, allow_pickle=False) as npz:
+                if str(npz['key']) != key:    # hash 충돌
+                    return None
+                single_output = npz['single_output'] if 'single_output' in npz.files else None
+                multi_output = npz['multi_output'] if 'multi_output' in npz.files else None
+        except (OSError, ValueError, KeyError) as e:
+            Logger.write_log(f"ResponseCache : failed to load {filepath}", e)
+            return None
+        return _Entry(single_output, multi_output, None, date)
+
+    def _save(self, name: str, key: str, entry: _Entry) -> None:
+        filepath = self._filepath(name, key, entry.date)
+        date_dir = os.path.dirname(filepath)
+        if not os.path.isdir(date_dir):
+            os.makedirs(date_dir)
+            self.purge(keep=entry.date)
+        arrays = {'key': np.array(key)}
+        if entry.single_output is not None:
+            arrays['single_output'] = entry.single_output
+        if entry.multi_output is not None:
+            arrays['multi_output'] = entry.multi_output
+        tmp_filepath = filepath + '.tmp'
+        with open(tmp_filepath, 'wb') as f, warnings.catch_warnings():
+            # 한글 field명 dtype은 .npy format 3.0으로 저장된다. (NumPy >= 1.17)
+            warnings.simplefilter('ignore', UserWarning)
+            np.savez(f, **arrays)
+        os.replace(tmp_filepath, filepath)
+
+    def purge(self, keep: str = None) -> None:
+        """ keep(거래일, 기본값은 현재 거래일) 이외의 디스크 cache를 삭제한다. """
+        keep = self._trading_date() if keep is None else keep
+        if not os.path.isdir(self.cache_dir):
+            return
+        for dirname in os.listdir(self.cache_dir):
+            if _DATE_DIR.match(dirname) and dirname != keep:
+                shutil.rmtree(os.path.join(self.cache_dir, dirname), ignore_errors=True)
@@ -6,6 +6,39 @@ INDI_OBJ_PATH = 'C:\\SHINHAN-i\\indi\\giexpertstarter.exe'
 
 #################################
 
+##### TR Request Scheduler Configuration #####
+TR_RQ_PER_SEC = 20              # 전체 TR 초당 최대 요청 수
+TR_RQ_PER_SEC_BY_NAME = {      # TR NAME별 초당 최대 요청 수 ex) {'TR_SCHART': 1, 'stock_mst': 1}
+    'SCDA601U4': 0.1,           # 10초 이내 재호출 불가
+}
+###############################################
+
+##### TR Response Cache Configuration #####
+CACHE_DIR = 'APISH2\\Cache\\'
+CACHE_MAXSIZE = 256             # 메모리(LRU) cache 최대 항목 수
+CACHE_ROLLOVER_HOUR = 7         # 거래일 변경 시각. 이 시각 이전은 전 거래일로 간주
+CACHE_TTL_BY_NAME = {}          # TR NAME별 TTL(초 또는 'trading_day', None이면 cache 안 함) ex) {'SABA609Q1': 5}
+###########################################
+
+##### Realtime Configuration #####
+RT_BATCH_INTERVAL_MS = 50       # batch 구독의 전달 주기(ms)
+RT_BATCH_MAX = 1000             # batch 구독에서 한 번에 전달할 최대 tick 수 (쌓이면 주기 전이라도 전달)
+RT_QUEUE_MAXSIZE = 10000        # 실시간 ingest queue 최대 event 수 (new_indi(ingest=True))
+RT_QUEUE_POLICY = 'drop_oldest' # ingest queue가 가득 찼을 때 : 'block', 'drop_oldest', 'conflate'
+RT_SHARD_COUNT = 4              # RealtimeManager가 처음 생성하는 realtime indi instance 수
+RT_SHARD_MAX = 8                # RealtimeManager의 최대 realtime indi instance 수
+RT_SHARD_MAX_LOAD = 2000        # realtime indi instance 하나의 최대 수신 빈도(건/초). 넘으면 rebalance
+RT_REBALANCE_INTERVAL_SEC = 10  # RealtimeManager 자동 rebalance 주기(초)
+RT_REBALANCE_MAX_MOVES = 50     # rebalance 한 번에 옮기는 최대 (NAME, code) 수
+RECORD_DIR = 'APISH2\\Records\\' # 실시간 데이터 기록(Recorder.TickRecorder) 경로
+RECORD_FLUSH_SEC = 1.0          # 실시간 데이터 기록 파일의 flush 주기(초)
+RECORD_SEGMENT_ROWS = 1 << 18   # 실시간 데이터 기록 파일(segment) 하나의 record 수. 가득 차면 다음 segment에 기록
+EXPORT_DICT_MAX_UNIQUE = 256    # Export : 값의 종류가 이 수 이하인 문자열 column은 dictionary로 저장
+HISTORY_DIR = 'APISH2\\History\\' # 차트 데이터 보관(History.HistoryStore) 경로
+HISTORY_REFRESH_SEC = 60        # HistoryStore가 현재 거래일 차트 데이터를 다시 받는 주기(초)
+SNAPSHOT_DIR = 'APISH2\\Snapshot\\' # master 데이터 snapshot(Snapshot.MasterSnapshot) 경로
+################################################
+
 ##### Logger Configuration #####
 LOG_DIR = 'APISH2\\Log\\'
 ################################
@@ -1,18 +1,27 @@
 import sys
 import time
+import asyncio
 from functools import partial
 from typing import Dict
 
 import pythoncom
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QAxContainer import QAxWidget
 
-from . import APIErrors, Logger, Config, TRRT
+from . import APIErrors, Logger, Config, TRRT, BaseTRRT, Scheduler, Cache, Ingest
 
 
 if not QApplication.instance():
     app = QApplication(sys.argv)
 
+# 프로세스 내 모든 indi instance가 공유하는 TR 요청 scheduler (요청 한도는 Config 참고)
+tr_scheduler = Scheduler.RequestScheduler(
+    call_later=lambda delay, fn: QTimer.singleShot(int(delay * 1000) + 1, fn))
+
+# 프로세스 내 모든 indi instance가 공유하는 TR 응답 cache (TTL은 TR class의 CACHE_TTL 참고)
+tr_cache = Cache.ResponseCache()
+
 
 def _register_handlers(target_inst) -> None:
     """ TR 및 realtime_TR의 Request 데이터 수신 처리 핸들러를 등록한다. """
@@ -21,19 +30,21 @@ def _register_handlers(target_inst) -> None:
     target_inst.ReceiveData.connect(partial_func0)
     target_inst.ReceiveSysMsg.connect(partial_func1)
     if target_inst._is_realtime:
-        target_inst.ReceiveRTData.connect(__receive_realtime_data_handler)
+        partial_func2 = partial(__receive_realtime_data_handler, target_inst)
+        target_inst.ReceiveRTData.connect(partial_func2)
     #print(" <<< 이벤트 핸들러 연결 완료 >>> ")
 
 
 def __received_tr_data_handler(target_inst, rqid: int) -> None:
-    """ TR의 Request 데이터 수신 처리 핸들러 """
-    tr_inst = target_inst._rqidD.pop(rqid, None)
-    if tr_inst is None:
+    """ TR의 Request 데이터 수신 처리 핸들러.
+    rqid에 해당하는 요청(TRFuture)의 output buffer로 decode하여 resolve한다. """
+    future = target_inst._rqidD.pop(rqid, None)
+    if future is None:
         # 23-04-19 make this code as a comment. and make it logged.
         #raise APIErrors.RqIdNotExistError(f"rqid : {rqid} does not exist in the rqid Dictionary")
         Logger.write_log(f"rqid : {rqid} does not exist in the rqid Dictionary")
     else:
-        tr_inst.proc_rcvd_data()
+        future.proc_rcvd_data()
 
 
 def __received_sys_msg_handler(target_inst, Msgid: int) -> None:
@@ -60,13 +71,30 @@ def __received_sys_msg_handler(target_inst, Msgid: int) -> None:
     print(msg), Logger.write_log(msg)
 
 
-def __receive_realtime_data_handler(realtime_name: str) -> None:
-    """ 등록(register)된 realtime TR의 실시간 데이터 처리 핸들러 """
-    realtime_inst = TRRT.BaseRealtime.INSTANCES.get(realtime_name)
-    #realtime_inst = TRRT.__dict__.get(realtime_name, None)  ### returns a RT class obj, not a RT instance.
-    if realtime_inst is None:
-        raise APIErrors.RealtimeNotDefinedError()
-    realtime_inst.proc_rcvd_real_data() 
+def __receive_realtime_data_handler(target_inst, realtime_name: str) -> None:
+    """ 등록(register)된 realtime TR의 실시간 데이터 처리 핸들러.
+    실시간 데이터의 code로 (NAME, code)에 등록된 realtime instance들에게 전달한다.
+    ingestor가 있으면 원(raw) 값만 읽어 queue에 넣고, decode와 전달은 worker thread가 한다. """
+    handler_started = time.monotonic()
+    rcv_time = time.time()
+    routes = target_inst._rtD.get(realtime_name)
+    if not routes:
+        # reg_realtime()을 거치지 않고 등록된 경우 : NAME으로 마지막에 생성된 instance
+        realtime_inst = TRRT.BaseRealtime.INSTANCES.get(realtime_name)
+        if realtime_inst is None:
+            raise APIErrors.RealtimeNotDefinedError()
+        single_raw, multi_raw = realtime_inst.read_raw(target_inst, realtime_inst._single_indexes)
+        code, realtime_insts = None, [realtime_inst]
+    else:
+        code, realtime_insts, single_raw, multi_raw = BaseTRRT.route_realtime(target_inst, routes)
+
+    ingestor = target_inst._ingestor
+    if ingestor is None:
+        for realtime_inst in realtime_insts:
+            realtime_inst._apply_raw(code, single_raw, multi_raw, rcv_time)
+    else:
+        event = Ingest.RawEvent(realtime_name, code, realtime_insts, single_raw, multi_raw, rcv_time)
+        ingestor.put(event, handler_started)
 
 
 def __start_indi(indi_inst, id_, pw_, cert_,
@@ -89,7 +117,40 @@ def __start_indi(indi_inst, id_, pw_, cert_,
         del _s
 
 
-def new_indi(owner='master', is_realtime: bool = False, implicitly_wait: int = 60):
+def run_async(main, pump_interval: float = 0.001):
+    """ asyncio coroutine(main)을 Qt 이벤트 루프와 같은 thread에서 실행하고 그 결과를 반환한다.
+        TR.arq_data(), Realtime.stream() 등 asyncio API는 본 함수로 구동되는 루프에서 사용한다.
+        qasync가 설치되어 있으면 Qt 이벤트 루프 위에서 asyncio 루프를 구동하고,
+        없으면 asyncio 루프에서 pump_interval(초)마다 Qt 이벤트(COM 이벤트 포함)를 처리한다.
+    """
+    try:
+        import qasync
+    except ImportError:
+        return asyncio.run(__run_with_qt_pump(main, pump_interval))
+    loop = qasync.QEventLoop(QApplication.instance())
+    asyncio.set_event_loop(loop)
+    with loop:
+        return loop.run_until_complete(main)
+
+
+async def __run_with_qt_pump(main, pump_interval: float):
+    pump = asyncio.ensure_future(__pump_qt_events(pump_interval))
+    try:
+        return await main
+    finally:
+        pump.cancel()
+
+
+async def __pump_qt_events(pump_interval: float) -> None:
+    qapp = QApplication.instance()
+    while True:
+        qapp.processEvents()
+        await asyncio.sleep(pump_interval)
+
+
+def new_indi(owner='master', is_realtime: bool = False, implicitly_wait: int = 60,
+             ingest: bool = False, ingest_maxsize: int = Config.RT_QUEUE_MAXSIZE,
+             ingest_policy: str = Config.RT_QUEUE_POLICY):
     """ 신한금융투자 서버와 연결하기 위한 indi instance를 생성한다.
         TR instance 생성 시 indi instance를 등록해야만 하며, 
         해당 TR instance는 등록된 indi instance로 서버와 통신한다.
@@ -97,6 +158,9 @@ def new_indi(owner='master', is_realtime: bool = False, implicitly_wait: int = 6
         owner(object-type)      : indi instance에 이름을 부여하기 위한 변수
         is_realtime(bool:False) : 실시간(realtime) 요청 가능 여부
         implicit_wait(int:60)   : 최대 대기시간. 시간 넘기면 raise TimeOutError
+        ingest(bool:False)      : 실시간 데이터의 decode와 전달을 별도 worker thread(Ingest.RealtimeIngestor)에서 처리
+        ingest_maxsize(int)     : ingest queue 최대 event 수
+        ingest_policy(str)      : ingest queue가 가득 찼을 때의 처리 ('block', 'drop_oldest', 'conflate')
     """
     #inst = QAxWidget("GIEXPERTCONTROL.GiExpertControlCtrl.1")
     inst = QAxWidget("SHINHANINDI.shinhanINDICtrl.1")
@@ -104,8 +168,18 @@ def new_indi(owner='master', is_realtime: bool = False, implicitly_wait: int = 6
     inst._is_realtime: bool = is_realtime
     inst._implicitly_wait = implicitly_wait
 
-    # request_ID dictionary for matching rq with TR.
-    inst._rqidD: Dict['rqid:int', "TR"] = {}
+    # request_ID dictionary for matching rq with in-flight TR requests.
+    inst._rqidD: Dict['rqid:int', "TRFuture"] = {}
+
+    # TR request scheduler :: 요청 한도(quota)와 우선순위를 관리한다.
+    inst._scheduler = tr_scheduler
+    inst._cache = tr_cache
+    inst._inflight = {}     # coalescing : (NAME, 입력값) key -> in-flight TRFuture
+    inst._rtD = {}          # 실시간 routing : NAME -> {code: [realtime instance, ...]}
+    inst._ingestor = None
+    if is_realtime and ingest:
+        inst._ingestor = Ingest.RealtimeIngestor(ingest_maxsize, ingest_policy)
+        inst._ingestor.start()
 
     # connection state :: True: connected / False: not connected
     inst._connected = not inst.GetCommState()
@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+
+
+# 서버가 부호(-)를 붙여 보낼 수 있으므로 unsigned 정수 field는 signed 정수로 decode한다.
+_SIGNED_TYPES = {
+    np.dtype(np.uint8): np.dtype(np.int16),
+    np.dtype(np.uint16): np.dtype(np.int32),
+    np.dtype(np.uint32): np.dtype(np.int64),
+    np.dtype(np.uint64): np.dtype(np.int64),
+}
+
+
+def parse_int(value) -> int:
+    """ 정수 문자열 변환. 공백/빈 문자열은 0, 부호(+/-), 천단위 ',' 및 소수점 표기를 허용한다. """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    if value is None:
+        return 0
+    value = str(value).strip().replace(',', '')
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
+def parse_float(value) -> float:
+    """ 실수 문자열 변환. 공백/빈 문자열은 nan, 부호(+/-) 및 천단위 ','를 허용한다. """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    if value is None:
+        return math.nan
+    value = str(value).strip().replace(',', '')
+    try:
+        return float(value) if value else math.nan
+    except ValueError:
+        return math.nan
+
+
+def parse_str(value) -> str:
+    return value if isinstance(value, str) else ('' if value is None else str(value))
+
+
+def to_float_array(values: np.ndarray) -> np.ndarray:
+    """ 숫자 또는 숫자 문자열 column -> float64 배열 (빈 값은 nan) """
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.float64)
+    return np.fromiter(map(parse_float, values.tolist()), dtype=np.float64, count=len(values))
+
+
+def decoded_dtype(dtype: np.dtype) -> np.dtype:
+    """ OUTPUT_DTYPE 선언으로부터 실제 decode에 쓰는 dtype (unsigned 정수 -> signed 정수) """
+    return np.dtype([(name, _SIGNED_TYPES.get(dtype[name], dtype[name])) for name in dtype.names])
+
+
+def _parser_for(field_dtype: np.dtype):
+    if field_dtype.kind in 'iu':
+        return parse_int
+    if field_dtype.kind == 'f':
+        return parse_float
+    return parse_str
+
+
+class DecoderPlan:
+    """
+    OUTPUT_DTYPE으로부터 한 번 만들어 두고 매 수신마다 재사용하는 field별 decoder.
+    numpy의 암묵적인 문자열 -> 숫자 변환 대신 field별 parse 함수로 빈 값과 부호를 처리한다.
+    """
+
+    def __init__(self, dtype: np.dtype):
+        self.src_dtype: np.dtype = dtype
+        self.dtype: np.dtype = decoded_dtype(dtype)
+        self.names: tuple = self.dtype.names
+        self.parsers: tuple = tuple(_parser_for(self.dtype[name]) for name in self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def decode_row(self, values) -> tuple:
+        """ field 순서대로의 값 목록 -> structured array에 그대로 대입할 수 있는 tuple """
+        return tuple([parse(value) for parse, value in zip(self.parsers, values)])
+
+    def decode_column(self, j: int, values: list) -> np.ndarray:
+        """ j번째 field의 값 목록을 한 번에 변환한다. 빈 값/특수 표기가 있으면 값별 parse 함수로 변환한다. """
+        field_dtype = self.dtype[j]
+        if field_dtype.kind not in 'iuf':
+            return np.array([parse_str(value) for value in values], dtype=field_dtype)
+        try:
+            return np.fromiter(map(int if field_dtype.kind in 'iu' else float, values), dtype=field_dtype, count=len(values))
+        except (TypeError, ValueError):
+            return np.fromiter(map(self.parsers[j], values), dtype=field_dtype, count=len(values))
+
+    def decode_columns(self, columns: list) -> np.ndarray:
+        """ field별 값 목록(columns) -> structured array """
+        n = len(columns[0]) if columns else 0
+        output = np.empty([n], dtype=self.dtype)
+        for j, name in enumerate(self.names):
+            output[name] = self.decode_column(j, columns[j])
+        return output
+
+
+_PLANS = {}
+
+
+def get_plan(dtype: np.dtype) -> DecoderPlan:
+    """ dtype별 DecoderPlan. 처음 사용할 때 만들고 이후에는 재사용한다. """
+    plan = _PLANS.get(dtype)
+    if plan is None:
+        plan = _PLANS[dtype] = DecoderPlan(dtype)
+    return plan
@@ -0,0 +1,177 @@
+import re
+
+import numpy as np
+
+from . import Config
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pc = pq = None
+
+
+# column 변환 종류
+KIND_NUMERIC = 'numeric'        # 숫자 dtype (그대로)
+KIND_INT = 'int'                # 숫자 문자열 -> int64 (빈 값은 null)
+KIND_FLOAT = 'float'            # 실수 문자열 -> float64 (빈 값은 null)
+KIND_DATE = 'date'              # YYYYMMDD 문자열 -> date32 (읽을 수 없으면 null)
+KIND_DICTIONARY = 'dictionary'  # 값의 종류가 적은 코드 문자열 -> dictionary<int32, string>
+KIND_STRING = 'string'
+
+_DIGITS = re.compile(r'^[+-]?\d+$')     # 앞자리 0이 있는 값('000000000000001234')도 정수
+_CODE_SUFFIXES = ('코드', '번호', '구분', '월일', '일자', '시간')  # 숫자로만 되어 있어도 문자열(코드)로 두는 column
+_FLOAT = re.compile(r'^[+-]?\d*\.\d+$|^[+-]?\d+\.\d*$')
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Export : pyarrow is required. (pip install pyarrow)")
+
+
+def output_of(tr) -> np.ndarray:
+    """ TR instance의 output (multi_output을 제공하면 multi_output, 아니면 single_output) """
+    return tr.multi_output if tr.IS_MULTI_OUTPUT else tr.single_output
+
+
+def _clean(values: list) -> list:
+    return [value.strip().replace(',', '') for value in values]
+
+
+def infer_kind(name: str, column: np.ndarray) -> str:
+    """
+    column의 변환 종류.
+    - 숫자 dtype은 그대로, '일자'로 끝나는 8자리 column은 date32
+    - 2자 이하 코드(장구분, 소속구분 등)와 값의 종류가 Config.EXPORT_DICT_MAX_UNIQUE 이하인 문자열은 dictionary
+    - 모든 값이 정수(실수) 문자열이면 int64(float64). 코드/번호/구분 등으로 끝나는 column('005930' 등)은 문자열로 둔다.
+    """
+    if column.dtype.kind in 'biuf':
+        return KIND_NUMERIC
+    if column.dtype.kind != 'U':
+        return KIND_STRING
+    n_chars = column.dtype.itemsize // 4
+    if name.endswith('일자') and n_chars == 8:
+        return KIND_DATE
+    if n_chars <= 2:
+        return KIND_DICTIONARY
+    values = [value for value in _clean(column.tolist()) if value]
+    if values and not name.endswith(_CODE_SUFFIXES):
+        if all(_DIGITS.match(value) for value in values):
+            return KIND_INT
+        if all(_DIGITS.match(value) or _FLOAT.match(value) for value in values):
+            return KIND_FLOAT
+    n_unique = len(set(values))
+    if n_unique <= Config.EXPORT_DICT_MAX_UNIQUE and n_unique * 2 <= len(values):
+        return KIND_DICTIONARY
+    return KIND_STRING
+
+
+def _kind_of_type(arrow_type, column: np.ndarray) -> str:
+    if pa.types.is_dictionary(arrow_type):
+        return KIND_DICTIONARY
+    if pa.types.is_date32(arrow_type):
+        return KIND_DATE
+    if column.dtype.kind != 'U':
+        return KIND_NUMERIC
+    if pa.types.is_integer(arrow_type):
+        return KIND_INT
+    if pa.types.is_floating(arrow_type):
+        return KIND_FLOAT
+    return KIND_STRING
+
+
+def _to_int(value: str) -> int:
+    if not _DIGITS.match(value):
+        raise ValueError(f"invalid literal for int: {value!r}")
+    return int(value)
+
+
+def _convert(name: str, column: np.ndarray, kind: str) -> 'pa.Array':
+    """ 빈 값은 null이며, int/float로 읽을 수 없는 값이 있으면 ValueError """
+    if kind == KIND_NUMERIC:
+        return pa.array(column)
+    values = column.tolist()
+    if kind in (KIND_INT, KIND_FLOAT):
+        parse, arrow_type = (_to_int, pa.int64()) if kind == KIND_INT else (float, pa.float64())
+        try:
+            return pa.array([parse(value) if value else None for value in _clean(values)], type=arrow_type)
+        except ValueError as e:
+            raise ValueError(f"Export : column {name!r} is not {kind} ({e})") from None
+    strings = pa.array([value.strip() for value in values], type=pa.string())
+    if kind == KIND_DATE:
+        timestamps = pc.strptime(strings, format='%Y%m%d', unit='s', error_is_null=True)
+        return timestamps.cast(pa.date32())
+    if kind == KIND_DICTIONARY:
+        return strings.dictionary_encode()
+    return strings
+
+
+def to_table(output, kinds: dict = None, schema: 'pa.Schema' = None) -> 'pa.Table':
+    """
+    TR의 output(np.ndarray 또는 TR instance)을 column type을 줄인 Arrow Table로 변환한다.
+    :param kinds: column명 -> 변환 종류(KIND_*). 지정하지 않은 column은 infer_kind()를 따른다.
+    :param schema: 지정하면 해당 schema의 type으로 변환한다. (여러 batch를 같은 schema로 저장할 때)
+                   type으로 변환할 수 없는 값('1.5' -> int64 등)이 있으면 ValueError
+    """
+    _require_pyarrow()
+    if not isinstance(output, np.ndarray):
+        output = output_of(output)
+    kinds = kinds or {}
+    arrays, fields = [], []
+    for name in output.dtype.names:
+        column = output[name]
+        if schema is not None:
+            arrow_type = schema.field(name).type
+            array = _convert(name, column, _kind_of_type(arrow_type, column))
+            if array.type != arrow_type:
+                array = array.cast(arrow_type)
+        else:
+            array = _convert(name, column, kinds.get(name) or infer_kind(name, column))
+        arrays.append(array)
+        fields.append(pa.field(name, array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_parquet(output, filepath: str, kinds: dict = None, **kwargs) -> 'pa.Table':
+    """ output을 Parquet 파일 하나로 저장한다. (kwargs는 pyarrow.parquet.write_table() 인자) """
+    table = to_table(output, kinds)
+    pq.write_table(table, filepath, **kwargs)
+    return table
+
+
+class DatasetWriter:
+    """
+    TR output을 partition별 Parquet dataset(root/<column>=<값>/...parquet)에 batch 단위로 추가한다.
+    ex) 매일 받은 stock_mst를 거래일 partition에 추가
+        writer = Export.DatasetWriter('APISH2\\Export\\stock_mst')
+        writer.append(stock_mst, 거래일='20240102')
+    첫 batch(또는 schema)의 column type을 이후 batch에도 적용하여 dataset의 schema를 일정하게 유지한다.
+    이후 batch에 해당 type으로 변환할 수 없는 값이 있으면 append()는 ValueError를 낸다. (null로 바꾸지 않는다.)
+    <parameters>
+    root(str)           : dataset 경로
+    kinds(dict)         : column명 -> 변환 종류 (to_table() 참고)
+    schema(pa.Schema)   : partition column을 제외한 schema (기본값은 첫 batch에서 정한다.)
+    """
+
+    def __init__(self, root: str, kinds: dict = None, schema: 'pa.Schema' = None):
+        _require_pyarrow()
+        self.root = root
+        self.kinds = kinds
+        self.schema = schema
+        self.n_batches, self.n_rows = 0, 0
+
+    def append(self, output, **partitions) -> 'pa.Table':
+        """
+        output을 batch 하나로 추가한다.
+        :param partitions: partition column명 -> 값 (ex. 거래일='20240102'). 지정한 순서대로 directory가 된다.
+        """
+        table = to_table(output, self.kinds, self.schema)
+        if self.schema is None:
+            self.schema = table.schema
+        for name, value in partitions.items():
+            table = table.append_column(name, pa.array([str(value)] * table.num_rows, type=pa.string()))
+        pq.write_to_dataset(table, self.root, partition_cols=list(partitions) or None)
+        self.n_batches += 1
+        self.n_rows += table.num_rows
+        return table
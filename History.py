@@ -0,0 +1,263 @@
+import os
+import re
+import time
+import warnings
+import datetime
+from glob import glob
+
+import numpy as np
+
+from . import Config, Cache
+from .BaseTRRT import BaseChartTR
+from .ParameterBooks import InputParameterBook as Ibook
+
+
+# 파일 구조 : root/<차트 TR NAME>/<그래프종류>_<시간간격>/
+#   <code>.meta.npz     : generation(현재 data 파일 번호), ranges(보관 중인 일자 구간 [(시작일, 종료일)], 양끝 포함)
+#   <code>.<gen>.npy    : 시간순 multi_output + 수정 column. meta를 교체(os.replace)하는 것으로 갱신을 확정한다.
+_INTERVAL = re.compile(r'^(\d*)(m|d|D|w|W|M|mo)$')
+_INTERVAL_KINDS = {'m': Ibook.그래프종류.분데이터, 'd': Ibook.그래프종류.일데이터, 'D': Ibook.그래프종류.일데이터,
+                   'w': Ibook.그래프종류.주데이터, 'W': Ibook.그래프종류.주데이터,
+                   'M': Ibook.그래프종류.월데이터, 'mo': Ibook.그래프종류.월데이터}
+_RANGE_DTYPE = np.dtype([('시작일', 'U8'), ('종료일', 'U8')])
+
+
+def parse_interval(interval: str) -> tuple:
+    """
+    interval -> (그래프종류, 시간간격)
+    ex) '1m' -> ('1', '1'), '5m' -> ('1', '5'), '1d'/'D' -> ('D', '1'), '1w'/'W' -> ('W', '1'), '1M'/'mo' -> ('M', '1')
+    """
+    match = _INTERVAL.match(interval)
+    if match is None:
+        raise ValueError(f"History : invalid interval {interval!r}")
+    kind = _INTERVAL_KINDS[match.group(2)]
+    n = match.group(1) or '1'
+    if kind != Ibook.그래프종류.분데이터 and n != '1':
+        raise ValueError(f"History : only minute data supports interval > 1, got {interval!r}")
+    return kind, n
+
+
+def _shift_date(date: str, days: int) -> str:
+    return (datetime.datetime.strptime(date, '%Y%m%d') + datetime.timedelta(days=days)).strftime('%Y%m%d')
+
+
+def add_range(ranges: list, start: str, end: str) -> list:
+    """ 일자 구간 list(정렬, 양끝 포함)에 [start, end]를 합친 새 list. 맞닿은 구간은 하나로 합친다. """
+    merged = []
+    for s, e in sorted(ranges + [(start, end)]):
+        if merged and s <= _shift_date(merged[-1][1], 1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def missing_ranges(ranges: list, start: str, end: str) -> list:
+    """ [start, end] 중 ranges에 포함되지 않는 일자 구간 list """
+    gaps = []
+    if start > end:
+        return gaps
+    for s, e in ranges:
+        if e < start:
+            continue
+        if s > end:
+            break
+        if s > start:
+            gaps.append((start, _shift_date(s, -1)))
+        start = _shift_date(e, 1)
+        if start > end:
+            return gaps
+    gaps.append((start, end))
+    return gaps
+
+
+class _Series:
+    """ (code, interval) 하나의 저장 상태 (프로세스 내 cache) """
+    __slots__ = ('meta_path', 'meta_mtime', 'generation', 'ranges', 'data', 'dates', 'today_fetched_at')
+
+    def __init__(self, meta_path: str):
+        self.meta_path = meta_path
+        self.meta_mtime = None
+        self.generation = 0
+        self.ranges = []
+        self.data = None        # 읽기 전용 memmap
+        self.dates = None       # 일자 column (searchsorted용 연속 배열)
+        self.today_fetched_at = 0.
+
+
+class HistoryStore:
+    """
+    차트 TR(TR_SCHART 등)의 과거 데이터를 (code, interval)별 파일에 보관하고, 없는 일자 구간만 서버에 요청한다.
+    ex) store = api.History.HistoryStore(api.TR_SCHART(indi_instance))
+        store.get_history('005930', '1m', '20240101', '20240131')
+    - 보관 중인 일자 구간을 기록해 두고, 요청 구간 중 빠진 구간만 iter_pages()로 받아 기존 데이터와 합친다.
+      (같은 일자+시간의 행은 새로 받은 행을 쓴다.) 받은 행이 없는 구간(휴장일 등)도 보관 구간으로 기록한다.
+    - 수정 column(BaseChartTR.add_adjusted_columns)은 합친 전체 구간에 대해 다시 계산하여 함께 저장한다.
+      수정배수는 이전 행들의 수정계수 누적곱이므로, 새 주가수정계수 event가 들어오면 이후 행의 수정 column이 바뀐다.
+      (수정 column의 기준은 보관 중인 가장 오래된 행이다.)
+    - 현재 거래일(Cache.trading_date())은 장중에 바뀌므로 보관 구간으로 기록하지 않고, refresh_sec마다 다시 받는다.
+    - get_history()는 memmap의 slice(읽기 전용 view)를 반환한다. 수정하려면 copy()한다.
+    - data 파일은 갱신할 때마다 새 번호(generation)로 쓰고 meta 파일을 교체하므로, 다른 프로세스가 읽는 중에도 갱신할 수 있다.
+      (이전 번호의 파일은 지울 수 있을 때 지운다.) 한 (code, interval)은 한 프로세스에서만 갱신한다.
+    <parameters>
+    chart_tr            : 차트 TR instance (BaseChartTR). class를 지정하면 서버에 요청하지 않고 보관된 데이터만 읽는다.
+    root(str)           : 보관 경로
+    refresh_sec(float)  : 현재 거래일 데이터를 다시 받는 주기(초)
+    page_size(int)      : iter_pages()의 page 크기
+    """
+
+    def __init__(self, chart_tr, root: str = Config.HISTORY_DIR, refresh_sec: float = Config.HISTORY_REFRESH_SEC,
+                 page_size: int = BaseChartTR.MAX_PAGE_SIZE):
+        if not (isinstance(chart_tr, BaseChartTR) or isinstance(chart_tr, type) and issubclass(chart_tr, BaseChartTR)):
+            raise TypeError(f"HistoryStore : chart_tr must be a chart TR, got {chart_tr!r}")
+        self.chart_tr = chart_tr
+        self.root = root
+        self.refresh_sec = refresh_sec
+        self.page_size = page_size
+        self._series = {}       # (code, 그래프종류, 시간간격) -> _Series
+        self.n_requests, self.n_rows_fetched = 0, 0
+
+    @property
+    def can_fetch(self) -> bool:
+        return not isinstance(self.chart_tr, type)
+
+    def _dirpath(self, kind: str, n: str) -> str:
+        return os.path.join(self.root, self.chart_tr.NAME, f'{kind}_{n}')
+
+    def _data_path(self, code: str, kind: str, n: str, generation: int) -> str:
+        return os.path.join(self._dirpath(kind, n), f'{code}.{generation}.npy')
+
+    def _get_series(self, code: str, kind: str, n: str) -> _Series:
+        key = (code, kind, n)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(os.path.join(self._dirpath(kind, n), f'{code}.meta.npz'))
+        try:
+            mtime = os.stat(series.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return series
+        if mtime != series.meta_mtime:
+            self._load(series, code, kind, n, mtime)
+        return series
+
+    def _load(self, series: _Series, code: str, kind: str, n: str, mtime: int) -> None:
+        with np.load(series.meta_path, allow_pickle=False) as npz:
+            generation = int(npz['generation'])
+            ranges = [(str(s), str(e)) for s, e in npz['ranges'].tolist()]
+        series.meta_mtime, series.ranges = mtime, ranges
+        if generation != series.generation or series.data is None:
+            series.generation = generation
+            series.data = np.load(self._data_path(code, kind, n, generation), mmap_mode='r', allow_pickle=False)
+            series.dates = np.ascontiguousarray(series.data[self.chart_tr.DATE_FIELD])
+
+    def ranges(self, code: str, interval: str) -> list:
+        """ 보관 중인 일자 구간 list [(시작일, 종료일)] """
+        return list(self._get_series(code, *parse_interval(interval)).ranges)
+
+    def get_history(self, code: str, interval: str, start: str = '00000000', end: str = '99999999',
+                    fetch: bool = True) -> np.ndarray:
+        """
+        code의 start ~ end 일자(YYYYMMDD, 양끝 포함) 차트 데이터. (시간순, 수정 column 포함)
+        fetch=True이면 보관되지 않은 구간을 먼저 서버에서 받는다.
+        :return: 읽기 전용 배열 (보관된 데이터가 없으면 None)
+        """
+        kind, n = parse_interval(interval)
+        series = self._get_series(code, kind, n)
+        if fetch and self.can_fetch:
+            self._fill(series, code, kind, n, start, end)
+        if series.data is None:
+            return None
+        lo = np.searchsorted(series.dates, start, side='left')
+        hi = np.searchsorted(series.dates, end, side='right')
+        return series.data[lo:hi]
+
+    def update(self, codes, interval: str, start: str = '00000000', end: str = '99999999') -> dict:
+        """
+        codes의 start ~ end 구간 중 보관되지 않은 구간을 받는다. (ex. 매일 아침 전 종목 갱신)
+        :return: code -> 보관 중인 행 수
+        """
+        kind, n = parse_interval(interval)
+        counts = {}
+        for code in [codes] if isinstance(codes, str) else codes:
+            series = self._get_series(code, kind, n)
+            self._fill(series, code, kind, n, start, end)
+            counts[code] = 0 if series.data is None else len(series.data)
+        return counts
+
+    def _fill(self, series: _Series, code: str, kind: str, n: str, start: str, end: str) -> None:
+        today = Cache.trading_date()
+        gaps = missing_ranges(series.ranges, start, min(end, today))
+        if not gaps:
+            return
+        if gaps[-1][1] == today and time.time() - series.today_fetched_at < self.refresh_sec:
+            gaps[-1] = (gaps[-1][0], _shift_date(today, -1))
+            if gaps[-1][0] > gaps[-1][1]:
+                gaps.pop()
+        if not gaps:
+            return
+        pages = []
+        for gap_start, gap_end in gaps:
+            for page in self.chart_tr.iter_pages(code, kind, n, gap_start, gap_end, self.page_size):
+                pages.append(page)
+                self.n_requests += 1
+        ranges = series.ranges
+        for gap_start, gap_end in gaps:
+            if gap_end == today:
+                series.today_fetched_at = time.time()
+                gap_end = _shift_date(today, -1)
+            if gap_start <= gap_end:
+                ranges = add_range(ranges, gap_start, gap_end)
+        self._write(series, code, kind, n, pages, ranges)
+
+    def _merge(self, old: np.ndarray, pages: list) -> np.ndarray:
+        """ 기존 데이터(수정 column 포함)와 새로 받은 page들을 일자+시간 순서로 합친다. (같은 행은 새 page의 값) """
+        dtype = pages[0].dtype if pages else self.chart_tr.get_multi_decoder().dtype
+        n_new = sum(len(page) for page in pages)
+        n_old = 0 if old is None else len(old)
+        combined = np.empty([n_new + n_old], dtype=dtype)
+        i = 0
+        for page in pages:
+            combined[i:i + len(page)] = page
+            i += len(page)
+        if n_old:
+            for name in dtype.names:
+                combined[name][n_new:] = old[name]
+        if self.chart_tr.time_field(dtype) is None:
+            # 시간 field가 없으면 일자 단위로 교체한다. (새로 받은 일자의 기존 행은 버린다.)
+            dates = combined[self.chart_tr.DATE_FIELD]
+            keep = np.ones([len(combined)], dtype=bool)
+            keep[n_new:] = ~np.isin(dates[n_new:], dates[:n_new])
+            combined = combined[keep]
+            return combined[np.argsort(combined[self.chart_tr.DATE_FIELD], kind='stable')]
+        _, index = np.unique(self.chart_tr._row_keys(combined), return_index=True)
+        return combined[index]
+
+    def _write(self, series: _Series, code: str, kind: str, n: str, pages: list, ranges: list) -> None:
+        data = self.chart_tr.add_adjusted_columns(self._merge(series.data, pages))
+        self.n_rows_fetched += sum(len(page) for page in pages)
+        generation = series.generation + 1
+        dirpath = self._dirpath(kind, n)
+        os.makedirs(dirpath, exist_ok=True)
+        with warnings.catch_warnings():
+            # 한글 field명 dtype은 .npy format 3.0으로 저장된다. (NumPy >= 1.17)
+            warnings.simplefilter('ignore', UserWarning)
+            np.save(self._data_path(code, kind, n, generation), data, allow_pickle=False)
+            tmp_path = series.meta_path + '.tmp.npz'
+            np.savez(tmp_path, generation=np.array(generation), ranges=np.array(ranges, dtype=_RANGE_DTYPE))
+        os.replace(tmp_path, series.meta_path)
+        series.data = series.dates = None
+        self._load(series, code, kind, n, os.stat(series.meta_path).st_mtime_ns)
+        self._remove_old(code, kind, n, generation)
+
+    def _remove_old(self, code: str, kind: str, n: str, generation: int) -> None:
+        current = self._data_path(code, kind, n, generation)
+        for filepath in glob(os.path.join(self._dirpath(kind, n), f'{code}.*.npy')):
+            if filepath != current:
+                try:
+                    os.remove(filepath)
+                except OSError:     # 다른 프로세스가 memmap으로 열고 있는 파일 (Windows)
+                    pass
+
+    def close(self) -> None:
+        """ 열려 있는 memmap을 닫는다. """
+        self._series.clear()
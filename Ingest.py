@@ -0,0 +1,187 @@
+import heapq
+import threading
+from time import monotonic, time
+from collections import deque, OrderedDict
+
+from . import Config, Logger
+
+
+# queue가 가득 찼을 때의 처리 방식
+OVERFLOW_BLOCK = 'block'                # 자리가 날 때까지 수신 핸들러(Qt thread)가 대기
+OVERFLOW_DROP_OLDEST = 'drop_oldest'    # 가장 오래된 event를 버림
+OVERFLOW_CONFLATE = 'conflate'          # 같은 (NAME, code)의 대기 중인 event를 최신 event로 교체 (가득 차면 가장 오래된 event를 버림)
+
+
+class RawEvent:
+    """ Qt thread에서 읽은 실시간 데이터 원(raw) 값 """
+    __slots__ = ('name', 'code', 'realtime_insts', 'single_raw', 'multi_raw', 'rcv_time')
+
+    def __init__(self, name, code, realtime_insts, single_raw, multi_raw, rcv_time):
+        self.name, self.code, self.realtime_insts = name, code, realtime_insts
+        self.single_raw, self.multi_raw, self.rcv_time = single_raw, multi_raw, rcv_time
+
+
+class _Timing:
+    """ 처리 시간 통계 (초) """
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count, self.total, self.max = 0, 0., 0.
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self) -> dict:
+        return {'count': self.count, 'avg': self.total / self.count if self.count else 0., 'max': self.max}
+
+
+class RealtimeIngestor:
+    """
+    실시간 데이터의 수신과 처리를 분리한다.
+    - Core의 수신 핸들러(Qt thread)는 COM으로 원(raw) 값만 읽어 bounded queue에 넣는다.
+    - worker thread가 queue에서 꺼내 decode하고 realtime instance의 output/구독(subscribe)에 전달한다.
+    따라서 구독 callback, stream listener는 worker thread에서 호출된다.
+    <parameters>
+    maxsize(int)    : queue 최대 event 수
+    policy(str)     : queue가 가득 찼을 때의 처리 (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_CONFLATE)
+    """
+
+    def __init__(self, maxsize: int = Config.RT_QUEUE_MAXSIZE, policy: str = Config.RT_QUEUE_POLICY):
+        if policy not in (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_CONFLATE):
+            raise ValueError(f"RealtimeIngestor : unknown overflow policy {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._queue = OrderedDict() if policy == OVERFLOW_CONFLATE else deque()
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._timers = []       # worker thread에서 실행할 (due, seq, fn) heap
+        self._thread: threading.Thread = None
+        self._running = False
+        # metrics
+        self.n_received, self.n_processed, self.n_dropped, self.n_conflated = 0, 0, 0, 0
+        self.max_depth = 0
+        self.handler_time = _Timing()       # 수신 핸들러(Qt thread)에서 raw 값을 읽어 queue에 넣는 시간
+        self.process_time = _Timing()       # worker thread에서 event 하나를 decode/전달하는 시간
+        self.queue_latency = _Timing()      # 수신 ~ 처리 시작까지의 시간
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        """ queue 깊이 및 처리 시간 통계 """
+        return {
+            'queue_depth': self.queue_depth,
+            'max_depth': self.max_depth,
+            'received': self.n_received,
+            'processed': self.n_processed,
+            'dropped': self.n_dropped,
+            'conflated': self.n_conflated,
+            'handler_time': self.handler_time.to_dict(),
+            'process_time': self.process_time.to_dict(),
+            'queue_latency': self.queue_latency.to_dict(),
+        }
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='RealtimeIngestor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """ worker thread를 멈춘다. queue에 남은 event는 처리하지 않는다. """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def in_worker(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def call_later(self, delay: float, fn) -> None:
+        """ delay(초) 후 worker thread에서 fn()을 호출한다. """
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._timers, (monotonic() + delay, self._seq, fn))
+            self._cond.notify()
+
+    def put(self, event: RawEvent, handler_started: float = None) -> None:
+        """ (Qt thread) event를 queue에 넣는다. handler_started는 수신 핸들러 시작 시각(monotonic) """
+        with self._cond:
+            self.n_received += 1
+            queue = self._queue
+            if self.policy == OVERFLOW_CONFLATE:
+                key = (event.name, event.code)
+                if key in queue:
+                    queue[key] = event
+                    self.n_conflated += 1
+                else:
+                    if len(queue) >= self.maxsize:
+                        queue.popitem(last=False)
+                        self.n_dropped += 1
+                    queue[key] = event
+            else:
+                if len(queue) >= self.maxsize:
+                    if self.policy == OVERFLOW_BLOCK:
+                        while len(queue) >= self.maxsize and self._running:
+                            self._cond.wait()
+                    else:
+                        queue.popleft()
+                        self.n_dropped += 1
+                queue.append(event)
+            if len(queue) > self.max_depth:
+                self.max_depth = len(queue)
+            self._cond.notify_all()
+        if handler_started is not None:
+            self.handler_time.add(monotonic() - handler_started)
+
+    def _take_all(self) -> list:
+        """ queue의 event를 모두 꺼낸다. event가 없으면 다음 timer 또는 새 event까지 대기한다. """
+        with self._cond:
+            while self._running:
+                if self._queue:
+                    if self.policy == OVERFLOW_CONFLATE:
+                        events = list(self._queue.values())
+                    else:
+                        events = list(self._queue)
+                    self._queue.clear()
+                    self._cond.notify_all()     # OVERFLOW_BLOCK으로 대기 중인 수신 핸들러
+                    return events
+                if self._timers and self._timers[0][0] <= monotonic():
+                    return []
+                self._cond.wait(self._timers[0][0] - monotonic() if self._timers else None)
+            return []
+
+    def _run_due_timers(self) -> None:
+        while True:
+            with self._cond:
+                if not (self._timers and self._timers[0][0] <= monotonic()):
+                    return
+                _, _, fn = heapq.heappop(self._timers)
+            try:
+                fn()
+            except Exception as e:
+                Logger.write_log("RealtimeIngestor : timer callback raised an exception", repr(e))
+
+    def _run(self) -> None:
+        while self._running:
+            events = self._take_all()
+            for event in events:
+                self._process(event)
+            self._run_due_timers()
+
+    def _process(self, event: RawEvent) -> None:
+        started = monotonic()
+        self.queue_latency.add(max(0., time() - event.rcv_time))
+        for realtime_inst in event.realtime_insts:
+            try:
+                realtime_inst._apply_raw(event.code, event.single_raw, event.multi_raw, event.rcv_time)
+            except Exception as e:
+                Logger.write_log(f"RealtimeIngestor : failed to process {event.name} {event.code}", repr(e))
+        self.n_processed += 1
+        self.process_time.add(monotonic() - started)
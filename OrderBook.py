@@ -0,0 +1,195 @@
+import re
+
+import numpy as np
+
+from . import Decoders
+
+
+ASK, BID = 0, 1     # OrderBook.prices, OrderBook.qtys의 행 (매도, 매수)
+
+_LEVEL_FIELD = re.compile(r'^(매도|매수)(\d+)호가(수량)?$')
+_SIDES = {'매도': ASK, '매수': BID}
+
+
+class _BookPlan:
+    """
+    호가 tick dtype에서 (2, depth) 가격/잔량 배열을 채우는 방법.
+    가격(또는 잔량) field들이 같은 숫자 type이고 일정한 간격으로 놓여 있으면 (SH, QH, WH 등)
+    tick buffer 위의 strided view로 한 번에 복사하고, 문자열 field(FH, LH 등)는 field별로 변환한다.
+    """
+
+    def __init__(self, dtype: np.dtype, depth: int = None):
+        levels = {}     # (is_qty, side, level) -> field name
+        for name in dtype.names:
+            match = _LEVEL_FIELD.match(name)
+            if match:
+                levels[(match.group(3) is not None, _SIDES[match.group(1)], int(match.group(2)))] = name
+        max_depth = max((level for _, _, level in levels), default=0)
+        self.depth = max_depth if depth is None else min(depth, max_depth)
+        if self.depth == 0:
+            raise ValueError(f"OrderBook : no price level fields in dtype {dtype.names}")
+        self.dtype = dtype
+        self.time_field = '호가접수시간' if '호가접수시간' in dtype.names else None
+        self.fields = {}    # (is_qty, side) -> [field name] (level 순서, 없는 level은 None)
+        for is_qty in (False, True):
+            for side in (ASK, BID):
+                self.fields[(is_qty, side)] = [levels.get((is_qty, side, level)) for level in range(1, self.depth + 1)]
+        # is_qty -> (base dtype, offset, strides) : (2, depth) 가격/잔량 strided view. 불가능하면 None
+        self.views = {is_qty: self._strided(dtype, self.fields[(is_qty, ASK)], self.fields[(is_qty, BID)])
+                      for is_qty in (False, True)}
+
+    def _strided(self, dtype: np.dtype, ask_names: list, bid_names: list):
+        names = ask_names + bid_names
+        if None in names or any(dtype[name] != dtype[names[0]] for name in names):
+            return None
+        base = dtype[names[0]]
+        if base.kind not in 'iuf':
+            return None
+        ask_offsets = [dtype.fields[name][1] for name in ask_names]
+        bid_offsets = [dtype.fields[name][1] for name in bid_names]
+        stride = ask_offsets[1] - ask_offsets[0] if self.depth > 1 else base.itemsize
+        side_stride = bid_offsets[0] - ask_offsets[0]
+        if any(offset - ask_offsets[0] != level * stride for level, offset in enumerate(ask_offsets)) or \
+                any(offset - ask_offsets[level] != side_stride for level, offset in enumerate(bid_offsets)):
+            return None
+        return base, ask_offsets[0], (side_stride, stride)
+
+    def fill(self, tick: np.ndarray, prices: np.ndarray, qtys: np.ndarray) -> None:
+        """ tick(shape [1]) -> prices, qtys (in-place) """
+        raw = None
+        for is_qty, out in ((False, prices), (True, qtys)):
+            view = self.views[is_qty]
+            if view is not None:
+                if raw is None:
+                    raw = np.ascontiguousarray(tick).view(np.uint8)
+                base, offset, strides = view
+                out[:] = np.ndarray(shape=out.shape, dtype=base, buffer=raw, offset=offset, strides=strides)
+            else:
+                parse = Decoders.parse_int if is_qty else Decoders.parse_float
+                row = tick[0]
+                for side in (ASK, BID):
+                    for level, name in enumerate(self.fields[(is_qty, side)]):
+                        out[side, level] = 0 if name is None else parse(row[name])
+
+
+class OrderBook:
+    """
+    종목 하나의 호가창. 호가 tick(SH, FH, QH, LH, WH 등)을 받을 때마다 배열을 제자리에서 갱신하고
+    spread/mid/microprice/imbalance/누적잔량을 함께 계산해 둔다. (조회 시 재계산하지 않는다.)
+    - prices : (2, depth) float64, qtys : (2, depth) int64. 0행은 매도(ASK), 1행은 매수(BID), 열은 1호가부터
+    - 호가가 없는 쪽(가격 0)이 있으면 spread, mid, microprice는 nan이다.
+    """
+
+    def __init__(self, code: str, depth: int):
+        self.code = code
+        self.depth = depth
+        self.prices = np.zeros([2, depth], dtype=np.float64)
+        self.qtys = np.zeros([2, depth], dtype=np.int64)
+        self.cum_depth = np.zeros([2, depth], dtype=np.int64)   # 1호가부터의 누적잔량
+        self.time = ''      # 호가접수시간
+        self.n_updates = 0
+        self.spread = self.mid = self.microprice = np.nan
+        self.imbalance = np.nan     # 전체 depth 기준 (매수잔량 - 매도잔량) / (매수잔량 + 매도잔량)
+
+    @property
+    def best_ask(self) -> float:
+        return float(self.prices[ASK, 0])
+
+    @property
+    def best_bid(self) -> float:
+        return float(self.prices[BID, 0])
+
+    def update(self, tick: np.ndarray, plan: _BookPlan = None) -> None:
+        """ 호가 tick(shape [1])으로 호가창을 갱신한다. """
+        plan = get_plan(tick.dtype, self.depth) if plan is None else plan
+        plan.fill(tick, self.prices, self.qtys)
+        if plan.time_field is not None:
+            self.time = str(tick[plan.time_field][0])
+        self.n_updates += 1
+        self._update_metrics()
+
+    def _update_metrics(self) -> None:
+        np.cumsum(self.qtys, axis=1, out=self.cum_depth)
+        ask, bid = self.prices[:, 0].tolist()
+        ask_qty, bid_qty = self.qtys[:, 0].tolist()
+        if ask > 0 and bid > 0:
+            self.spread = ask - bid
+            self.mid = (ask + bid) / 2
+            top = ask_qty + bid_qty
+            self.microprice = (ask * bid_qty + bid * ask_qty) / top if top else self.mid
+        else:
+            self.spread = self.mid = self.microprice = np.nan
+        total_ask, total_bid = self.cum_depth[:, -1].tolist()
+        total = total_ask + total_bid
+        self.imbalance = (total_bid - total_ask) / total if total else np.nan
+
+    def imbalance_at(self, levels: int) -> float:
+        """ 1 ~ levels호가 잔량 기준 imbalance """
+        level = min(levels, self.depth) - 1
+        total_ask, total_bid = self.cum_depth[:, level].tolist()
+        total = total_ask + total_bid
+        return (total_bid - total_ask) / total if total else np.nan
+
+    def depth_within(self, side: int, levels: int) -> int:
+        """ side(ASK/BID)의 1 ~ levels호가 누적잔량 """
+        return int(self.cum_depth[side, min(levels, self.depth) - 1])
+
+
+class OrderBooks:
+    """
+    code별 OrderBook 모음. realtime instance의 구독에 연결하여 사용한다.
+    ex) books = api.OrderBook.OrderBooks(); sh.subscribe(books.on_tick); books['005930'].microprice
+    <parameters>
+    depth(int)  : 보관할 호가 단계 수 (기본값은 tick dtype의 전체 단계. SH 10, FH/QH 5)
+    """
+
+    def __init__(self, depth: int = None):
+        self.depth = depth
+        self._books = {}
+
+    def __getitem__(self, code: str) -> OrderBook:
+        return self._books[code]
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._books
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def get(self, code: str) -> OrderBook:
+        """ code의 OrderBook (수신 전이면 None) """
+        return self._books.get(code)
+
+    def codes(self) -> list:
+        return list(self._books)
+
+    def update(self, code: str, tick: np.ndarray) -> OrderBook:
+        """ 호가 tick(shape [1] 배열 또는 record)으로 code의 호가창을 갱신한다. """
+        tick = np.asarray(tick).reshape(1)
+        plan = get_plan(tick.dtype, self.depth)
+        book = self._books.get(code)
+        if book is None:
+            book = self._books[code] = OrderBook(code, plan.depth)
+        book.update(tick, plan)
+        return book
+
+    def on_tick(self, code: str, tick: np.ndarray) -> None:
+        """ BaseRealtime.subscribe(batch=False) callback 형식 """
+        self.update(code, tick)
+
+    def on_ticks(self, codes: list, ticks: np.ndarray) -> None:
+        """ BaseRealtime.subscribe(batch=True) callback 형식 """
+        for i, code in enumerate(codes):
+            self.update(code, ticks[i:i + 1])
+
+
+_plans = {}
+
+
+def get_plan(dtype: np.dtype, depth: int = None) -> _BookPlan:
+    """ dtype별 _BookPlan (cache) """
+    key = (dtype, depth)
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _plans[key] = _BookPlan(dtype, depth)
+    return plan
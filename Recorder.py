@@ -0,0 +1,270 @@
+import os
+import re
+import ast
+import struct
+import hashlib
+import datetime
+import threading
+
+import numpy as np
+
+from . import Config, Logger, Cache, TickStore
+
+
+# 파일 구조 : header(HEADER_SIZE의 배수) + record(single_output dtype + 수신시각) 배열
+#   파일명 : <NAME>.<segment>.rec (fields를 지정하면 <NAME>_<dtype hash>.<segment>.rec, segment는 0000부터)
+#   0  magic(8s) | 8  version(H) | 10 reserved(H) | 12 header 크기(I) | 16 확정된 record 수(Q)
+#   24 dtype descr 길이(I) | 28 dtype descr (repr, utf8)
+MAGIC = b'APISHREC'
+VERSION = 1
+HEADER_SIZE = 4096
+_HEADER = struct.Struct('<8sHHIQI')
+_COUNT_OFFSET = 16
+_SEGMENT = re.compile(r'^(?P<base>[^.]+)\.(?P<segment>\d+)\.rec$')
+
+
+def _descr_digest(dtype: np.dtype) -> str:
+    return hashlib.sha1(repr(dtype.descr).encode('utf8')).hexdigest()[:8]
+
+
+def _write_header(f, dtype: np.dtype) -> int:
+    descr = repr(dtype.descr).encode('utf8')
+    header_len = -(-(_HEADER.size + len(descr)) // HEADER_SIZE) * HEADER_SIZE
+    f.write(_HEADER.pack(MAGIC, VERSION, 0, header_len, 0, len(descr)) + descr)
+    f.write(b'\x00' * (header_len - _HEADER.size - len(descr)))
+    return header_len
+
+
+def read_header(filepath: str) -> tuple:
+    """ :return: (dtype, 확정된 record 수, header 크기) """
+    with open(filepath, 'rb') as f:
+        magic, version, _, header_len, n_rows, descr_len = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Recorder : {filepath} is not a tick record file")
+        descr = ast.literal_eval(f.read(descr_len).decode('utf8'))
+    return np.dtype(descr), n_rows, header_len
+
+
+def segment_paths(directory: str, filename: str) -> list:
+    """ directory에서 filename(<NAME> 또는 <NAME>_<dtype hash>)의 기록 파일(segment) 경로들 (segment 순) """
+    if not os.path.isdir(directory):
+        return []
+    segments = []
+    for name in os.listdir(directory):
+        match = _SEGMENT.match(name)
+        if match and match.group('base') == filename:
+            segments.append((int(match.group('segment')), os.path.join(directory, name)))
+    return [filepath for _, filepath in sorted(segments)]
+
+
+def open_record(filepath: str) -> np.ndarray:
+    """
+    기록 파일의 확정된(flush된) record를 읽기 전용 memmap으로 연다. 기록 중인 파일도 열 수 있다.
+    (이후 추가된 record를 보려면 다시 연다.)
+    """
+    dtype, n_rows, header_len = read_header(filepath)
+    if n_rows == 0:
+        return np.empty([0], dtype=dtype)
+    return np.memmap(filepath, dtype=dtype, mode='r', offset=header_len, shape=(n_rows,))
+
+
+class _RecordFile:
+    """
+    기록 파일(segment) 하나. 생성할 때 capacity개 record 크기로 만들고, 매핑한 후에는 크기를 바꾸지 않는다.
+    (Windows에서는 다른 프로세스가 매핑하고 있는 파일의 크기를 바꿀 수 없다.)
+    확정된 record 수는 data를 flush한 후에 header에 기록한다.
+    append()와 pending()은 TickRecorder의 lock 안에서, commit()은 lock 밖에서(flush thread) 호출한다.
+    """
+
+    def __init__(self, filepath: str, row_dtype: np.dtype, capacity: int):
+        dtype = TickStore.with_rcv_time(row_dtype)
+        self.filepath, self.dtype = filepath, dtype
+        # row_dtype이 padding 없이 record 앞부분과 같은 배치이면 record를 byte 단위로 복사한다. (field별 대입보다 빠르다.)
+        self.row_itemsize = row_dtype.itemsize if dtype.fields[TickStore.RCV_TIME_FIELD][1] == row_dtype.itemsize and \
+            all(dtype.fields[name][1] == row_dtype.fields[name][1] for name in row_dtype.names) else None
+        if os.path.isfile(filepath):
+            # 같은 거래일에 재시작 : 확정된 record 뒤에 이어서 기록한다.
+            file_dtype, self.n, self.header_len = read_header(filepath)
+            if file_dtype != dtype:
+                raise ValueError(f"Recorder : dtype of {filepath} does not match")
+        else:
+            with open(filepath, 'wb') as f:
+                self.header_len = _write_header(f, dtype)
+                f.truncate(self.header_len + capacity * dtype.itemsize)
+            self.n = 0
+        self.capacity = (os.path.getsize(filepath) - self.header_len) // dtype.itemsize
+        self.n_flushed = self.n
+        self._flush_lock = threading.Lock()     # commit() 순서 보장 (확정된 record 수가 줄지 않도록)
+        self._buf = self._rows = self._row_bytes = self._rcv_times = self._count = None
+        if self.n < self.capacity:
+            self._mmap()
+
+    @property
+    def full(self) -> bool:
+        return self.n >= self.capacity
+
+    def _mmap(self) -> None:
+        capacity = self.capacity
+        self._buf = np.memmap(self.filepath, dtype=self.dtype, mode='r+', offset=self.header_len, shape=(capacity,))
+        buf = self._buf.view(np.ndarray)
+        self._rows = buf[[name for name in self.dtype.names if name != TickStore.RCV_TIME_FIELD]]
+        if self.row_itemsize is not None:
+            self._row_bytes = buf.view(np.uint8).reshape(capacity, self.dtype.itemsize)[:, :self.row_itemsize]
+        self._rcv_times = buf[TickStore.RCV_TIME_FIELD]
+        self._count = np.memmap(self.filepath, dtype='<u8', mode='r+', offset=_COUNT_OFFSET, shape=(1,))
+
+    def _unmap(self) -> None:
+        self._buf = self._rows = self._row_bytes = self._rcv_times = self._count = None
+
+    def append(self, row, rcv_time: float) -> None:
+        """ record를 추가한다. (full이 아닐 때만 호출한다.) """
+        if self.row_itemsize is not None and isinstance(row, np.void):
+            self._row_bytes[self.n] = np.frombuffer(row, dtype=np.uint8)
+        else:
+            self._rows[self.n] = row
+        self._rcv_times[self.n] = rcv_time
+        self.n += 1
+
+    def pending(self) -> tuple:
+        """ commit()할 (record 수, data memmap, record 수 memmap). 확정할 record가 없으면 None """
+        if self.n == self.n_flushed:
+            return None
+        return self.n, self._buf, self._count
+
+    def commit(self, n: int, buf: np.memmap, count: np.memmap) -> None:
+        """ pending()의 data memmap을 flush한 후 확정된 record 수 n을 header에 기록한다. """
+        with self._flush_lock:
+            if n <= self.n_flushed:
+                return
+            buf.flush()
+            count[0] = n
+            count.flush()
+            self.n_flushed = n
+
+    def flush(self) -> None:
+        pending = self.pending()
+        if pending is not None:
+            self.commit(*pending)
+
+    def close(self) -> None:
+        self.flush()
+        self._unmap()
+
+
+class TickRecorder:
+    """
+    실시간 데이터를 거래일별, NAME별 파일(record_dir/<거래일>/<NAME>.<segment>.rec)에 추가 기록한다.
+    realtime instance 생성 시 recorder로 지정한다. ex) api.SC(indi, recorder=recorder)
+    - record는 realtime instance의 single_output dtype에 수신시각(float64) field를 추가한 dtype이다.
+      (fields를 지정한 instance는 <NAME>_<dtype hash>.<segment>.rec에 기록한다.)
+    - 파일(segment)은 segment_rows개 record 크기로 만든 memmap이며, append()는 memmap에 record를 복사하기만 한다.
+      segment가 가득 차면 다음 segment 파일에 기록한다. (매핑 중인 파일의 크기는 바꾸지 않는다.)
+    - flush_interval(초)마다 별도 thread가 flush하고 확정된 record 수를 header에 기록한다.
+      flush(msync)는 lock 밖에서 하므로 append()를 막지 않는다.
+      프로세스가 비정상 종료되어도 마지막 flush 이후의 record만 잃는다.
+    - 다른 프로세스는 open_record()로 기록 중인 파일의 확정된 record를 읽기 전용으로 열 수 있다.
+    <parameters>
+    record_dir(str)         : 기록 경로
+    flush_interval(float)   : flush 주기(초)
+    segment_rows(int)       : 파일(segment) 하나의 record 수
+    """
+
+    def __init__(self, record_dir: str = Config.RECORD_DIR, flush_interval: float = Config.RECORD_FLUSH_SEC,
+                 segment_rows: int = Config.RECORD_SEGMENT_ROWS):
+        self.record_dir = record_dir
+        self.flush_interval = flush_interval
+        self.segment_rows = segment_rows
+        self.date: str = None
+        self._date_end = 0.     # 현재 거래일이 끝나는 시각 (time.time())
+        self._files = {}        # realtime instance -> 파일명 (<NAME> 또는 <NAME>_<dtype hash>)
+        self._segments = {}     # 파일명 -> 기록 중인 _RecordFile
+        self._retired = []      # 가득 찬 _RecordFile (확정 후 닫는다.)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.n_appended = 0
+        self._thread = threading.Thread(target=self._flush_loop, name='TickRecorder', daemon=True)
+        self._thread.start()
+
+    def append(self, realtime_inst, row, rcv_time: float) -> None:
+        """ realtime instance의 tick(row) 하나를 기록한다. """
+        with self._lock:
+            if rcv_time >= self._date_end:
+                self._rollover(rcv_time)
+            filename = self._files.get(realtime_inst)
+            if filename is None:
+                filename = self._open(realtime_inst, row.dtype)
+            record_file = self._segments[filename]
+            if record_file.full:
+                record_file = self._next_segment(filename, record_file, row.dtype)
+            record_file.append(row, rcv_time)
+            self.n_appended += 1
+
+    def _rollover(self, rcv_time: float) -> None:
+        self._close_files()
+        now = datetime.datetime.fromtimestamp(rcv_time)
+        self.date = Cache.trading_date(now)
+        start = datetime.datetime.strptime(self.date, '%Y%m%d') + datetime.timedelta(hours=Config.CACHE_ROLLOVER_HOUR)
+        self._date_end = (start + datetime.timedelta(days=1)).timestamp()
+
+    def _open(self, realtime_inst, row_dtype: np.dtype) -> str:
+        filename = realtime_inst.NAME if realtime_inst.fields is None else f'{realtime_inst.NAME}_{_descr_digest(row_dtype)}'
+        if filename not in self._segments:
+            directory = os.path.join(self.record_dir, self.date)
+            os.makedirs(directory, exist_ok=True)
+            # 같은 거래일에 재시작 : 마지막 segment에 이어서 기록한다.
+            segments = segment_paths(directory, filename)
+            segment = len(segments) - 1 if segments else 0
+            self._segments[filename] = self._segment_file(filename, segment, row_dtype)
+        self._files[realtime_inst] = filename
+        return filename
+
+    def _segment_file(self, filename: str, segment: int, row_dtype: np.dtype) -> _RecordFile:
+        filepath = os.path.join(self.record_dir, self.date, f'{filename}.{segment:04d}.rec')
+        return _RecordFile(filepath, row_dtype, self.segment_rows)
+
+    def _next_segment(self, filename: str, record_file: _RecordFile, row_dtype: np.dtype) -> _RecordFile:
+        # 가득 찬 segment는 flush thread가 확정한 후 닫는다. (lock 안에서 flush하지 않는다.)
+        self._retired.append(record_file)
+        segment = int(_SEGMENT.match(os.path.basename(record_file.filepath)).group('segment')) + 1
+        record_file = self._segments[filename] = self._segment_file(filename, segment, row_dtype)
+        return record_file
+
+    def filepath(self, realtime_inst) -> str:
+        """ realtime instance가 현재 기록 중인 파일(segment) 경로 (기록 전이면 None) """
+        filename = self._files.get(realtime_inst)
+        return None if filename is None else self._segments[filename].filepath
+
+    def flush(self) -> None:
+        """ 기록한 record를 디스크에 쓰고 확정한다. lock 안에서는 파일별 record 수만 읽는다. """
+        with self._lock:
+            record_files = self._retired + list(self._segments.values())
+            pendings = [(record_file, record_file.pending()) for record_file in record_files]
+        for record_file, pending in pendings:
+            if pending is not None:
+                record_file.commit(*pending)
+        with self._lock:
+            # 확정이 끝난 가득 찬 segment를 닫는다.
+            done = [record_file for record_file in self._retired if record_file.n_flushed == record_file.n]
+            for record_file in done:
+                self._retired.remove(record_file)
+                record_file.close()
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                Logger.write_log("TickRecorder : failed to flush", e)
+
+    def _close_files(self) -> None:
+        for record_file in self._retired + list(self._segments.values()):
+            record_file.close()
+        self._files.clear()
+        self._segments.clear()
+        self._retired.clear()
+
+    def close(self) -> None:
+        """ flush thread를 멈추고 모든 파일을 flush하여 닫는다. """
+        self._stopped.set()
+        with self._lock:
+            self._close_files()
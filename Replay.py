@@ -0,0 +1,160 @@
+import os
+import time
+import heapq
+from glob import glob
+
+import numpy as np
+
+from . import Config, Recorder, TickStore, TRRT
+from .BaseTRRT import BaseRealtime, route_targets
+
+
+_CHUNK = 65536      # 수신시각/code column을 한 번에 읽는 record 수
+
+
+class ReplayIndi:
+    """
+    Replay에서 indi instance 대신 쓰는 객체. (COM 없음)
+    realtime instance를 이 객체로 생성하고 reg_realtime()으로 재생할 code를 등록한다. (항상 성공)
+    """
+
+    def __init__(self, replay: 'Replay'):
+        self._owner = 'replay'
+        self._is_realtime = True
+        self._rqidD = {}
+        self._rtD = {}              # 실시간 routing : NAME -> {code: [realtime instance, ...]}
+        self._ingestor = replay     # batch 구독의 timer(call_later)를 재생 시각 기준으로 처리한다.
+
+    def dynamicCall(self, signature: str, *args) -> bool:
+        return True
+
+    def UnRequestRTRegAll(self) -> bool:
+        return True
+
+
+class _Stream:
+    """ 기록 파일(또는 record 배열) 하나 """
+
+    def __init__(self, name: str, records: np.ndarray, index: int):
+        self.name, self.records, self.index = name, records, index
+        self.code_field = getattr(getattr(TRRT, name, None), 'CODE_FIELD', BaseRealtime.CODE_FIELD)
+        names = [name for name in records.dtype.names if name != TickStore.RCV_TIME_FIELD]
+        self.row_dtype = np.dtype([(name, records.dtype[name]) for name in names])
+        buf = records.view(np.ndarray)
+        self._rows = buf[names]
+        # Recorder가 기록한 파일은 record 앞부분이 row_dtype과 같은 배치이므로 byte 단위로 복사한다.
+        self._row_bytes = None
+        if all(records.dtype.fields[name][1] == self.row_dtype.fields[name][1] for name in names) and len(records):
+            self._row_bytes = buf.view(np.uint8).reshape(len(records), records.dtype.itemsize)[:, :self.row_dtype.itemsize]
+
+    def events(self):
+        """ (수신시각, stream index, record index, code)를 기록 순서대로 생성한다. (code : NAME의 CODE_FIELD 값) """
+        rcv_times = self.records[TickStore.RCV_TIME_FIELD]
+        codes = self.records[self.code_field] if self.code_field in self.row_dtype.names else None
+        for start in range(0, len(self.records), _CHUNK):
+            chunk_codes = [code.strip() for code in codes[start:start + _CHUNK].tolist()] if codes is not None else None
+            for j, rcv_time in enumerate(rcv_times[start:start + _CHUNK].tolist()):
+                yield rcv_time, self.index, start + j, None if chunk_codes is None else chunk_codes[j]
+
+    def copy_to(self, i: int, single_output: np.ndarray) -> None:
+        if self._row_bytes is not None:
+            single_output.view(np.uint8)[:] = self._row_bytes[i]
+        else:
+            single_output[0] = self._rows[i]
+
+
+class Replay:
+    """
+    Recorder로 기록한 실시간 데이터를 realtime instance에 재생한다. PyQt5/COM 없이 동작한다.
+    여러 stream(ex. SC + SH + AA)을 수신시각 순서로 합쳐(heap 기반 k-way merge) 재생하며,
+    수신시각이 같으면 add()한 순서, 같은 stream 안에서는 기록 순서를 따른다. (결정적)
+    재생된 tick은 실시간 수신과 같은 경로(code별 output, ring/arena/conflator, 구독 callback)로 전달된다.
+    - realtime instance는 replay.indi로 생성하고, 재생할 code(또는 '*')를 reg_realtime()으로 등록한다.
+      실시간 수신과 같이 route_targets()로 전달한다. (CODE_FIELD가 없는 실시간 데이터(AA 등)는 NAME의 모든 instance)
+    - realtime instance의 single_output은 기록 파일의 dtype이 된다.
+    - batch 구독의 interval은 재생 시각 기준이다. 재생 시각이 필요한 객체에는 clock()을 넘긴다. (BarAggregator 등)
+    <parameters>
+    speed(float)    : None이면 최대한 빠르게, 1.0이면 기록된 속도, N이면 N배속으로 재생한다.
+    """
+
+    def __init__(self, speed: float = None):
+        self.speed = speed
+        self.indi = ReplayIndi(self)
+        self.now: float = None      # 재생 중인 tick의 수신시각
+        self.n_events = 0
+        self._streams = []
+        self._timers = []           # (재생 시각, seq, fn) heap
+        self._seq = 0
+
+    def add(self, name: str, records: np.ndarray) -> None:
+        """ NAME의 record 배열(Recorder.open_record()의 반환값 등)을 재생 대상에 추가한다. """
+        self._streams.append(_Stream(name, records, len(self._streams)))
+
+    def add_file(self, filepath: str, name: str = None) -> None:
+        """ 기록 파일을 재생 대상에 추가한다. name을 생략하면 파일명(<NAME>.<segment>.rec, <NAME>_<hash>.<segment>.rec)에서 읽는다. """
+        if name is None:
+            name = os.path.basename(filepath).split('.')[0].split('_')[0]
+        self.add(name, Recorder.open_record(filepath))
+
+    def add_day(self, date: str, names: list = None, record_dir: str = Config.RECORD_DIR) -> None:
+        """ 거래일(YYYYMMDD)의 기록 파일들(names를 지정하면 해당 NAME만)을 재생 대상에 추가한다. """
+        for filepath in sorted(glob(os.path.join(record_dir, date, '*.rec'))):
+            name = os.path.basename(filepath).split('.')[0].split('_')[0]
+            if names is None or name in names:
+                self.add_file(filepath, name)
+
+    def clock(self) -> float:
+        """ 재생 시각 (재생 전이면 현재 시각). ex) Bars.BarAggregator(seconds=60, clock=replay.clock) """
+        return time.time() if self.now is None else self.now
+
+    # realtime instance의 batch 구독(Subscription)이 사용하는 timer
+    def in_worker(self) -> bool:
+        return True
+
+    def call_later(self, delay: float, fn) -> None:
+        self._seq += 1
+        heapq.heappush(self._timers, ((self.now or 0.) + delay, self._seq, fn))
+
+    def _run_timers(self, until: float) -> None:
+        while self._timers and self._timers[0][0] <= until:
+            due, _, fn = heapq.heappop(self._timers)
+            self.now = max(self.now or due, due)
+            fn()
+
+    def run(self, start: float = None, end: float = None) -> int:
+        """
+        수신시각(time.time()) start ~ end 구간을 재생한다.
+        :return: 재생한 tick 수
+        """
+        events = heapq.merge(*(stream.events() for stream in self._streams))
+        streams, routes_by_name = self._streams, self.indi._rtD
+        wall_start, replay_start = None, None
+        n = 0
+        for rcv_time, k, i, code in events:
+            if start is not None and rcv_time < start:
+                continue
+            if end is not None and rcv_time > end:
+                break
+            self._run_timers(rcv_time)
+            if self.speed:
+                if wall_start is None:
+                    wall_start, replay_start = time.monotonic(), rcv_time
+                delay = wall_start + (rcv_time - replay_start) / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.now = rcv_time
+            n += 1
+            stream = streams[k]
+            routes = routes_by_name.get(stream.name)
+            if not routes:
+                continue
+            for realtime_inst in route_targets(routes, code):
+                dtype = realtime_inst.single_output.dtype
+                if dtype is not stream.row_dtype and dtype != stream.row_dtype:
+                    realtime_inst.single_output = np.empty([1], dtype=stream.row_dtype)
+                stream.copy_to(i, realtime_inst.single_output)
+                realtime_inst._store_single(code, rcv_time)
+                realtime_inst._notify_listeners(code)
+        self._run_timers(float('inf'))
+        self.n_events += n
+        return n
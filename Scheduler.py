@@ -0,0 +1,192 @@
+from collections import deque
+from time import monotonic
+
+from . import Config, Logger
+
+
+# TR 요청 우선순위 (값이 작을수록 먼저 보낸다)
+PRIORITY_ORDER = 0      # 주문 TR
+PRIORITY_NORMAL = 1     # 일반 조회 TR
+PRIORITY_BULK = 2       # 차트, 마스터 등 대량 조회 TR
+
+
+class TokenBucket:
+    """ 초당 rate개씩, 최대 capacity개까지 token이 채워지는 token bucket """
+
+    def __init__(self, rate: float, capacity: float = None, now: float = None):
+        self.rate = rate
+        self.capacity = max(1., rate) if capacity is None else capacity
+        self.tokens = self.capacity
+        self._last = monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def available(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= 1
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def wait_time(self, now: float) -> float:
+        """ token 1개가 채워질 때까지 남은 시간(초) """
+        self._refill(now)
+        return 0. if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _Job:
+    __slots__ = ('name', 'send', 'enqueued_at')
+
+    def __init__(self, name, send, enqueued_at):
+        self.name, self.send, self.enqueued_at = name, send, enqueued_at
+
+
+class RequestScheduler:
+    """
+    RequestData() 앞단의 TR 요청 scheduler.
+    - 전체 초당 요청 수와 TR NAME별 초당 요청 수를 token bucket으로 제한한다.
+    - 한도를 넘는 요청은 실패시키지 않고 queue에 넣었다가 token이 채워지면 보낸다.
+    - 우선순위(priority)별 queue를 두어 주문 TR이 대량 조회 TR보다 먼저 나가게 한다.
+    <parameters>
+    rate_per_sec(float)     : 전체 TR 초당 최대 요청 수
+    rate_per_sec_by_name(dict) : TR NAME별 초당 최대 요청 수
+    call_later(callable)    : call_later(delay_sec, fn). token이 채워진 후 queue를 다시 처리하기 위한 timer
+    clock(callable)         : 현재 시각(초)을 반환하는 함수 (기본값 time.monotonic)
+    """
+
+    def __init__(self,
+                 rate_per_sec: float = Config.TR_RQ_PER_SEC,
+                 rate_per_sec_by_name: dict = Config.TR_RQ_PER_SEC_BY_NAME,
+                 call_later=None, clock=monotonic):
+        self._clock = clock
+        self._bucket = TokenBucket(rate_per_sec, now=clock())
+        self._rate_by_name = dict(rate_per_sec_by_name)
+        self._buckets_by_name = {}
+        self._queues = {}
+        self._call_later = call_later
+        self._timer_pending = False
+        self._dispatching = False
+
+        # stats
+        self.n_submitted = 0
+        self.n_dispatched = 0
+        self.n_delayed = 0
+        self.total_wait = 0.
+        self.max_wait = 0.
+
+    def set_rate(self, name: str, rate_per_sec: float) -> None:
+        """ TR NAME별 초당 최대 요청 수를 설정한다. None이면 제한하지 않는다. """
+        self._buckets_by_name.pop(name, None)
+        if rate_per_sec is None:
+            self._rate_by_name.pop(name, None)
+        else:
+            self._rate_by_name[name] = rate_per_sec
+
+    def submit(self, name: str, priority: int, send) -> None:
+        """
+        TR 요청 send()를 등록한다. token이 있으면 즉시, 없으면 token이 채워지는 대로 우선순위 순서로 호출한다.
+        :param name: TR NAME
+        :param priority: PRIORITY_ORDER / PRIORITY_NORMAL / PRIORITY_BULK
+        :param send: 실제 요청(SetQueryName ~ RequestData)을 수행하는 callable
+        """
+        self.n_submitted += 1
+        queue = self._queues.get(priority)
+        if queue is None:
+            queue = self._queues[priority] = deque()
+        queue.append(_Job(name, send, self._clock()))
+        self._dispatch()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> dict:
+        """ queue 깊이 및 대기시간 통계 """
+        n_dispatched = self.n_dispatched
+        return {
+            'queue_depth': self.queue_depth,
+            'queue_depth_by_priority': {p: len(q) for p, q in sorted(self._queues.items())},
+            'submitted': self.n_submitted,
+            'dispatched': n_dispatched,
+            'delayed': self.n_delayed,
+            'avg_wait': self.total_wait / n_dispatched if n_dispatched else 0.,
+            'max_wait': self.max_wait,
+        }
+
+    def _get_bucket_by_name(self, name: str) -> TokenBucket:
+        bucket = self._buckets_by_name.get(name)
+        if bucket is None:
+            rate = self._rate_by_name.get(name)
+            if rate is None:
+                return None
+            bucket = self._buckets_by_name[name] = TokenBucket(rate, now=self._clock())
+        return bucket
+
+    def _dispatch(self) -> None:
+        if self._dispatching:
+            return
+        self._dispatching = True
+        try:
+            retry_after = self._dispatch_ready()
+        finally:
+            self._dispatching = False
+        if retry_after is not None:
+            self._schedule(retry_after)
+
+    def _dispatch_ready(self) -> float:
+        """
+        보낼 수 있는 요청을 우선순위 순서로 모두 보낸다.
+        TR NAME별 한도에 걸린 요청은 건너뛰되, 같은 NAME 안에서는 순서를 지킨다.
+        :return: 남은 요청이 있으면 다시 시도할 때까지의 시간(초), 없으면 None
+        """
+        retry_after = None
+        now = self._clock()
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            blocked = set()
+            i = 0
+            while i < len(queue):
+                if not self._bucket.available(now):
+                    return self._bucket.wait_time(now)
+                job = queue[i]
+                if job.name in blocked:
+                    i += 1
+                    continue
+                bucket = self._get_bucket_by_name(job.name)
+                if bucket is not None and not bucket.available(now):
+                    blocked.add(job.name)
+                    wait = bucket.wait_time(now)
+                    retry_after = wait if retry_after is None else min(retry_after, wait)
+                    i += 1
+                    continue
+                del queue[i]
+                self._bucket.take()
+                if bucket is not None:
+                    bucket.take()
+                self._send(job, now)
+        return retry_after
+
+    def _send(self, job: _Job, now: float) -> None:
+        wait = now - job.enqueued_at
+        self.n_dispatched += 1
+        self.total_wait += wait
+        if wait > 0.001:
+            self.n_delayed += 1
+        if wait > self.max_wait:
+            self.max_wait = wait
+        try:
+            job.send()
+        except Exception as e:
+            Logger.write_log(f"RequestScheduler : {job.name} request failed", e)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer_pending or self._call_later is None:
+            return
+        self._timer_pending = True
+        self._call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer_pending = False
+        self._dispatch()
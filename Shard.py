@@ -0,0 +1,226 @@
+from time import monotonic
+
+from PyQt5.QtCore import QTimer
+
+from . import Config, Logger, Core, TRRT
+
+
+class _Shard:
+    """ realtime indi instance 하나와, 그 indi instance로 등록한 NAME별 realtime instance """
+
+    def __init__(self, indi_instance):
+        self.indi_instance = indi_instance
+        self.realtime_insts = {}    # NAME -> realtime instance
+        self.keys = set()           # 등록된 (NAME, code)
+        self.counts = {}            # (NAME, code) -> 마지막 sample 이후 수신 건수
+
+    def count(self, realtime_inst, code: str) -> None:
+        """ realtime instance의 listener. (NAME, code)별 수신 건수를 센다. """
+        key = (realtime_inst.NAME, code)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+
+class RealtimeManager:
+    """
+    대량의 (NAME, code) 실시간 등록을 여러 realtime indi instance(shard)에 나누어 관리한다.
+    - shard는 Core.new_indi(is_realtime=True)로 생성하거나, indi_instances로 받은 것을 재사용한다.
+    - register()는 관측된 수신 빈도(건/초, 모르면 1)가 큰 순서로 부하가 가장 작은 shard에 배정하여 등록한다.
+    - rebalance()는 수신 빈도를 갱신하고, 부하가 max_load를 넘는 shard의 (NAME, code)를 부하가 작은 shard로 옮긴다.
+      (모든 shard가 max_load를 넘으면 max_shards까지 shard를 추가한다.) rebalance_interval마다 자동으로 호출된다.
+    - (NAME, code)를 옮길 때는 새 shard에 먼저 등록한 후 기존 shard에서 해지하므로, 잠시 중복 수신될 수 있다.
+      기존 shard에서 해지하지 못하면 새 shard의 등록을 되돌리고 rebalance를 멈춘다.
+    - subscribe()한 callback은 모든 shard의 해당 NAME realtime instance에 구독되므로 (NAME, code)를 옮겨도 계속 수신한다.
+    <parameters>
+    n_shards(int)               : 처음 생성할 shard 수 (indi_instances 포함)
+    max_shards(int)             : 최대 shard 수
+    max_load(float)             : shard 하나의 최대 수신 빈도(건/초)
+    rebalance_interval(float)   : 자동 rebalance 주기(초). None이면 자동으로 하지 않는다.
+    indi_instances(list)        : 재사용할 realtime indi instance
+    realtime_kwargs(dict)       : NAME -> realtime instance 생성 인자 (ex. {'SC': {'fields': ['체결시간', '현재가']}})
+    owner(str)                  : 생성하는 indi instance 이름의 접두어
+    new_indi_kwargs             : Core.new_indi()에 전달할 인자 (ex. ingest=True)
+    """
+
+    def __init__(self, n_shards: int = Config.RT_SHARD_COUNT, max_shards: int = Config.RT_SHARD_MAX,
+                 max_load: float = Config.RT_SHARD_MAX_LOAD,
+                 rebalance_interval: float = Config.RT_REBALANCE_INTERVAL_SEC,
+                 indi_instances: list = None, realtime_kwargs: dict = None, owner: str = 'rt', **new_indi_kwargs):
+        self.max_shards = max(max_shards, n_shards, len(indi_instances or ()))
+        self.max_load = max_load
+        self.realtime_kwargs = realtime_kwargs or {}
+        self.owner = owner
+        self.new_indi_kwargs = new_indi_kwargs
+        self.shards = []
+        self.rates = {}             # (NAME, code) -> 수신 빈도(건/초)
+        self.n_moves = 0
+        self._subscriptions = []    # (NAME, callback, kwargs)
+        self._sampled_at = monotonic()
+        for indi_instance in indi_instances or ():
+            self.shards.append(_Shard(indi_instance))
+        while len(self.shards) < n_shards:
+            self._add_shard()
+        self._timer = None
+        if rebalance_interval is not None:
+            self._timer = QTimer()
+            self._timer.timeout.connect(self.rebalance)
+            self._timer.start(int(rebalance_interval * 1000))
+
+    def _add_shard(self) -> _Shard:
+        indi_instance = Core.new_indi(f'{self.owner}_{len(self.shards)}', is_realtime=True, **self.new_indi_kwargs)
+        shard = _Shard(indi_instance)
+        self.shards.append(shard)
+        return shard
+
+    def _realtime_inst(self, shard: _Shard, name: str):
+        realtime_inst = shard.realtime_insts.get(name)
+        if realtime_inst is None:
+            realtime_cls = getattr(TRRT, name)
+            realtime_inst = realtime_cls(indi_instance=shard.indi_instance, **self.realtime_kwargs.get(name, {}))
+            realtime_inst._listeners.append(shard.count)
+            for sub_name, callback, kwargs in self._subscriptions:
+                if sub_name == name:
+                    realtime_inst.subscribe(callback, **kwargs)
+            shard.realtime_insts[name] = realtime_inst
+        return realtime_inst
+
+    def _shard_of(self, key: tuple) -> _Shard:
+        for shard in self.shards:
+            if key in shard.keys:
+                return shard
+        return None
+
+    def load(self, shard: _Shard) -> float:
+        """ shard의 수신 빈도(건/초) 합 """
+        return sum(self.rates.get(key, 1.) for key in shard.keys)
+
+    def register(self, names, codes) -> list:
+        """
+        names(NAME 또는 list)와 codes의 모든 조합을 등록한다. 이미 등록된 조합은 건너뛴다.
+        :return: 등록에 실패한 (NAME, code) list
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        keys = [(name, code) for name in names for code in codes if self._shard_of((name, code)) is None]
+        loads = {id(shard): self.load(shard) for shard in self.shards}
+        failed = []
+        for key in sorted(keys, key=lambda key: self.rates.get(key, 1.), reverse=True):
+            shard = min(self.shards, key=lambda shard: loads[id(shard)])
+            if self._reg(shard, key):
+                loads[id(shard)] += self.rates.get(key, 1.)
+            else:
+                failed.append(key)
+        if failed:
+            Logger.write_log(f"RealtimeManager : failed to register {len(failed)} realtime(s)", failed[:10])
+        return failed
+
+    def _reg(self, shard: _Shard, key: tuple) -> bool:
+        name, code = key
+        if not self._realtime_inst(shard, name).reg_realtime(code):
+            return False
+        shard.keys.add(key)
+        return True
+
+    def _unreg(self, shard: _Shard, key: tuple) -> bool:
+        name, code = key
+        if not shard.realtime_insts[name].unreg_realtime(code):
+            return False
+        shard.keys.discard(key)
+        shard.counts.pop(key, None)
+        return True
+
+    def unregister(self, names, codes) -> list:
+        """
+        names(NAME 또는 list)와 codes의 모든 조합의 등록을 해지한다.
+        :return: 해지에 실패한 (NAME, code) list
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        failed = []
+        for key in [(name, code) for name in names for code in codes]:
+            shard = self._shard_of(key)
+            if shard is not None and not self._unreg(shard, key):
+                failed.append(key)
+        return failed
+
+    def unregister_all(self) -> bool:
+        """ shard별로 unreg_realtime_all()을 호출하여 모든 등록을 해지한다. """
+        ok = True
+        for shard in self.shards:
+            if not shard.keys:
+                continue
+            if next(iter(shard.realtime_insts.values())).unreg_realtime_all():
+                shard.keys.clear()
+                shard.counts.clear()
+            else:
+                ok = False
+        return ok
+
+    def close(self) -> bool:
+        """ 자동 rebalance를 멈추고 모든 등록을 해지한다. """
+        if self._timer is not None:
+            self._timer.stop()
+        return self.unregister_all()
+
+    def get(self, name: str, code: str):
+        """ (NAME, code)를 수신하는 realtime instance (등록 전이면 None). ex) manager.get('SC', cd).get_output(cd) """
+        shard = self._shard_of((name, code))
+        return None if shard is None else shard.realtime_insts[name]
+
+    def subscribe(self, name: str, callback, **kwargs) -> None:
+        """ NAME의 모든 shard realtime instance에 callback을 구독한다. (kwargs는 BaseRealtime.subscribe() 참고) """
+        self._subscriptions.append((name, callback, kwargs))
+        for shard in self.shards:
+            realtime_inst = shard.realtime_insts.get(name)
+            if realtime_inst is not None:
+                realtime_inst.subscribe(callback, **kwargs)
+
+    def sample_rates(self) -> None:
+        """ 마지막 sample 이후의 수신 건수로 (NAME, code)별 수신 빈도를 갱신한다. (직전 값과 평균) """
+        now = monotonic()
+        elapsed = max(now - self._sampled_at, 1e-3)
+        self._sampled_at = now
+        for shard in self.shards:
+            counts, shard.counts = shard.counts, {}
+            for key in shard.keys:
+                rate = counts.get(key, 0) / elapsed
+                previous = self.rates.get(key)
+                self.rates[key] = rate if previous is None else (previous + rate) / 2
+
+    def rebalance(self, max_moves: int = Config.RT_REBALANCE_MAX_MOVES) -> int:
+        """
+        부하가 max_load를 넘는 shard의 (NAME, code)를 부하가 가장 작은 shard로 옮긴다.
+        :return: 옮긴 (NAME, code) 수
+        """
+        self.sample_rates()
+        loads = {id(shard): self.load(shard) for shard in self.shards}
+        moves = 0
+        while moves < max_moves:
+            hot = max(self.shards, key=lambda shard: loads[id(shard)])
+            if loads[id(hot)] <= self.max_load:
+                break
+            cold = min(self.shards, key=lambda shard: loads[id(shard)])
+            if loads[id(cold)] >= self.max_load and len(self.shards) < self.max_shards:
+                cold = self._add_shard()
+                loads[id(cold)] = 0.
+            # 옮긴 후에도 hot의 부하가 cold보다 크거나 같은 (NAME, code) 중 가장 빈도가 큰 것 (수신이 없는 것은 옮기지 않는다.)
+            gap = loads[id(hot)] - loads[id(cold)]
+            candidates = [key for key in hot.keys if 0 < 2 * self.rates.get(key, 1.) <= gap]
+            if not candidates:
+                break
+            key = max(candidates, key=lambda key: self.rates.get(key, 1.))
+            if not self._reg(cold, key):
+                break
+            if not self._unreg(hot, key):
+                # hot에서 해지하지 못하면 cold의 등록을 되돌린다. (같은 (NAME, code)를 두 shard에서 수신하지 않도록)
+                if not self._unreg(cold, key):
+                    Logger.write_log(f"RealtimeManager : failed to roll back {key} on {cold.indi_instance._owner}")
+                break
+            rate = self.rates.get(key, 1.)
+            loads[id(hot)] -= rate
+            loads[id(cold)] += rate
+            moves += 1
+        self.n_moves += moves
+        return moves
+
+    def stats(self) -> list:
+        """ shard별 등록 수와 수신 빈도(건/초) """
+        return [{'owner': shard.indi_instance._owner, 'registered': len(shard.keys), 'load': self.load(shard)}
+                for shard in self.shards]
@@ -0,0 +1,198 @@
+import os
+import ast
+import mmap
+import time
+import struct
+
+import numpy as np
+
+from . import Config, Logger, Cache, TRRT
+
+
+# 파일 구조 : snap_dir/<name>.<generation>.snap, snap_dir/<name>.current (현재 generation, 10진수 문자열)
+#   header(HEADER_SIZE의 배수) + table 배열들 (ALIGN 단위로 정렬)
+#   0  magic(8s) | 8  version(H) | 10 table 수(H) | 12 header 크기(I) | 16 generation(Q) | 24 생성시각(d)
+#   32 거래일(8s) | 40 index 길이(I) | 44 index : [(table명, dtype descr, offset, 행 수)]의 repr (utf8)
+MAGIC = b'APISHSNP'
+VERSION = 1
+HEADER_SIZE = 4096
+ALIGN = 64
+_HEADER = struct.Struct('<8sHHIQd8sI')
+
+# 기본 snapshot 대상 : master TR NAME -> rq_data() 인자
+MASTER_TRS = {
+    'stock_mst': (),
+    'sfut_mst': (),
+    'opt_mst': ('0', ),     # 구분코드 0 : 전종목
+    'elw_mst': (),
+}
+
+
+def _snap_path(snap_dir: str, name: str, generation: int) -> str:
+    return os.path.join(snap_dir, f'{name}.{generation}.snap')
+
+
+def _current_path(snap_dir: str, name: str) -> str:
+    return os.path.join(snap_dir, f'{name}.current')
+
+
+def current_generation(snap_dir: str = Config.SNAPSHOT_DIR, name: str = 'master') -> int:
+    """ 현재 snapshot의 generation (snapshot이 없으면 0) """
+    try:
+        with open(_current_path(snap_dir, name), 'r') as f:
+            return int(f.read())
+    except FileNotFoundError:
+        return 0
+
+
+def write_snapshot(tables: dict, snap_dir: str = Config.SNAPSHOT_DIR, name: str = 'master') -> int:
+    """
+    table명 -> 배열(multi_output 등)을 새 generation의 snapshot 파일로 쓰고, 현재 generation으로 교체한다.
+    이전 generation의 파일은 지울 수 있을 때 지운다. (바로 전 generation은 남겨둔다.)
+    :return: 새 generation
+    """
+    os.makedirs(snap_dir, exist_ok=True)
+    generation = current_generation(snap_dir, name) + 1
+    index, offset = [], 0
+    for table_name, array in tables.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        index.append((table_name, array.dtype.descr, offset, len(array)))
+        offset += array.nbytes
+    index_bytes = repr(index).encode('utf8')
+    header_len = -(-(_HEADER.size + len(index_bytes)) // HEADER_SIZE) * HEADER_SIZE
+    header = _HEADER.pack(MAGIC, VERSION, len(index), header_len, generation, time.time(),
+                          Cache.trading_date().encode('ascii'), len(index_bytes)) + index_bytes
+
+    filepath = _snap_path(snap_dir, name, generation)
+    with open(filepath + '.tmp', 'wb') as f:
+        f.write(header + b'\x00' * (header_len - len(header)))
+        for (_, _, table_offset, _), array in zip(index, tables.values()):
+            f.seek(header_len + table_offset)
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(header_len + offset)     # 마지막 table이 비어 있어도 offset이 파일 안에 있도록
+    os.replace(filepath + '.tmp', filepath)
+
+    current = _current_path(snap_dir, name)
+    with open(current + '.tmp', 'w') as f:
+        f.write(str(generation))
+    for i in range(10):
+        try:
+            os.replace(current + '.tmp', current)
+            break
+        except PermissionError:     # 다른 프로세스가 current 파일을 읽는 중 (Windows)
+            if i == 9:
+                raise
+            time.sleep(0.01)
+    _remove_old(snap_dir, name, generation)
+    return generation
+
+
+def _remove_old(snap_dir: str, name: str, generation: int) -> None:
+    prefix, suffix = f'{name}.', '.snap'
+    for filename in os.listdir(snap_dir):
+        if not (filename.startswith(prefix) and filename.endswith(suffix)):
+            continue
+        number = filename[len(prefix):-len(suffix)]
+        if number.isdigit() and int(number) < generation - 1:
+            try:
+                os.remove(os.path.join(snap_dir, filename))
+            except OSError:     # 다른 프로세스가 아직 열고 있는 파일 (Windows)
+                pass
+
+
+def build_snapshot(indi_instance, trs: dict = None, snap_dir: str = Config.SNAPSHOT_DIR, name: str = 'master',
+                   refresh: bool = False) -> int:
+    """
+    master TR들을 요청하여 multi_output을 snapshot으로 쓴다. (하루 한 번, 또는 장중 master 갱신 시 refresh=True)
+    :param trs: TR NAME -> rq_data() 인자 (기본값 MASTER_TRS)
+    :param refresh: True이면 response cache를 지우고 서버에서 다시 받는다.
+    :return: 새 generation
+    """
+    trs = MASTER_TRS if trs is None else trs
+    cache = getattr(indi_instance, '_cache', None)
+    tables = {}
+    for tr_name, args in trs.items():
+        if refresh and cache is not None:
+            cache.invalidate(tr_name, disk=True)
+        tr = getattr(TRRT, tr_name)(indi_instance=indi_instance)
+        tr.rq_data(*args)
+        tables[tr_name] = tr.multi_output
+    generation = write_snapshot(tables, snap_dir, name)
+    Logger.write_log(f"Snapshot : {name} generation {generation}", {k: len(v) for k, v in tables.items()})
+    return generation
+
+
+class MasterSnapshot:
+    """
+    write_snapshot()/build_snapshot()으로 쓴 snapshot을 읽기 전용 mmap으로 연다. (복사 없음)
+    ex) snap = api.Snapshot.MasterSnapshot(); snap['stock_mst']['종목명']; snap.row('stock_mst', '005930')
+    - table은 mmap 위의 읽기 전용 np.ndarray이다.
+    - refresh()는 새 generation이 있으면 다시 연다. (장중 hot swap) 이전 table을 참조하고 있으면 그 배열은 계속 유효하다.
+    <parameters>
+    snap_dir(str)   : snapshot 경로
+    name(str)       : snapshot 이름
+    """
+
+    def __init__(self, snap_dir: str = Config.SNAPSHOT_DIR, name: str = 'master'):
+        self.snap_dir = snap_dir
+        self.name = name
+        self.generation = 0
+        self.date: str = None           # snapshot을 쓴 거래일
+        self.created_at: float = None
+        self.tables = {}
+        self._current_mtime = None
+        self._code_index = {}           # (table명, field) -> {code: 행 번호}
+        if not self.refresh():
+            raise FileNotFoundError(f"Snapshot : no snapshot {name!r} in {snap_dir}")
+
+    def __getitem__(self, table_name: str) -> np.ndarray:
+        return self.tables[table_name]
+
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self.tables
+
+    def names(self) -> list:
+        return list(self.tables)
+
+    def refresh(self) -> bool:
+        """ 새 generation이 있으면 다시 연다. :return: 다시 열었으면 True """
+        try:
+            mtime = os.stat(_current_path(self.snap_dir, self.name)).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._current_mtime:
+            return False
+        self._current_mtime = mtime
+        generation = current_generation(self.snap_dir, self.name)
+        if generation == self.generation:
+            return False
+        self._open(_snap_path(self.snap_dir, self.name, generation))
+        return True
+
+    def _open(self, filepath: str) -> None:
+        with open(filepath, 'rb') as f:
+            magic, version, _, header_len, generation, created_at, date, index_len = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Snapshot : {filepath} is not a snapshot file")
+            index = ast.literal_eval(f.read(index_len).decode('utf8'))
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.tables = {table_name: np.frombuffer(buf, dtype=np.dtype(descr), count=count, offset=header_len + offset)
+                       if count else np.empty([0], dtype=np.dtype(descr))
+                       for table_name, descr, offset, count in index}
+        self.generation, self.created_at, self.date = generation, created_at, date.decode('ascii')
+        self._code_index.clear()
+
+    def row(self, table_name: str, code: str, field: str = '단축코드') -> np.void:
+        """ table에서 field(기본값 단축코드)가 code인 행 (없으면 None). 처음 호출할 때 code index를 만든다. """
+        key = (table_name, field)
+        code_index = self._code_index.get(key)
+        if code_index is None:
+            codes = self.tables[table_name][field].tolist()
+            code_index = self._code_index[key] = {code: i for i, code in reversed(list(enumerate(codes)))}
+        i = code_index.get(code)
+        return None if i is None else self.tables[table_name][i]
+
+    def close(self) -> None:
+        """ table 참조를 놓는다. (mmap은 table 배열이 모두 해제되면 닫힌다.) """
+        self.tables = {}
+        self._code_index.clear()
@@ -1,10 +1,12 @@
 import numpy as np
 
-from .BaseTRRT import BaseTR, BaseRealtime
+from .BaseTRRT import BaseTR, BaseChartTR, BaseRealtime
 from .ParameterBooks import InputParameterBook as Ibook
 from .ParameterBooks import OutputParameterBook as Obook
 from . import Logger
 from . import APIErrors
+from . import Scheduler
+from . import Cache
 
 class AccountList(BaseTR):
 	NAME, DESCRIPTION = "AccountList", "계좌목록조회"
@@ -20,6 +22,8 @@ class AccountList(BaseTR):
 
 class stock_mst(BaseTR):
 	NAME, DESCRIPTION = 'stock_mst', '현물종목정보조회(전종목)'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -43,8 +47,10 @@ class stock_mst(BaseTR):
 	])
 
 
-class TR_SCHART(BaseTR):
+class TR_SCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_SCHART', '현물분/일/주/월데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	ADJUST = True	# 수정주가(수정시가 ~ 수정종가), 수정거래량(수정단위거래량) column 추가
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U6'),
 		('그래프종류', 'U1'),  # 그래프종류.분데이터, 그래프종류.일데이터, 그래프종류.주데이터, 그래프종류.월데이터
@@ -84,35 +90,10 @@ class TR_SCHART(BaseTR):
 		self._indi_instance.dynamicCall("SetSingleData(int, QString)", 4, 종료일)
 		self._indi_instance.dynamicCall("SetSingleData(int, QString)", 5, 조회갯수)
 
-	def _get_rcvd_multi_data(self) -> None:
-		'''
-		It is an Overriden Method Due to Adjusted Prices.
-		'''
-		super()._get_rcvd_multi_data()
-		nCnt = self.multi_output.shape[0]
-
-		# 주가수정계수에 의한 수정주가(Adj Price) 계산
-		gaps_idx = np.where(self.multi_output['주가수정계수'] != 1.0)[0]
-		gaps = self.multi_output[gaps_idx]['주가수정계수']
-		for idx, gap in zip(gaps_idx, gaps):
-			for i in range(idx+1, nCnt):
-				for j in ('시가', '고가', '저가', '종가'):
-					self.multi_output[i][j] *= gap
-		del gaps_idx, gaps
-
-		# 거래량수정계수에 의한 수정거래량(Adj Volume) 계산
-		gaps_idx = np.where(self.multi_output['거래량수정계수'] != 1.0)[0]
-		gaps = self.multi_output[gaps_idx]['거래량수정계수']
-		for idx, gap in zip(gaps_idx, gaps):
-			for i in range(idx + 1, nCnt):
-				for j in ('단위거래량', ):
-					self.multi_output[i][j] *= gap
-		del gaps_idx, gaps
-		return
-
 
 class SB(BaseTR):
 	NAME, DESCRIPTION = 'SB', '현물 마스터'
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U6'),  # (F:00) 
 		])
@@ -545,6 +526,7 @@ class SY(BaseTR, BaseRealtime):
 
 class SJ(BaseTR):
 	NAME, DESCRIPTION = 'SJ', '현물 마스터–기타'
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = np.dtype([('단축코드', 'U6')])
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = True, False
@@ -773,8 +755,9 @@ class FH(BaseTR):
 	MULTI_OUTPUT_DTYPE = None
 
 
-class TR_FCHART(BaseTR):
+class TR_FCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_FCHART', '선물 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U5'),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -801,8 +784,9 @@ class TR_FCHART(BaseTR):
 		])
 
 
-class TR_FNCHART(BaseTR):
+class TR_FNCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_FNCHART', '연결선물 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U5'),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -1051,8 +1035,9 @@ class QI(BaseTR, BaseRealtime):
 	MULTI_OUTPUT_DTYPE = None
 
 
-class TR_OCHART(BaseTR):
+class TR_OCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_OCHART', '옵션 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U8'),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -1356,8 +1341,9 @@ class tr_1771_10(BaseTR):
 		])
 
 
-class TR_WCHART(BaseTR):
+class TR_WCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_WCHART', 'ELW 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U6'),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -1654,8 +1640,9 @@ class LL(BaseTR, BaseRealtime):
 	MULTI_OUTPUT_DTYPE = None
 
 
-class TR_EFCHART(BaseTR):
+class TR_EFCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_EFCHART', '주식선물 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U6'),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -1864,8 +1851,9 @@ class MH(BaseTR, BaseRealtime):
 	MULTI_OUTPUT_DTYPE = None
 
 
-class TR_CFCHART(BaseTR):
+class TR_CFCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_CFCHART', '상품선물 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U6'),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -1879,7 +1867,7 @@ class TR_CFCHART(BaseTR):
 	SINGLE_OUTPUT_DTYPE = None
 	MULTI_OUTPUT_DTYPE = np.dtype([
 		('일자', 'U8'),  # (F:00) 
-		('시간', 'U0'),  # (F:01) 
+		('시간', 'U6'),  # (F:01) 
 		('시가', 'U8'),  # (F:02) 
 		('고가', 'U8'),  # (F:03) 
 		('저가', 'U8'),  # (F:04) 
@@ -2002,8 +1990,9 @@ class PH(BaseTR):
 	MULTI_OUTPUT_DTYPE = None
 
 
-class TR_ERCHART(BaseTR):
+class TR_ERCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_ERCHART', 'EUREX 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U9'),  # (F:00) E+옵션코드(ex E201FA235)
 		('그래프종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -2240,6 +2229,8 @@ class VH(BaseTR):
 
 class knx_mst(BaseTR):
 	NAME, DESCRIPTION = 'knx_mst', 'KONEX 종목정보조회'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -2452,6 +2443,8 @@ class TH(BaseTR):
 
 class kotc_mst(BaseTR):
 	NAME, DESCRIPTION = 'kotc_mst', 'K-OTC 종목정보조회'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -2647,8 +2640,9 @@ class TR_5008_5(BaseTR):
 		('전일대비구분', 'U1'),  # (F:04) 
 		])
 
-class TR_CCHART(BaseTR):
+class TR_CCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_CCHART', '신주인수권 차트 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', np.uint32),  # (F:00) 
 		('그래프종류', 'U1'),  # (F:01) T: 틱데이터 		D:일데이터
@@ -2812,8 +2806,9 @@ class XH(BaseTR):
 		])
 	MULTI_OUTPUT_DTYPE = None
 
-class TR_GLCHART(BaseTR):
+class TR_GLCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_GLCHART', '금현물 차트데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('단축코드', np.uint32),  # (F:00) 
 		('그래프 종류', 'U1'),  # (F:01) 
@@ -2838,6 +2833,7 @@ class TR_GLCHART(BaseTR):
 
 class IC(BaseTR, BaseRealtime):
 	NAME, DESCRIPTION = 'IC', '지수 현재가'
+	CODE_FIELD = '업종코드'	# 등록한 지수(업종)코드
 	INPUT_DTYPE = np.dtype([
 		('지수코드', 'U4'),  # (F:00) 업종코드는 부록 코드표 참조
 		])
@@ -2865,6 +2861,7 @@ class IC(BaseTR, BaseRealtime):
 
 class IK(BaseTR, BaseRealtime):
 	NAME, DESCRIPTION = 'IK', 'KOSPI200 실시간 지수'
+	CODE_FIELD = '업종코드'	# 등록한 지수(업종)코드
 	INPUT_DTYPE = np.dtype([
 		('지수코드', 'U4'),  # (F:00) “2101” K200 고정
 		])
@@ -2880,6 +2877,7 @@ class IK(BaseTR, BaseRealtime):
 
 class IT(BaseTR, BaseRealtime):
 	NAME, DESCRIPTION = 'IT', '업종 투자자'
+	CODE_FIELD = '업종코드'	# 등록한 지수(업종)코드
 	INPUT_DTYPE = np.dtype([
 		('업종코드', 'U4'),  # (F:00) 업종투자자코드는 부록 코드표 참조
 		])
@@ -3204,8 +3202,9 @@ class SS(BaseTR, BaseRealtime):
 		])
 	MULTI_OUTPUT_DTYPE = None
 
-class TR_ICHART(BaseTR):
+class TR_ICHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_ICHART', 'KOSPI200 지수 분/일 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('업종구분', 'U4'),  # (F:00) ‘2101’
 		('그래프 종류', 'U1'),  # (F:01) 1:분데이터 		D:일데이터
@@ -3291,6 +3290,8 @@ class TR4_1502_3(BaseTR):
 
 class upjong_mst(BaseTR):
 	NAME, DESCRIPTION = 'upjong_mst', '거래소 업종 마스터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = np.dtype([
 		('단축코드', 'U1'),  # (F:00) 1:KOSPI		2:KOSDAQ 3:KOSPI200      4:KOSDAQ50 5:KRX
 		])
@@ -3304,6 +3305,8 @@ class upjong_mst(BaseTR):
 
 class upjong_code_mst(BaseTR):
 	NAME, DESCRIPTION = 'upjong_code_mst', '업종 종목 리스트'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = np.dtype([
 		('업종코드', 'U4'),  # (F:00) 7.1 업종코드 참고
 		])
@@ -3340,6 +3343,8 @@ class stock_code(BaseTR):
 
 class fut_mst(BaseTR):
 	NAME, DESCRIPTION = 'fut_mst', 'KOSPI 선물 종목 정보 조회'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = np.dtype([
 		('표준코드', 'U12'),  # (F:00) 
 		('단축코드', 'U8'),  # (F:01) 
@@ -3359,6 +3364,8 @@ class fut_mst(BaseTR):
 
 class opt_mst(BaseTR):
 	NAME, DESCRIPTION = 'opt_mst', 'KOSPI 옵션 종목 정보 조회'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = np.dtype([
 		('구분코드', 'U1'),  # (F:00) 0:전종목 		1: 최근월물 2:차근월물		3:차차근월물 4:차차차월물
 		])
@@ -3375,6 +3382,8 @@ class opt_mst(BaseTR):
 
 class elw_mst(BaseTR):
 	NAME, DESCRIPTION = 'elw_mst', 'ELW 종목 정보 조회(전종목)'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -3421,6 +3430,8 @@ class elw_code(BaseTR):
 
 class sfut_mst(BaseTR):
 	NAME, DESCRIPTION = 'sfut_mst', '주식선물 종목 정보 조회(전종목)'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -3476,8 +3487,9 @@ class TR_3100(BaseTR):
 		('뉴스_내용2', 'U'),  # (F:06) 뉴스 내용이 긴 경우 추가분
 		])
 
-class TR_INCHART(BaseTR):
+class TR_INCHART(BaseChartTR):
 	NAME, DESCRIPTION = 'TR_INCHART', '해외지수, 환율 분/일/주/월 데이터'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
 	INPUT_DTYPE = np.dtype([
 		('심벌', 'U6'),  # 해외주요지수,환율 심벌 테이블 참고
 		('그래프종류', 'U1'),  # 1:분데이터 (지수만) D:일데이터  W:주데이터	M:월데이터
@@ -3618,6 +3630,7 @@ class SP(BaseTR, BaseRealtime):
 
 class ID(BaseTR, BaseRealtime):
 	NAME, DESCRIPTION = 'ID', '지수 등락'
+	CODE_FIELD = '업종코드'	# 등록한 지수(업종)코드
 	INPUT_DTYPE = np.dtype([
 		('업종코드', 'U4'),  # (F:00) 업종코드는 부록 코드표 참조
 		])
@@ -3957,6 +3970,8 @@ class TR_1862(BaseTR):
 
 class cfut_mst(BaseTR):
 	NAME, DESCRIPTION = 'cfut_mst', '상품선물 종목 코드 조회 (전종목)'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -3978,6 +3993,8 @@ class cfut_mst(BaseTR):
 
 class erx_mst(BaseTR):
 	NAME, DESCRIPTION = 'erx_mst', '유렉스 종목 코드 조회 (전종목) – 옵션'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -3994,6 +4011,8 @@ class erx_mst(BaseTR):
 
 class fri_mst(BaseTR):
 	NAME, DESCRIPTION = 'fri_mst', '해외지수 코드 조회 (전종목)'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -4524,6 +4543,8 @@ class SE(BaseTR):
 
 class gmf_mst(BaseTR):
 	NAME, DESCRIPTION = 'gmf_mst', '야간달러선물 종목 정보 조회'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -4952,6 +4973,8 @@ class TR_0100_M8(BaseTR):
 
 class erxf_mst(BaseTR):
 	NAME, DESCRIPTION = 'erxf_mst', '유렉스 종목 코드 조회 (전종목) - 선물'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -5141,6 +5164,8 @@ class TR_0100_M6(BaseTR):
 
 class fut_prod_mst(BaseTR):
 	NAME, DESCRIPTION = 'fut_prod_mst', 'KOSPI 선물 품목 정보 조회'
+	RQ_PRIORITY = Scheduler.PRIORITY_BULK
+	CACHE_TTL = Cache.TTL_TRADING_DAY
 	INPUT_DTYPE = None
 	REALTIME_AVAILABLE = False
 	IS_SINGLE_OUTPUT, IS_MULTI_OUTPUT = False, True
@@ -5541,6 +5566,8 @@ class TR_RB002(BaseTR):
 
 class SABA101U1(BaseTR):
 	NAME, DESCRIPTION = 'SABA101U1', '현물/ELW일반주문(매도/매수)'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	REALTIME_AVAILABLE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호',         'U11'),         # 0
@@ -5610,13 +5637,16 @@ class SABA101U1(BaseTR):
 		TR_inst.dynamicCall("SetSingleData(int, QString)", 21, 결과메시지_처리여부)  # 결과 출력 여부
 		return
 
-	def proc_rcvd_data(self):
-		super().proc_rcvd_data()
-		Logger.write_order_history(self.single_output[0])
+	def _read_single_data(self) -> np.ndarray:
+		single_output = super()._read_single_data()
+		Logger.write_order_history(single_output[0])
+		return single_output
 
 
 class SABA102U1(BaseTR):#
 	NAME, DESCRIPTION = 'SABA102U1', '현물/ELW 일반 주문(정정/취소)'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('계좌상품', 'U2'),  # (F:01) 항상 ‘01’
@@ -5687,9 +5717,10 @@ class SABA102U1(BaseTR):#
 		#TR_inst.dynamicCall("SetSingleData(int, QString)", 21, 결과메시지_처리여부)  # 결과 출력 여부
 		return
 
-	def proc_rcvd_data(self):
-		super().proc_rcvd_data()
-		Logger.write_order_history(self.single_output[0])
+	def _read_single_data(self) -> np.ndarray:
+		single_output = super()._read_single_data()
+		Logger.write_order_history(single_output[0])
+		return single_output
 
 
 class SABA110U1(BaseTR):
@@ -5697,6 +5728,8 @@ class SABA110U1(BaseTR):
 		▶▶ setmultidata를 호출하여 주문 정보를 세팅하실 때 반드시 32번 Field 까지 모두 처리를 해주셔야만 정상적인 주문이 가능합니다.
 	"""
 	NAME, DESCRIPTION = 'SABA110U1', '현물 단일계좌 복수종목 주문'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	SINGLE_INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),
 		('비밀번호', 'U4'),
@@ -5879,6 +5912,8 @@ class SABA233Q1(BaseTR):
 
 class SABA251U1(BaseTR):
 	NAME, DESCRIPTION = 'SABA251U1', '현물/ELW 예약주문'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('계좌상품', 'U2'),  # (F:01) 항상 ‘01’
@@ -6223,6 +6258,8 @@ class SABA835Q1(BaseTR):
 
 class SABA871U1(BaseTR):
 	NAME, DESCRIPTION = 'SABA871U1', '금현물 주문'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('계좌상품코드', 'U2'),  # (F:01) 
@@ -6346,6 +6383,8 @@ class SABB446Q1(BaseTR):
 
 class SABC100U1(BaseTR):
 	NAME, DESCRIPTION = 'SABC100U1', '선물/옵션 일반 주문(매도/매수/정정/취소)'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('비밀번호', 'U4'),  # (F:01) 
@@ -6372,6 +6411,8 @@ class SABC100U1(BaseTR):
 
 class SABC101U8(BaseTR):
 	NAME, DESCRIPTION = 'SABC101U8', '롤오버 주문'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('비밀번호', 'U4'),  # (F:01) 
@@ -6457,6 +6498,8 @@ class SABC104Q1(BaseTR):
 
 class SABC105U1(BaseTR):
 	NAME, DESCRIPTION = 'SABC105U1', '유렉스 일반 주문(매도/매수/정정/취소)'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('비밀번호', 'U4'),  # (F:01) 
@@ -6479,6 +6522,8 @@ class SABC105U1(BaseTR):
 
 class SABC160U3(BaseTR):
 	NAME, DESCRIPTION = 'SABC160U3', '야간선옵_통합주문'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('계좌비밀번호', 'U9'),  # (F:01) 
@@ -7196,6 +7241,8 @@ class SCDA601U2(BaseTR):
 class SCDA601U4(BaseTR):
 	'''** 이 TR은 10초이내 재호출이 불가능합니다. ** '''
 	NAME, DESCRIPTION = 'SCDA601U4', 'RP매도'
+	RQ_PRIORITY = Scheduler.PRIORITY_ORDER
+	COALESCE = False
 	INPUT_DTYPE = np.dtype([
 		('계좌번호', 'U11'),  # (F:00) 
 		('비밀번호', 'U33'),  # (F:01) 
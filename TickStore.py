@@ -0,0 +1,342 @@
+import numpy as np
+
+
+RCV_TIME_FIELD = '수신시각'     # tick 수신 시각 (time.time(), 초)
+
+
+def with_rcv_time(dtype: np.dtype) -> np.dtype:
+    """ dtype에 수신시각(float64) field를 추가한 dtype """
+    return np.dtype(dtype.descr + [(RCV_TIME_FIELD, np.float64)])
+
+
+class TickRing:
+    """
+    최근 size개 tick을 보관하는 ring buffer.
+    buffer는 생성 시 한 번만 할당하며, append()는 새 배열을 할당하지 않는다.
+    tick마다 0부터 증가하는 sequence를 부여하며, since(seq)로 놓친 tick을 이어서 읽을 수 있다.
+    <parameters>
+    dtype(np.dtype) : tick의 dtype (ex. SC의 single_output dtype). 수신시각 field가 추가된다.
+    size(int)       : 보관할 최대 tick 수
+    """
+
+    def __init__(self, dtype: np.dtype, size: int):
+        if size <= 0:
+            raise ValueError(f"TickRing : size must be positive, got {size}")
+        self.dtype = with_rcv_time(dtype)
+        self.size = size
+        self.seq = 0    # 다음 tick의 sequence (= 지금까지 append된 tick 수)
+        self._buf = np.empty([size], dtype=self.dtype)
+        self._rows = self._buf[list(dtype.names)]       # 원 dtype field들의 view
+        self._rcv_times = self._buf[RCV_TIME_FIELD]
+
+    def __len__(self) -> int:
+        return min(self.seq, self.size)
+
+    @property
+    def first_seq(self) -> int:
+        """ 보관 중인 가장 오래된 tick의 sequence """
+        return max(0, self.seq - self.size)
+
+    def append(self, row, rcv_time: float) -> int:
+        """
+        :param row: tick (원 dtype의 record 또는 tuple)
+        :return: 추가된 tick의 sequence
+        """
+        i = self.seq % self.size
+        self._rows[i] = row
+        self._rcv_times[i] = rcv_time
+        self.seq += 1
+        return self.seq - 1
+
+    def latest(self) -> np.void:
+        """ 마지막 tick (수신 전이면 None) """
+        return self._buf[(self.seq - 1) % self.size] if self.seq else None
+
+    def _slice(self, start_seq: int) -> np.ndarray:
+        """ start_seq ~ 마지막 tick (시간순). 구간이 buffer 끝에서 이어지면 복사본, 아니면 view """
+        n = self.seq - start_seq
+        if n <= 0:
+            return self._buf[:0]
+        start, end = start_seq % self.size, self.seq % self.size
+        if start < end or end == 0:
+            return self._buf[start:start + n]
+        return np.concatenate((self._buf[start:], self._buf[:end]))
+
+    def last(self, k: int) -> np.ndarray:
+        """
+        최근 k개 tick (시간순).
+        가능하면 buffer의 view를 반환하므로, 보관하려면 copy()하여야 한다. (이후 append로 덮어써질 수 있다.)
+        """
+        return self._slice(max(self.first_seq, self.seq - k))
+
+    def since(self, seq: int) -> tuple:
+        """
+        sequence가 seq 이상인 tick (이미 덮어써진 tick은 제외).
+        :return: (ticks, next_seq) - 다음 호출에는 next_seq를 넘긴다.
+        """
+        return self._slice(max(self.first_seq, seq)), self.seq
+
+
+class TickArena:
+    """
+    여러 종목의 tick을 하나의 struct-of-arrays로 보관한다. (ex. 전종목 SC)
+    - field별 numpy column (용량이 차면 2배로 늘린다)
+    - 종목index column : tick의 종목 index (self.codes[종목index] == code)
+    - 종목별 최신 tick의 행 index (latest_rows)
+    - checkpoint_rows행마다 그 시점의 latest_rows (과거 시점 조회 asof()에 사용)
+    column을 이용하여 Python loop 없이 횡단면(cross-sectional) 조회를 할 수 있다.
+    수신시각은 append 순서대로 증가한다고 가정한다.
+    <parameters>
+    dtype(np.dtype)     : tick의 dtype (ex. SC의 single_output dtype). 수신시각 field가 추가된다.
+    code_field(str)     : code field명 (append 시 code를 주지 않으면 tick에서 읽는다.) dtype에 없으면 ValueError
+    capacity(int)       : 초기 용량(행 수)
+    checkpoint_rows(int): latest_rows를 저장하는 간격(행 수). asof()는 checkpoint 이후 최대 이만큼의 행만 읽는다.
+    """
+
+    def __init__(self, dtype: np.dtype, code_field: str = '단축코드', capacity: int = 1 << 16,
+                 checkpoint_rows: int = 1 << 14):
+        if code_field not in dtype.names:
+            raise ValueError(f"TickArena : no code field {code_field!r} in dtype {dtype.names}")
+        self.dtype = with_rcv_time(dtype)
+        self.code_field = code_field
+        self.n = 0
+        self.codes = []             # 종목index -> code
+        self._code_index = {}       # code -> 종목index
+        self._columns = {name: np.empty([capacity], dtype=self.dtype[name]) for name in self.dtype.names}
+        self._code_idx = np.empty([capacity], dtype=np.int32)
+        self._latest_rows = np.empty([64], dtype=np.int64)
+        self._row_names = dtype.names
+        self.checkpoint_rows = checkpoint_rows
+        self._checkpoints = []      # j -> (j + 1) * checkpoint_rows 행 이전의 종목index별 최신 행 index
+
+    @classmethod
+    def for_realtime(cls, realtime, capacity: int = 1 << 16) -> 'TickArena':
+        """
+        realtime class(ex. api.SC) 또는 instance의 single_output dtype, CODE_FIELD로 생성한다.
+        (fields를 지정한 instance는 해당 field만 갖는 dtype) CODE_FIELD가 없는 realtime(AA 등)은 ValueError
+        """
+        plan = getattr(realtime, '_single_plan', None)
+        if plan is None:
+            plan = realtime.get_single_decoder()
+        return cls(plan.dtype, realtime.CODE_FIELD, capacity)
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def capacity(self) -> int:
+        return len(self._code_idx)
+
+    def _grow(self) -> None:
+        capacity = self.capacity * 2
+        for name, column in self._columns.items():
+            self._columns[name] = np.empty([capacity], dtype=column.dtype)
+            self._columns[name][:self.n] = column[:self.n]
+        code_idx = self._code_idx
+        self._code_idx = np.empty([capacity], dtype=np.int32)
+        self._code_idx[:self.n] = code_idx[:self.n]
+
+    def code_index(self, code: str) -> int:
+        """ code의 종목index. 처음 보는 code이면 새로 부여한다. """
+        ci = self._code_index.get(code)
+        if ci is None:
+            ci = self._code_index[code] = len(self.codes)
+            self.codes.append(code)
+            if ci == len(self._latest_rows):
+                latest_rows = self._latest_rows
+                self._latest_rows = np.empty([ci * 2], dtype=np.int64)
+                self._latest_rows[:ci] = latest_rows
+        return ci
+
+    def append(self, row, rcv_time: float, code: str = None) -> int:
+        """
+        :param row: tick (원 dtype의 record)
+        :return: 추가된 행 index
+        """
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        columns = self._columns
+        for name in self._row_names:
+            columns[name][i] = row[name]
+        columns[RCV_TIME_FIELD][i] = rcv_time
+        ci = self.code_index(row[self.code_field] if code is None else code)
+        self._code_idx[i] = ci
+        self._latest_rows[ci] = i
+        self.n = i + 1
+        if self.n % self.checkpoint_rows == 0:
+            self._checkpoints.append(self.latest_rows.copy())
+        return i
+
+    def column(self, name: str) -> np.ndarray:
+        """ field의 전체 column (view. 용량이 늘어나면 이후 tick은 반영되지 않는다.) """
+        return self._columns[name][:self.n]
+
+    @property
+    def code_idx(self) -> np.ndarray:
+        """ 행별 종목index column (view) """
+        return self._code_idx[:self.n]
+
+    @property
+    def latest_rows(self) -> np.ndarray:
+        """ 종목index별 최신 tick의 행 index """
+        return self._latest_rows[:len(self.codes)]
+
+    def latest(self, name: str) -> np.ndarray:
+        """ 종목index별 최신 tick의 field 값 """
+        return self._columns[name][self.latest_rows]
+
+    def asof_rows(self, t: float) -> np.ndarray:
+        """
+        종목index별로 수신시각 t 이하인 마지막 tick의 행 index (없으면 -1)
+        t가 마지막 tick 이후이면 latest_rows, 아니면 t 이전의 마지막 checkpoint에 이후 행(checkpoint_rows 미만)을 반영한다.
+        """
+        k = int(np.searchsorted(self._columns[RCV_TIME_FIELD][:self.n], t, side='right'))
+        if k == self.n:
+            return self.latest_rows.copy()
+        rows = np.full([len(self.codes)], -1, dtype=np.int64)
+        c = k // self.checkpoint_rows
+        if c:
+            checkpoint = self._checkpoints[c - 1]
+            rows[:len(checkpoint)] = checkpoint
+        start = c * self.checkpoint_rows
+        if k > start:
+            np.maximum.at(rows, self._code_idx[start:k], np.arange(start, k))
+        return rows
+
+    def asof(self, name: str, t: float) -> np.ndarray:
+        """ 종목index별로 수신시각 t 시점의 field 값 (t 이전 tick이 없으면 nan) """
+        rows = self.asof_rows(t)
+        values = self._columns[name][rows].astype(np.float64)
+        values[rows < 0] = np.nan
+        return values
+
+    def movers(self, name: str, window: float, threshold: float, now: float = None) -> tuple:
+        """
+        window(초) 전 대비 field 값의 변화율 절대값이 threshold 이상인 종목.
+        ex) arena.movers('현재가', 60, 0.02) : 최근 1분간 현재가가 2% 이상 움직인 종목
+        :return: (codes, 변화율) - 변화율 절대값 내림차순
+        """
+        if not self.codes:
+            return np.array([], dtype=str), np.array([], dtype=np.float64)
+        now = self._columns[RCV_TIME_FIELD][self.n - 1] if now is None else now
+        base = self.asof(name, now - window)
+        current = self.asof(name, now)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = current / base - 1.
+        selected = np.nonzero(np.isfinite(change) & (np.abs(change) >= threshold))[0]
+        selected = selected[np.argsort(-np.abs(change[selected]), kind='stable')]
+        return np.array(self.codes)[selected], change[selected]
+
+
+class Conflator:
+    """
+    code별 최신 tick 1개만 보관한다. (slot = 종목index)
+    tick이 갱신되면 reader별 dirty bitmap에 표시하며, 각 reader는 drain()으로
+    마지막으로 읽은 이후 갱신된 code의 최신 tick만 받는다. (느린 소비자, 대시보드 등)
+    <parameters>
+    dtype(np.dtype)     : tick의 dtype (ex. SC의 single_output dtype). 수신시각 field가 추가된다.
+    code_field(str)     : code field명 (update 시 code를 주지 않으면 tick에서 읽는다.) dtype에 없으면 ValueError
+    capacity(int)       : 초기 slot 수 (code 수가 넘으면 2배로 늘린다)
+    """
+
+    def __init__(self, dtype: np.dtype, code_field: str = '단축코드', capacity: int = 4096):
+        if code_field not in dtype.names:
+            raise ValueError(f"Conflator : no code field {code_field!r} in dtype {dtype.names}")
+        self.dtype = with_rcv_time(dtype)
+        self.code_field = code_field
+        self.codes = []             # 종목index -> code
+        self._code_index = {}       # code -> 종목index
+        self._row_names = list(dtype.names)
+        self._readers = []
+        self._allocate(capacity)
+
+    @classmethod
+    def for_realtime(cls, realtime, capacity: int = 4096) -> 'Conflator':
+        """
+        realtime class(ex. api.SC) 또는 instance의 single_output dtype, CODE_FIELD로 생성한다.
+        CODE_FIELD가 없는 realtime(AA 등)은 ValueError
+        """
+        plan = getattr(realtime, '_single_plan', None)
+        if plan is None:
+            plan = realtime.get_single_decoder()
+        return cls(plan.dtype, realtime.CODE_FIELD, capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        self.slots = np.empty([capacity], dtype=self.dtype)
+        self._rows = self.slots[self._row_names]
+        self._rcv_times = self.slots[RCV_TIME_FIELD]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _add_code(self, code: str) -> int:
+        ci = self._code_index[code] = len(self.codes)
+        self.codes.append(code)
+        if ci == len(self.slots):
+            slots = self.slots
+            self._allocate(ci * 2)
+            self.slots[:ci] = slots
+            for reader in self._readers:
+                reader._grow(ci * 2)
+        return ci
+
+    def update(self, row, rcv_time: float, code: str = None) -> int:
+        """
+        code의 slot을 tick으로 갱신하고 모든 reader의 dirty bitmap에 표시한다.
+        :return: 종목index
+        """
+        code = row[self.code_field] if code is None else code
+        ci = self._code_index.get(code)
+        if ci is None:
+            ci = self._add_code(code)
+        self._rows[ci] = row
+        self._rcv_times[ci] = rcv_time
+        for reader in self._readers:
+            reader._dirty[ci] = True
+        return ci
+
+    def latest(self) -> np.ndarray:
+        """ 전체 code의 최신 tick (종목index 순, view) """
+        return self.slots[:len(self.codes)]
+
+    def reader(self) -> 'ConflatedReader':
+        """ 새 reader. 첫 drain()은 이미 수신된 모든 code를 반환한다. """
+        reader = ConflatedReader(self)
+        self._readers.append(reader)
+        return reader
+
+
+class ConflatedReader:
+    """ Conflator의 reader별 dirty bitmap (Conflator.reader()로 생성) """
+
+    def __init__(self, conflator: Conflator):
+        self._conflator = conflator
+        self._dirty = np.zeros([len(conflator.slots)], dtype=bool)
+        self._dirty[:len(conflator.codes)] = True
+
+    def _grow(self, capacity: int) -> None:
+        dirty = self._dirty
+        self._dirty = np.zeros([capacity], dtype=bool)
+        self._dirty[:len(dirty)] = dirty
+
+    @property
+    def n_dirty(self) -> int:
+        return int(np.count_nonzero(self._dirty))
+
+    def drain(self) -> tuple:
+        """
+        마지막 drain() 이후 갱신된 code와 그 최신 tick.
+        dirty 표시를 먼저 지운 후 복사하므로, drain 도중 갱신된 tick은 다음 drain()에 다시 포함된다.
+        :return: (codes, ticks) - ticks는 복사본
+        """
+        conflator = self._conflator
+        idx = np.flatnonzero(self._dirty[:len(conflator.codes)])
+        self._dirty[idx] = False
+        codes = [conflator.codes[i] for i in idx]
+        return codes, conflator.slots[idx]
+
+    def close(self) -> None:
+        """ reader를 해지한다. """
+        if self in self._conflator._readers:
+            self._conflator._readers.remove(self)
@@ -1,5 +1,18 @@
 
-from .Core import *
+try:
+    from .Core import *
+    from . import Shard
+except ImportError as e:
+    # PyQt5/pythoncom이 없는 환경(Linux 등) : Replay, Recorder 등 COM을 쓰지 않는 기능만 사용할 수 있다.
+    if not str(e.name).startswith(('PyQt5', 'pythoncom')):
+        raise
 from .TRRT import *
 from .ParameterBooks import InputParameterBook as IBook
 from .ParameterBooks import OutputParameterBook as OBook
+from . import Bars
+from . import OrderBook
+from . import Recorder
+from . import Replay
+from . import Export
+from . import History
+from . import Snapshot
@@ -0,0 +1,116 @@
+"""
+TR/실시간 class별 output decode 시간 비교 (가짜 indi control)
+- 이전 방식 : cell마다 dynamicCall 값을 structured array 원소에 대입한다. (numpy의 암묵적 변환)
+- DecoderPlan : read_single_row() / read_multi_columns()
+유효한 값(숫자 field는 '12', 문자열 field는 'X')으로 두 방식의 시간을 재고,
+빈 값과 음수가 섞인 값으로 이전 방식이 실패하는 class 수를 센다.
+실행 : python tests/bench_decode.py [-v]  (-v이면 class별 결과를 출력한다.)
+"""
+import sys
+import time
+
+import numpy as np
+
+import fakeqt
+
+fakeqt.install()
+api = fakeqt.import_package()
+BaseTRRT = api.BaseTRRT
+
+N_ROWS = 200
+N_REPEAT = 5
+
+
+def old_single(control, dtype: np.dtype) -> np.ndarray:
+    output = np.empty([1], dtype=dtype)
+    for j in range(len(dtype)):
+        output[0][j] = control.dynamicCall("GetSingleData(int)", j)
+    return output
+
+
+def old_multi(control, dtype: np.dtype) -> np.ndarray:
+    n = control.dynamicCall("GetMultiRowCount()")
+    output = np.empty([n], dtype=dtype)
+    for i in range(n):
+        for j in range(len(dtype)):
+            output[i][j] = control.dynamicCall("GetMultiData(int, int)", i, j)
+    return output[::-1]
+
+
+def new_single(control, plan) -> np.ndarray:
+    output = np.empty([1], dtype=plan.dtype)
+    output[0] = BaseTRRT.read_single_row(control, plan)
+    return output
+
+
+def new_multi(control, plan) -> np.ndarray:
+    return BaseTRRT.read_multi_columns(control, plan)
+
+
+def valid_row(dtype: np.dtype) -> list:
+    return ['12' if dtype[j].kind in 'iuf' else 'X' for j in range(len(dtype))]
+
+
+def mixed_rows(dtype: np.dtype, n_rows: int) -> list:
+    """ 빈 값과 음수가 섞인 행 """
+    return [[('' if (i + j) % 7 == 0 else '-12') if dtype[j].kind in 'iuf' else 'X' for j in range(len(dtype))]
+            for i in range(n_rows)]
+
+
+def timeit(fn, *args) -> float:
+    best = float('inf')
+    for _ in range(N_REPEAT):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def outputs():
+    """ (class명, 'single'/'multi', dtype, DecoderPlan) """
+    for name, cls in sorted(vars(api.TRRT).items()):
+        if not (isinstance(cls, type) and issubclass(cls, BaseTRRT.Base)) or cls.__module__ != api.TRRT.__name__:
+            continue
+        if cls.IS_SINGLE_OUTPUT and cls.SINGLE_OUTPUT_DTYPE is not None:
+            yield name, 'single', cls.SINGLE_OUTPUT_DTYPE, cls.get_single_decoder()
+        if cls.IS_MULTI_OUTPUT and cls.MULTI_OUTPUT_DTYPE is not None:
+            yield name, 'multi', cls.MULTI_OUTPUT_DTYPE, cls.get_multi_decoder()
+
+
+def main(verbose: bool) -> None:
+    control = fakeqt.FakeControl()
+    totals = {'single': [0, 0., 0., 0], 'multi': [0, 0., 0., 0]}     # 수, 이전(초), DecoderPlan(초), 이전 방식 실패 수
+    if verbose:
+        print(f"{'class':<14} {'output':<6} {'fields':>6} | {'old(ms)':>8} | {'plan(ms)':>8} | speedup | old w/ blanks")
+    for name, kind, dtype, plan in outputs():
+        n_rows = 1 if kind == 'single' else N_ROWS
+        control.single = valid_row(dtype)
+        control.multi = [valid_row(dtype) for _ in range(n_rows)]
+        old_fn, new_fn = (old_single, new_single) if kind == 'single' else (old_multi, new_multi)
+        old_t, new_t = timeit(old_fn, control, dtype), timeit(new_fn, control, plan)
+
+        control.multi = mixed_rows(dtype, n_rows)
+        control.single = control.multi[0]
+        try:
+            old_fn(control, dtype)
+            old_ok = True
+        except (ValueError, OverflowError):
+            old_ok = False
+        new_fn(control, plan)
+
+        total = totals[kind]
+        total[0] += 1
+        total[1] += old_t
+        total[2] += new_t
+        total[3] += not old_ok
+        if verbose:
+            print(f"{name:<14} {kind:<6} {len(dtype):>6} | {old_t * 1000:>8.3f} | {new_t * 1000:>8.3f} | "
+                  f"{old_t / new_t:>6.1f}x | {'ok' if old_ok else 'FAIL'}")
+    print(f"{'output':<10} | {'classes':>7} | {'old(ms)':>8} | {'plan(ms)':>8} | speedup | old fails w/ blanks")
+    for kind, (n, old_t, new_t, n_fail) in totals.items():
+        rows = 1 if kind == 'single' else N_ROWS
+        print(f"{kind + f'({rows})':<10} | {n:>7} | {old_t * 1000:>8.1f} | {new_t * 1000:>8.1f} | {old_t / new_t:>6.1f}x | {n_fail}")
+
+
+if __name__ == '__main__':
+    main('-v' in sys.argv[1:])
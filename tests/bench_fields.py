@@ -0,0 +1,52 @@
+"""
+실시간 fields= 지정 시 tick당 GetSingleData 호출 수와 처리 속도 비교 (가짜 indi control)
+SH/SC를 전체 field로 등록한 경우와 fields=로 일부만 등록한 경우, 같은 tick을 N_TICKS번 수신하여
+FakeControl.n_calls(tick 처리 중 COM 호출은 GetSingleData뿐이다)와 초당 tick 수를 잰다.
+실행 : python tests/bench_fields.py
+"""
+import time
+
+import fakeqt
+
+fakeqt.install()
+api = fakeqt.import_package()
+
+N_TICKS = 20000
+CASES = (
+    ('SH', None),
+    ('SH', ['매도1호가', '매수1호가', '매도1호가수량', '매수1호가수량']),
+    ('SC', None),
+    ('SC', ['체결시간', '현재가', '누적거래량']),
+)
+
+
+def tick_row(realtime_cls) -> list:
+    dtype = realtime_cls.SINGLE_OUTPUT_DTYPE
+    return ['005930' if name == realtime_cls.CODE_FIELD else '12' if dtype[name].kind in 'iuf' else 'X'
+            for name in dtype.names]
+
+
+def measure(n: int, name: str, fields: list) -> tuple:
+    realtime_cls = getattr(api, name)
+    control = api.new_indi(f'bench_fields_{n}', is_realtime=True)
+    realtime_inst = realtime_cls(control, fields=fields)
+    realtime_inst.reg_realtime('005930')
+    control.single = tick_row(realtime_cls)
+    n_calls, started = control.n_calls, time.perf_counter()
+    for _ in range(N_TICKS):
+        control.ReceiveRTData.emit(name)
+    elapsed = time.perf_counter() - started
+    return (control.n_calls - n_calls) / N_TICKS, N_TICKS / elapsed, len(realtime_inst.single_output.dtype)
+
+
+def main() -> None:
+    print(f"{N_TICKS} ticks per case")
+    print(f"{'NAME':<4} | {'fields':<30} | {'stored':>6} | {'calls/tick':>10} | {'ticks/sec':>10}")
+    for n, (name, fields) in enumerate(CASES):
+        calls, rate, n_stored = measure(n, name, fields)
+        label = 'all' if fields is None else ','.join(fields)
+        print(f"{name:<4} | {label:<30} | {n_stored:>6} | {calls:>10.0f} | {rate:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
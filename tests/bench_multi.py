@@ -0,0 +1,80 @@
+"""
+TR_SCHART 멀티데이터 decode 속도 비교 (가짜 indi control, 9999행 x 11 field)
+- 이전 방식 : 행마다, field마다 GetMultiData 값을 structured array 원소에 대입한 후 역순으로 뒤집는다.
+- column 방식 : read_multi_columns(). column별로 값을 모아 DecoderPlan으로 한 번에 변환한다.
+rq_data()의 응답 처리 전체(ReceiveData ~ multi_output)도 같은 응답으로 잰다.
+실행 : python tests/bench_multi.py
+"""
+import time
+
+import numpy as np
+
+import fakeqt
+
+fakeqt.install()
+api = fakeqt.import_package()
+BaseTRRT = api.BaseTRRT
+
+N_ROWS = 9999
+N_REPEAT = 3
+
+
+def chart_rows(n_rows: int) -> list:
+    """ 최신 행부터 (서버 응답 순서) """
+    rows = []
+    for i in range(n_rows - 1, -1, -1):
+        day, minute = divmod(i, 390)
+        hhmm = 900 + minute // 60 * 100 + minute % 60
+        price = 70000 + i % 500
+        rows.append([f'2024{1 + day // 28:02d}{1 + day % 28:02d}', f'{hhmm:04d}00', str(price), str(price + 100),
+                     str(price - 100), str(price + 50), '1.0', '1.0', '', str(i % 1000), str(i % 1000 * price)])
+    return rows
+
+
+def old_multi(control, dtype: np.dtype) -> np.ndarray:
+    n = control.dynamicCall("GetMultiRowCount()")
+    output = np.empty([n], dtype=dtype)
+    for i in range(n):
+        for j in range(len(dtype)):
+            output[i][j] = control.dynamicCall("GetMultiData(int, int)", i, j)
+    return output[::-1]
+
+
+def column_multi(control, plan) -> np.ndarray:
+    return BaseTRRT.read_multi_columns(control, plan)
+
+
+def best_of(fn, *args) -> tuple:
+    best, result = float('inf'), None
+    for _ in range(N_REPEAT):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    rows = chart_rows(N_ROWS)
+    control = fakeqt.FakeControl()
+    control.multi = rows
+    dtype, plan = api.TR_SCHART.MULTI_OUTPUT_DTYPE, api.TR_SCHART.get_multi_decoder()
+    old_t, old = best_of(old_multi, control, dtype)
+    new_t, new = best_of(column_multi, control, plan)
+    assert np.array_equal(old, new), "column decode differs from per-cell decode"
+
+    indi = api.new_indi('bench')
+    indi._scheduler, indi._cache = None, None
+    indi.responder = lambda query, inputs: ([], rows)
+    tr = api.TR_SCHART(indi)
+    rq_t, _ = best_of(tr.rq_data, '005930')
+    assert len(tr.multi_output) == N_ROWS
+
+    print(f"TR_SCHART {N_ROWS} rows x {len(dtype)} fields (best of {N_REPEAT})")
+    print(f"{'method':<20} | {'ms':>8} | {'rows/sec':>10}")
+    for name, elapsed in (('per-cell setitem', old_t), ('column decode', new_t), ('rq_data (column)', rq_t)):
+        print(f"{name:<20} | {elapsed * 1000:>8.1f} | {N_ROWS / elapsed:>10,.0f}")
+    print(f"speedup (decode) : {old_t / new_t:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
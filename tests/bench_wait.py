@@ -0,0 +1,59 @@
+"""
+TR 응답 대기의 CPU 시간 비교 (가짜 indi control)
+- busy-spin : 이전 방식. 응답이 올 때까지 pythoncom.PumpWaitingMessages()를 반복 호출한다.
+- event loop : rq_data(). TRFuture.result()가 local QEventLoop에서 block하며 대기한다.
+가짜 QEventLoop는 다음 event 시각까지 sleep하므로, 실제 Qt event loop처럼 대기 중 CPU를 쓰지 않는다.
+실행 : python tests/bench_wait.py
+"""
+import time
+
+import fakeqt
+
+fakeqt.install()
+api = fakeqt.import_package()
+
+N_REQUESTS = 20
+DELAYS = (0.005, 0.02, 0.05)    # 서버 응답 지연(초)
+
+
+def respond(query: str, inputs: dict) -> tuple:
+    return [], [['20240102', '090000', '100', '110', '90', '105', '1.0', '1.0', '', '10', '1000']]
+
+
+def busy_spin(tr) -> None:
+    import pythoncom
+    future = tr.rq_data_async('005930')
+    started = time.monotonic()
+    while not future.done():
+        pythoncom.PumpWaitingMessages()
+        if time.monotonic() - started > tr.implicit_wait:
+            raise api.APIErrors.TimeOutError("Time Out!!!")
+
+
+def event_loop(tr) -> None:
+    tr.rq_data('005930')
+
+
+def measure(fn, tr) -> tuple:
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(N_REQUESTS):
+        fn(tr)
+    return time.process_time() - cpu, time.perf_counter() - wall
+
+
+def main() -> None:
+    indi = api.new_indi('bench')
+    indi._scheduler = None      # 요청 한도에 의한 대기를 제외한다.
+    indi.responder = respond
+    tr = api.TR_SCHART(indi)
+    print(f"{N_REQUESTS} requests per case")
+    print(f"{'delay(ms)':>9} | {'method':<10} | {'CPU(ms)':>8} | {'wall(ms)':>8} | CPU/wall")
+    for delay in DELAYS:
+        indi.delay = delay
+        for name, fn in (('busy-spin', busy_spin), ('event loop', event_loop)):
+            cpu, wall = measure(fn, tr)
+            print(f"{delay * 1000:>9.0f} | {name:<10} | {cpu * 1000:>8.1f} | {wall * 1000:>8.1f} | {cpu / wall:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import pytest
+
+import fakeqt
+
+fakeqt.install()
+api = fakeqt.import_package()
+
+
+@pytest.fixture
+def indi():
+    """ 가짜 control을 쓰는 indi instance (scheduler 없음, 응답 지연 0) """
+    indi_instance = api.new_indi('test')
+    indi_instance._scheduler = None
+    indi_instance._cache = None
+    return indi_instance
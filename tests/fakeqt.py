@@ -0,0 +1,213 @@
+"""
+테스트/벤치마크용 가짜 PyQt5, pythoncom, indi control.
+install()은 실제 PyQt5 대신 이 module의 QEventLoop/QTimer/QAxWidget을 sys.modules에 등록한다.
+event는 단일 thread의 timer queue(call_later)로 처리하며, QEventLoop.exec_()는 다음 event 시각까지 sleep한다.
+"""
+import os
+import sys
+import time
+import heapq
+import types
+import itertools
+import importlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_queue = []
+_seq = itertools.count()
+
+
+def call_later(delay: float, fn) -> None:
+    heapq.heappush(_queue, (time.monotonic() + delay, next(_seq), fn))
+
+
+def process_one(block: bool = True) -> bool:
+    """ 다음 event 하나를 처리한다. block=False이면 시각이 된 event만 처리한다. """
+    if not _queue:
+        return False
+    due = _queue[0][0]
+    now = time.monotonic()
+    if due > now:
+        if not block:
+            return False
+        time.sleep(due - now)
+    _, _, fn = heapq.heappop(_queue)
+    fn()
+    return True
+
+
+class Signal:
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, fn) -> None:
+        self._slots.append(fn)
+
+    def disconnect(self, fn=None) -> None:
+        self._slots.clear()
+
+    def emit(self, *args) -> None:
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class QEventLoop:
+    def __init__(self):
+        self._quit = False
+
+    def quit(self) -> None:
+        self._quit = True
+
+    def exec_(self) -> int:
+        self._quit = False
+        while not self._quit:
+            if not process_one():
+                raise RuntimeError("fakeqt : event loop has no pending event")
+        return 0
+
+    exec = exec_
+
+
+class QTimer:
+    def __init__(self, *args):
+        self.timeout = Signal()
+        self._single = False
+        self._active = False
+        self._gen = 0
+        self._interval = 0
+
+    def setSingleShot(self, single: bool) -> None:
+        self._single = single
+
+    def setInterval(self, ms: int) -> None:
+        self._interval = ms
+
+    def isActive(self) -> bool:
+        return self._active
+
+    def start(self, ms: int = None) -> None:
+        if ms is not None:
+            self._interval = ms
+        self._gen += 1
+        gen = self._gen
+        self._active = True
+
+        def fire():
+            if self._active and gen == self._gen:
+                if self._single:
+                    self._active = False
+                else:
+                    call_later(self._interval / 1000, fire)
+                self.timeout.emit()
+        call_later(self._interval / 1000, fire)
+
+    def stop(self) -> None:
+        self._active = False
+        self._gen += 1
+
+    @staticmethod
+    def singleShot(ms: int, fn) -> None:
+        call_later(ms / 1000, fn)
+
+
+class QApplication:
+    _instance = None
+
+    def __init__(self, argv):
+        QApplication._instance = self
+
+    @staticmethod
+    def instance():
+        return QApplication._instance
+
+    @staticmethod
+    def processEvents() -> None:
+        while process_one(block=False):
+            pass
+
+
+class FakeControl:
+    """
+    가짜 indi control (QAxWidget).
+    RequestData()는 delay초 후 responder(query, 입력값 dict)의 (single, multi)를 응답으로 ReceiveData를 발생시킨다.
+    multi는 행 list(행마다 field 값 list)이며, GetMultiData(i, j)는 multi[i][j]를 반환한다.
+    """
+
+    def __init__(self, progid: str = None):
+        self.ReceiveData = Signal()
+        self.ReceiveSysMsg = Signal()
+        self.ReceiveRTData = Signal()
+        self.delay = 0.
+        self.responder = None
+        self.query = None
+        self.single, self.multi = [], []
+        self.rt_regs = []
+        self.n_calls = 0
+        self._n_rq = 0
+        self._single_in = {}
+
+    def GetCommState(self) -> int:
+        return 0
+
+    def StartIndi(self, *args) -> bool:
+        return True
+
+    def UnRequestRTRegAll(self) -> bool:
+        self.rt_regs.clear()
+        return True
+
+    def dynamicCall(self, signature: str, *args):
+        self.n_calls += 1
+        if signature.startswith("SetQueryName"):
+            self.query, self._single_in = args[0], {}
+            return True
+        if signature.startswith("SetSingleData"):
+            self._single_in[args[0]] = args[1]
+            return True
+        if signature.startswith("RequestData"):
+            self._n_rq += 1
+            rqid = self._n_rq
+            query, inputs = self.query, dict(self._single_in)
+
+            def receive():
+                if self.responder is not None:
+                    self.single, self.multi = self.responder(query, inputs)
+                self.ReceiveData.emit(rqid)
+            call_later(self.delay, receive)
+            return rqid
+        if signature.startswith("GetSingleData"):
+            return self.single[args[0]]
+        if signature.startswith("GetMultiRowCount"):
+            return len(self.multi)
+        if signature.startswith("GetMultiData"):
+            return self.multi[args[0]][args[1]]
+        if signature.startswith("RequestRTReg"):
+            self.rt_regs.append(args)
+            return True
+        if signature.startswith("UnRequestRTReg"):
+            return True
+        raise NotImplementedError(signature)
+
+
+def install() -> None:
+    """ 가짜 PyQt5/pythoncom을 sys.modules에 등록한다. (package import 전에 호출) """
+    pyqt = types.ModuleType('PyQt5')
+    core = types.ModuleType('PyQt5.QtCore')
+    core.QEventLoop, core.QTimer, core.QObject = QEventLoop, QTimer, object
+    widgets = types.ModuleType('PyQt5.QtWidgets')
+    widgets.QApplication = QApplication
+    ax = types.ModuleType('PyQt5.QAxContainer')
+    ax.QAxWidget = FakeControl
+    pyqt.QtCore, pyqt.QtWidgets, pyqt.QAxContainer = core, widgets, ax
+    sys.modules.update({'PyQt5': pyqt, 'PyQt5.QtCore': core, 'PyQt5.QtWidgets': widgets, 'PyQt5.QAxContainer': ax})
+    pythoncom = types.ModuleType('pythoncom')
+    pythoncom.PumpWaitingMessages = QApplication.processEvents
+    sys.modules['pythoncom'] = pythoncom
+
+
+def import_package():
+    """ 이 repository를 package(directory 이름)로 import한다. """
+    parent = os.path.dirname(ROOT)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module(os.path.basename(ROOT))
@@ -0,0 +1,36 @@
+import time
+
+import numpy as np
+
+from conftest import api
+
+
+def _sc_records(ticks: list) -> np.ndarray:
+    """ (체결시간, 현재가, 누적거래량) -> 2024-01-02에 기록한 SC record 배열 """
+    records = np.zeros([len(ticks)], dtype=api.TickStore.with_rcv_time(api.SC.SINGLE_OUTPUT_DTYPE))
+    for record, (hhmmss, price, cum_volume) in zip(records, ticks):
+        record['단축코드'], record['체결시간'], record['현재가'] = '005930', hhmmss, price
+        record['누적거래량'], record['누적거래대금'], record['단위체결량'] = cum_volume, cum_volume * price, '1'
+        hour, minute, second = int(hhmmss[:2]), int(hhmmss[2:4]), int(hhmmss[4:6])
+        record[api.TickStore.RCV_TIME_FIELD] = time.mktime((2024, 1, 2, hour, minute, second, 0, 0, -1))
+    return records
+
+
+def test_replayed_bars_are_dated_by_replay_clock():
+    replay = api.Replay.Replay()
+    replay.add('SC', _sc_records([('090005', 100, 1), ('090040', 102, 3), ('090110', 101, 6)]))
+    sc = api.SC(indi_instance=replay.indi)
+    sc.reg_realtime('005930')
+    bar_agg = api.Bars.BarAggregator(seconds=60, clock=replay.clock)
+    sc.subscribe(bar_agg.on_tick)
+    batch_agg = api.Bars.BarAggregator(seconds=60, clock=replay.clock)
+    sc.subscribe(batch_agg.on_ticks, batch=True, interval=10)
+
+    assert replay.run() == 3
+    for aggregator in (bar_agg, batch_agg):
+        aggregator.flush()
+        bars = aggregator.bars('005930')
+        assert bars['일자'].tolist() == ['20240102', '20240102']
+        assert bars['시간'].tolist() == ['090000', '090100']
+        assert bars['고가'].tolist() == [102, 101]
+        assert bars['단위거래량'].tolist() == [3, 3]
@@ -0,0 +1,135 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from conftest import api
+
+Cache = api.Cache
+
+_DTYPE = np.dtype([('단축코드', 'U6'), ('현재가', np.uint32)])
+
+
+def _at(day: int, hour: int) -> float:
+    """ 2024-01-<day> <hour>시 (local time.time()) """
+    return time.mktime((2024, 1, day, hour, 0, 0, 0, 0, -1))
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTR:
+    def __init__(self, name: str, ttl):
+        self.NAME, self.CACHE_TTL = name, ttl
+
+
+def _output(price: int) -> np.ndarray:
+    return np.array([('005930', price)], dtype=_DTYPE)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(_at(2, 9))
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return Cache.ResponseCache(str(tmp_path), maxsize=2, clock=clock)
+
+
+def test_make_key_normalizes_inputs_like_set_single_data():
+    assert Cache.make_key('TR_SCHART', ('005930', 1), {'b': 2, 'a': '1'}) == \
+        Cache.make_key('TR_SCHART', ('005930', '1'), {'a': 1, 'b': '2'})
+    assert Cache.make_key('TR_SCHART', ('005930', ), {}) != Cache.make_key('TR_SCHART', ('005930', ''), {})
+    assert Cache.make_key('TR_SCHART', ('005930', ), {}) != Cache.make_key('TR_FCHART', ('005930', ), {})
+
+
+def test_trading_date_rolls_over_at_configured_hour():
+    rollover = api.Config.CACHE_ROLLOVER_HOUR
+    assert Cache.trading_date(Cache.datetime.datetime(2024, 1, 3, rollover - 1)) == '20240102'
+    assert Cache.trading_date(Cache.datetime.datetime(2024, 1, 3, rollover)) == '20240103'
+
+
+def test_returns_copies(cache):
+    tr = FakeTR('SABA609Q1', 5)
+    cache.put(tr, ('005930', ), {}, None, _output(100))
+    _, multi_output = cache.get(tr, ('005930', ), {})
+    multi_output['현재가'] = 0
+    assert cache.get(tr, ('005930', ), {})[1]['현재가'][0] == 100
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_lru_evicts_least_recently_used(cache):
+    tr = FakeTR('SABA609Q1', 60)
+    for code in ('A', 'B'):
+        cache.put(tr, (code, ), {}, None, _output(1))
+    assert cache.get(tr, ('A', ), {}) is not None     # A를 최근 사용으로
+    cache.put(tr, ('C', ), {}, None, _output(1))
+    assert cache.get(tr, ('B', ), {}) is None
+    assert cache.get(tr, ('A', ), {}) is not None and cache.get(tr, ('C', ), {}) is not None
+
+
+def test_ttl_expiry_and_uncached_trs(cache, clock, monkeypatch):
+    tr = FakeTR('SABA609Q1', 5)
+    cache.put(tr, (), {}, None, _output(1))
+    clock.now += 4.9
+    assert cache.get(tr, (), {}) is not None
+    clock.now += 0.1
+    assert cache.get(tr, (), {}) is None and not cache._lru
+
+    uncached = FakeTR('SABA101U1', None)
+    cache.put(uncached, (), {}, None, _output(1))
+    assert cache.get(uncached, (), {}) is None and not cache._lru
+    monkeypatch.setitem(api.Config.CACHE_TTL_BY_NAME, 'SABA101U1', 60)
+    cache.put(uncached, (), {}, None, _output(1))
+    assert cache.get(uncached, (), {}) is not None
+
+
+def test_trading_day_entries_survive_restart_on_disk(tmp_path, cache, clock):
+    tr = FakeTR('stock_mst', Cache.TTL_TRADING_DAY)
+    cache.put(tr, (), {}, _output(1), _output(2))
+    assert os.listdir(tmp_path) == ['20240102']
+
+    restarted = Cache.ResponseCache(str(tmp_path), clock=clock)
+    single_output, multi_output = restarted.get(tr, (), {})
+    assert single_output.tolist() == [('005930', 1)] and multi_output.dtype == _DTYPE
+    assert (restarted.disk_hits, restarted.misses) == (1, 0)
+    assert restarted.get(tr, ('other', ), {}) is None
+
+    clock.now = _at(3, 6)       # rollover 전 : 같은 거래일
+    assert Cache.ResponseCache(str(tmp_path), clock=clock).get(tr, (), {}) is not None
+    clock.now = _at(3, 8)
+    assert cache.get(tr, (), {}) is None
+    assert Cache.ResponseCache(str(tmp_path), clock=clock).get(tr, (), {}) is None
+
+
+def test_new_trading_day_purges_old_dates(tmp_path, cache, clock):
+    tr = FakeTR('stock_mst', Cache.TTL_TRADING_DAY)
+    cache.put(tr, (), {}, None, _output(1))
+    os.makedirs(tmp_path / 'not_a_date')
+    clock.now = _at(3, 9)
+    cache.put(tr, (), {}, None, _output(2))
+    assert sorted(os.listdir(tmp_path)) == ['20240103', 'not_a_date']
+
+
+def test_invalidate_by_name_and_disk(tmp_path, cache, clock):
+    mst, sfut = FakeTR('stock_mst', Cache.TTL_TRADING_DAY), FakeTR('sfut_mst', Cache.TTL_TRADING_DAY)
+    cache.put(mst, (), {}, None, _output(1))
+    cache.put(sfut, (), {}, None, _output(2))
+
+    cache.invalidate('stock_mst')
+    assert list(cache._lru) == [Cache.make_key('sfut_mst', (), {})]
+    assert cache.get(mst, (), {}) is not None     # 디스크에서 다시 읽는다.
+    assert cache.disk_hits == 1
+
+    cache.invalidate('stock_mst', disk=True)
+    assert cache.get(mst, (), {}) is None
+    assert [name.rsplit('_', 1)[0] for name in os.listdir(tmp_path / '20240102')] == ['sfut_mst']
+    cache.invalidate(disk=True)
+    assert os.listdir(tmp_path / '20240102') == [] and not cache._lru
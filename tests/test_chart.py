@@ -0,0 +1,51 @@
+import numpy as np
+
+from conftest import api
+
+
+def _minute_rows(n_days: int, n_minutes: int) -> list:
+    rows = []
+    for day in range(n_days):
+        for minute in range(n_minutes):
+            rows.append([f'202401{day + 1:02d}', f'{9 + minute // 60:02d}{minute % 60:02d}00', '100', '110', '90',
+                         '105', '0', '0', '0', str(len(rows)), '1'])
+    return rows
+
+
+def _responder(rows: list, requests: list):
+    def respond(query: str, inputs: dict) -> tuple:
+        start, end, n = inputs[3], inputs[4], int(inputs[5])
+        requests.append((start, end, n))
+        return [], [row for row in rows if start <= row[0] <= end][-n:][::-1]     # 최신 행부터
+    return respond
+
+
+def test_cfchart_minute_paging_keeps_every_row(indi):
+    rows, requests = _minute_rows(5, 30), []
+    indi.responder = _responder(rows, requests)
+    tr = api.TR_CFCHART(indi)
+    out = tr.rq_range('165000', '1', '1', page_size=40)
+    assert len(requests) > 1
+    assert out['단위거래량'].tolist() == [int(row[9]) for row in rows]
+    assert len(np.unique(tr._row_keys(out))) == len(out)
+
+
+def test_row_keys_skip_empty_time_field():
+    dtype = np.dtype([('일자', 'U8'), ('시간', 'U0'), ('종가', 'U8')])
+    output = np.zeros([2], dtype=dtype)
+    output['일자'] = ['20240102', '20240103']
+    assert api.BaseTRRT.BaseChartTR.time_field(dtype) is None
+    assert api.BaseTRRT.BaseChartTR._row_keys(output).tolist() == ['20240102', '20240103']
+
+
+def test_paging_without_time_field_holds_back_partial_day(indi, monkeypatch):
+    # 시간 field가 없는 minute 응답 : 경계 일자가 page에 일부만 있어도 다음 page에서 모두 받는다.
+    dtype = np.dtype([(name, api.TR_CFCHART.MULTI_OUTPUT_DTYPE[name]) for name in api.TR_CFCHART.MULTI_OUTPUT_DTYPE.names
+                      if name != '시간'])
+    monkeypatch.setattr(api.TR_CFCHART, 'MULTI_OUTPUT_DTYPE', dtype)
+    monkeypatch.setattr(api.TR_CFCHART, '_multi_decoder', None, raising=False)
+    rows, requests = _minute_rows(5, 30), []
+    rows = [row[:1] + row[2:] for row in rows]
+    indi.responder = _responder(rows, requests)
+    out = api.TR_CFCHART(indi).rq_range('165000', '1', '1', page_size=40)
+    assert out['단위거래량'].tolist() == [int(row[8]) for row in rows]
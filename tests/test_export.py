@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from conftest import api
+
+pa = pytest.importorskip('pyarrow')
+
+_DTYPE = np.dtype([('단축코드', 'U6'), ('매도수량', 'U18'), ('현재가', 'U9')])
+
+
+def _output(rows: list) -> np.ndarray:
+    return np.array(rows, dtype=_DTYPE)
+
+
+def test_zero_padded_quantities_are_int():
+    output = _output([('005930', '000000000000001234', '71000'), ('000660', '000000000000000000', '')])
+    table = api.Export.to_table(output)
+    assert table.schema.field('매도수량').type == pa.int64()
+    assert table.column('매도수량').to_pylist() == [1234, 0]
+    assert table.column('현재가').to_pylist() == [71000, None]
+    assert table.schema.field('단축코드').type != pa.int64()
+
+
+def test_dataset_writer_rejects_values_outside_locked_schema(tmp_path):
+    writer = api.Export.DatasetWriter(str(tmp_path / 'dataset'))
+    writer.append(_output([('005930', '000000000000001234', '71000')]), 거래일='20240102')
+    with pytest.raises(ValueError, match='매도수량'):
+        writer.append(_output([('005930', '1.5', '71000')]), 거래일='20240103')
+    assert writer.n_batches == 1
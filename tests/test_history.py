@@ -0,0 +1,30 @@
+import numpy as np
+
+from conftest import api
+from test_chart import _minute_rows, _responder
+
+
+def test_history_merges_by_date_without_time_field(indi, tmp_path, monkeypatch):
+    dtype = np.dtype([(name, api.TR_CFCHART.MULTI_OUTPUT_DTYPE[name]) for name in api.TR_CFCHART.MULTI_OUTPUT_DTYPE.names
+                      if name != '시간'])
+    monkeypatch.setattr(api.TR_CFCHART, 'MULTI_OUTPUT_DTYPE', dtype)
+    monkeypatch.setattr(api.TR_CFCHART, '_multi_decoder', None, raising=False)
+    rows, requests = [row[:1] + row[2:] for row in _minute_rows(5, 30)], []
+    indi.responder = _responder(rows, requests)
+    store = api.History.HistoryStore(api.TR_CFCHART(indi), root=str(tmp_path))
+    store.get_history('165000', '1m', '20240102', '20240103')
+    out = store.get_history('165000', '1m', '20240101', '20240105')
+    assert out['단위거래량'].tolist() == [int(row[8]) for row in rows]
+
+
+def test_history_fetches_only_missing_ranges(indi, tmp_path):
+    rows, requests = _minute_rows(5, 30), []
+    indi.responder = _responder(rows, requests)
+    store = api.History.HistoryStore(api.TR_SCHART(indi), root=str(tmp_path))
+    assert len(store.get_history('005930', '1m', '20240102', '20240103')) == 60
+    n_requests = len(requests)
+    assert len(store.get_history('005930', '1m', '20240102', '20240102')) == 30
+    assert len(requests) == n_requests
+    out = store.get_history('005930', '1m', '20240101', '20240105')
+    assert [(start, end) for start, end, _ in requests[n_requests:]] == [('20240101', '20240101'), ('20240104', '20240105')]
+    assert out['단위거래량'].tolist() == [int(row[9]) for row in rows]
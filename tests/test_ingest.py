@@ -0,0 +1,96 @@
+import time
+import threading
+
+from conftest import api
+
+Ingest = api.Ingest
+
+
+class FakeRealtime:
+    """ _apply_raw()로 받은 event를 기록한다. gate를 지정하면 처리 전에 gate가 열릴 때까지 멈춘다. (느린 소비자) """
+
+    def __init__(self, gate: threading.Event = None):
+        self.gate = gate
+        self.applied = []
+        self.started = threading.Event()
+
+    def _apply_raw(self, code, single_raw, multi_raw, rcv_time) -> None:
+        self.started.set()
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        self.applied.append((code, single_raw))
+
+
+def _event(realtime: FakeRealtime, code: str, value: str, name: str = 'SC') -> Ingest.RawEvent:
+    return Ingest.RawEvent(name, code, [realtime], [code, value], None, time.time())
+
+
+def _drain(ingestor: Ingest.RealtimeIngestor, n_processed: int) -> None:
+    deadline = time.monotonic() + 5
+    while ingestor.n_processed < n_processed and time.monotonic() < deadline:
+        time.sleep(0.001)
+    ingestor.stop(5)
+
+
+def test_drop_oldest_keeps_newest_events():
+    realtime = FakeRealtime()
+    ingestor = Ingest.RealtimeIngestor(maxsize=2, policy=Ingest.OVERFLOW_DROP_OLDEST)
+    for i in range(5):      # worker 시작 전 = 소비자가 멈춘 상태
+        ingestor.put(_event(realtime, '005930', str(i)), time.monotonic())
+    assert ingestor.queue_depth == 2
+    ingestor.start()
+    _drain(ingestor, 2)
+
+    assert [raw[1] for _, raw in realtime.applied] == ['3', '4']
+    stats = ingestor.stats()
+    assert (stats['received'], stats['processed'], stats['dropped'], stats['conflated']) == (5, 2, 3, 0)
+    assert stats['max_depth'] == 2 and stats['queue_depth'] == 0
+    assert stats['handler_time']['count'] == 5 and stats['process_time']['count'] == 2
+    assert stats['queue_latency']['count'] == 2
+
+
+def test_conflate_replaces_pending_event_of_same_code():
+    realtime = FakeRealtime()
+    ingestor = Ingest.RealtimeIngestor(maxsize=2, policy=Ingest.OVERFLOW_CONFLATE)
+    for code, value in (('005930', '1'), ('000660', '2'), ('005930', '3')):
+        ingestor.put(_event(realtime, code, value))
+    assert ingestor.queue_depth == 2 and ingestor.n_conflated == 1
+    ingestor.put(_event(realtime, '005930', '4', name='SH'))    # NAME이 다르면 다른 key : 가장 오래된 event를 버린다.
+    ingestor.start()
+    _drain(ingestor, 2)
+
+    assert realtime.applied == [('000660', ['000660', '2']), ('005930', ['005930', '4'])]
+    assert (ingestor.n_received, ingestor.n_conflated, ingestor.n_dropped) == (4, 1, 1)
+
+
+def test_block_waits_for_stalled_consumer():
+    gate = threading.Event()
+    realtime = FakeRealtime(gate)
+    ingestor = Ingest.RealtimeIngestor(maxsize=2, policy=Ingest.OVERFLOW_BLOCK)
+    ingestor.start()
+    ingestor.put(_event(realtime, '005930', '0'))
+    assert realtime.started.wait(5)     # worker가 첫 event에서 멈췄다.
+    ingestor.put(_event(realtime, '005930', '1'))
+    ingestor.put(_event(realtime, '005930', '2'))
+
+    producer = threading.Thread(target=ingestor.put, args=(_event(realtime, '005930', '3'), ))
+    producer.start()
+    producer.join(0.2)
+    blocked = producer.is_alive()
+    gate.set()
+    producer.join(5)
+    _drain(ingestor, 4)
+
+    assert blocked
+    assert [raw[1] for _, raw in realtime.applied] == ['0', '1', '2', '3']
+    assert ingestor.n_dropped == 0 and ingestor.max_depth == 2
+
+
+def test_call_later_runs_in_worker_thread():
+    ingestor = Ingest.RealtimeIngestor(maxsize=2)
+    ingestor.start()
+    ran = []
+    done = threading.Event()
+    ingestor.call_later(0.01, lambda: (ran.append(ingestor.in_worker()), done.set()))
+    assert done.wait(5) and ran == [True]
+    ingestor.stop(5)
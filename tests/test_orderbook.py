@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from conftest import api
+
+OrderBook = api.OrderBook
+
+
+def _raw_tick(realtime_cls, seed: int) -> list:
+    """ 호가 field는 단계별로 다른 값, 나머지는 유효한 값으로 채운 원(raw) tick """
+    rng = np.random.default_rng(seed)
+    dtype = realtime_cls.SINGLE_OUTPUT_DTYPE
+    raw = []
+    for name in dtype.names:
+        match = OrderBook._LEVEL_FIELD.match(name)
+        if name == '단축코드':
+            raw.append('005930')
+        elif match and match.group(3):      # 잔량
+            raw.append(str(int(rng.integers(0, 100000))))
+        elif match:                         # 가격 (실수 field는 float32로 정확히 표현되는 값)
+            price = 70000 + (1 if match.group(1) == '매도' else -1) * 100 * int(match.group(2))
+            raw.append(f'{price / 200:.2f}' if dtype[name].kind == 'f' else str(price))
+        else:
+            raw.append('1' if dtype[name].kind in 'iuf' else 'X')
+    return raw
+
+
+def _expected(realtime_cls, raw: list) -> tuple:
+    """ field별로 원(raw) 값을 변환한 (prices, qtys) """
+    names = realtime_cls.SINGLE_OUTPUT_DTYPE.names
+    depth = OrderBook.get_plan(realtime_cls.get_single_decoder().dtype).depth
+    prices, qtys = np.zeros([2, depth]), np.zeros([2, depth], dtype=np.int64)
+    for name, value in zip(names, raw):
+        match = OrderBook._LEVEL_FIELD.match(name)
+        if match:
+            side, level = OrderBook._SIDES[match.group(1)], int(match.group(2)) - 1
+            if match.group(3):
+                qtys[side, level] = int(value)
+            else:
+                prices[side, level] = float(value)
+    return prices, qtys
+
+
+@pytest.mark.parametrize('name, strided', [('SH', (True, True)), ('QH', (True, True)), ('WH', (True, True)),
+                                           ('LH', (False, False))])
+def test_realtime_book_matches_per_field_decoding(name, strided):
+    realtime_cls = getattr(api, name)
+    control = api.new_indi(f'test_book_{name}', is_realtime=True)
+    realtime_inst = realtime_cls(control)
+    realtime_inst.reg_realtime('005930')
+    books = OrderBook.OrderBooks()
+    realtime_inst.subscribe(books.on_tick)
+    plan = OrderBook.get_plan(realtime_inst.single_output.dtype)
+    assert tuple(plan.views[is_qty] is not None for is_qty in (False, True)) == strided
+
+    for seed in range(3):
+        control.single = _raw_tick(realtime_cls, seed)
+        control.ReceiveRTData.emit(name)
+        prices, qtys = _expected(realtime_cls, control.single)
+        book = books['005930']
+        np.testing.assert_array_equal(book.prices, prices)
+        np.testing.assert_array_equal(book.qtys, qtys)
+    assert book.n_updates == 3 and book.time == 'X'
+    assert book.spread == prices[0, 0] - prices[1, 0]
+    assert book.cum_depth[:, -1].tolist() == qtys.sum(axis=1).tolist()
+
+
+def test_tr_book_with_strided_prices_and_string_quantities(indi):
+    """ FH : 가격은 float32 strided view, 잔량은 문자열 field별 변환 """
+    raw = _raw_tick(api.FH, 0)
+    indi.responder = lambda query, inputs: (raw, [])
+    fh = api.FH(indi)
+    fh.rq_data('101V3000')
+    plan = OrderBook.get_plan(fh.single_output.dtype)
+    assert plan.views[False] is not None and plan.views[True] is None
+
+    book = OrderBook.OrderBooks().update('101V3000', fh.single_output)
+    prices, qtys = _expected(api.FH, raw)
+    np.testing.assert_array_equal(book.prices, prices)
+    np.testing.assert_array_equal(book.qtys, qtys)
+
+
+def test_depth_limits_levels():
+    raw = _raw_tick(api.SH, 0)
+    tick = np.empty([1], dtype=api.SH.get_single_decoder().dtype)
+    tick[0] = api.SH.get_single_decoder().decode_row(raw)
+    book = OrderBook.OrderBooks(depth=3).update('005930', tick)
+    prices, qtys = _expected(api.SH, raw)
+    np.testing.assert_array_equal(book.prices, prices[:, :3])
+    np.testing.assert_array_equal(book.qtys, qtys[:, :3])
+    assert book.imbalance_at(3) == book.imbalance
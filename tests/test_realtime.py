@@ -0,0 +1,99 @@
+import pytest
+
+import fakeqt
+
+from conftest import api
+
+
+def _ic_tick(code: str, index: str) -> list:
+    return [code, '090001', '1', index, '2', '1.5', '0.1', '100', '1000', '10', index, index, index, '090000', '090000']
+
+
+@pytest.fixture
+def rt_indi():
+    return api.new_indi('test_rt', is_realtime=True)
+
+
+def test_index_ticks_are_routed_per_code(rt_indi):
+    conflator = api.TickStore.Conflator.for_realtime(api.IC)
+    kospi = api.IC(rt_indi, ring_size=8, conflator=conflator)
+    kosdaq = api.IC(rt_indi, ring_size=8)
+    assert kospi.reg_realtime('0001') and kosdaq.reg_realtime('1001')
+    received = []
+    kospi.subscribe(lambda code, tick: received.append(('kospi', code)))
+    kosdaq.subscribe(lambda code, tick: received.append(('kosdaq', code)))
+
+    for code, index in (('0001', '2650.5'), ('1001', '870.25'), ('0001', '2651.0')):
+        rt_indi.single = _ic_tick(code, index)
+        rt_indi.ReceiveRTData.emit('IC')
+
+    assert received == [('kospi', '0001'), ('kosdaq', '1001'), ('kospi', '0001')]
+    assert float(kospi.get_output('0001')['현재지수'][0]) == 2651.0
+    assert float(kosdaq.get_output('1001')['현재지수'][0]) == pytest.approx(870.25)
+    assert len(kospi.get_ring('0001')) == 2 and kospi.get_ring('1001') is None
+    assert conflator.codes == ['0001']
+
+
+def test_tick_stores_reject_realtime_without_code_field():
+    with pytest.raises(ValueError):
+        api.TickStore.Conflator.for_realtime(api.AA)
+    with pytest.raises(ValueError):
+        api.TickStore.TickArena.for_realtime(api.AA)
+
+
+def _sc_tick(code: str, price: int) -> list:
+    names = api.SC.SINGLE_OUTPUT_DTYPE.names
+    values = {'단축코드': code, '현재가': str(price), '체결시간': '090000'}
+    return [values.get(name, '1' if api.SC.SINGLE_OUTPUT_DTYPE[name].kind in 'iuf' else 'X') for name in names]
+
+
+def _emit_sc(rt_indi, ticks: list) -> None:
+    for code, price in ticks:
+        rt_indi.single = _sc_tick(code, price)
+        rt_indi.ReceiveRTData.emit('SC')
+
+
+def test_subscriptions_fan_out_per_tick_and_batched(rt_indi):
+    sc = api.SC(rt_indi)
+    assert sc.reg_realtime('005930') and sc.reg_realtime('000660')
+    per_tick, batches = [], []
+
+    def broken(code, tick):
+        raise RuntimeError('broken callback')
+    sub_broken = sc.subscribe(broken)
+    sc.subscribe(lambda code, tick: per_tick.append((code, int(tick['현재가'][0]))))
+    sub_batch = sc.subscribe(lambda codes, ticks: batches.append((codes, ticks['현재가'].tolist())),
+                             code='005930', batch=True, interval=10)
+
+    _emit_sc(rt_indi, [('005930', 100), ('000660', 200), ('005930', 101)])
+    assert per_tick == [('005930', 100), ('000660', 200), ('005930', 101)]
+    assert sub_broken.n_errors == 3 and sub_broken.n_delivered == 0
+    assert batches == []
+
+    fakeqt.process_one()       # batch timer
+    assert batches == [(['005930', '005930'], [100, 101])]
+    assert sub_batch.n_delivered == 1
+
+
+def test_batch_is_flushed_at_max_batch_and_on_unsubscribe(rt_indi):
+    sc = api.SC(rt_indi)
+    sc.reg_realtime('*')
+    batches = []
+    sub = sc.subscribe(lambda codes, ticks: batches.append(codes), batch=True, interval=1000, max_batch=2)
+
+    _emit_sc(rt_indi, [('005930', 100), ('000660', 200), ('035720', 300)])
+    assert batches == [['005930', '000660']]
+    sc.unsubscribe(sub)
+    assert batches == [['005930', '000660'], ['035720']]
+    _emit_sc(rt_indi, [('005930', 101)])
+    assert len(batches) == 2
+
+
+def test_delivered_ticks_are_copies(rt_indi):
+    sc = api.SC(rt_indi)
+    sc.reg_realtime('005930')
+    ticks = []
+    sc.subscribe(lambda code, tick: ticks.append(tick))
+    _emit_sc(rt_indi, [('005930', 100), ('005930', 101)])
+    assert [int(tick['현재가'][0]) for tick in ticks] == [100, 101]
+    assert ticks[0] is not sc.single_output and ticks[1] is not sc.single_output
@@ -0,0 +1,90 @@
+import os
+import time
+import threading
+
+import numpy as np
+
+from conftest import api
+
+
+def _recorder_and_sc(tmp_path, segment_rows: int = 1024) -> tuple:
+    recorder = api.Recorder.TickRecorder(str(tmp_path), flush_interval=3600, segment_rows=segment_rows)
+    sc = api.SC(api.new_indi('test_rec', is_realtime=True))
+    return recorder, sc
+
+
+def _row(price: int) -> np.void:
+    row = np.zeros([1], dtype=api.SC.SINGLE_OUTPUT_DTYPE)[0]
+    row['단축코드'], row['현재가'] = '005930', price
+    return row
+
+
+def test_flush_does_not_block_append(tmp_path):
+    recorder, sc = _recorder_and_sc(tmp_path)
+    recorder.append(sc, _row(100), time.time())
+    record_file = recorder._segments[recorder._files[sc]]
+
+    entered, release = threading.Event(), threading.Event()
+    msync = record_file._buf.flush
+
+    def slow_flush():
+        entered.set()
+        release.wait(5)
+        msync()
+    record_file._buf.flush = slow_flush
+    flusher = threading.Thread(target=recorder.flush)
+    flusher.start()
+    assert entered.wait(5)
+
+    appender = threading.Thread(target=recorder.append, args=(sc, _row(101), time.time()))
+    appender.start()
+    appender.join(1)
+    blocked = appender.is_alive()
+    release.set()
+    flusher.join(5)
+    appender.join(5)
+    assert not blocked
+
+    filepath = recorder.filepath(sc)
+    assert api.Recorder.open_record(filepath)['현재가'].tolist() == [100]
+    recorder.flush()
+    assert api.Recorder.open_record(filepath)['현재가'].tolist() == [100, 101]
+    recorder.close()
+
+
+def _segment_prices(recorder) -> list:
+    paths = api.Recorder.segment_paths(os.path.join(recorder.record_dir, recorder.date), 'SC')
+    return [api.Recorder.open_record(filepath)['현재가'].tolist() for filepath in paths]
+
+
+def test_full_segment_rolls_over_without_resizing(tmp_path):
+    recorder, sc = _recorder_and_sc(tmp_path, segment_rows=4)
+    sizes = {}
+    for price in range(10):
+        recorder.append(sc, _row(price), time.time())
+        filepath = recorder.filepath(sc)
+        sizes.setdefault(filepath, os.path.getsize(filepath))
+        assert os.path.getsize(filepath) == sizes[filepath]
+    recorder.flush()
+    assert [os.path.basename(filepath) for filepath in sizes] == ['SC.0000.rec', 'SC.0001.rec', 'SC.0002.rec']
+    assert _segment_prices(recorder) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert recorder._retired == []
+
+    replay = api.Replay.Replay()
+    replay.add_day(recorder.date, record_dir=str(tmp_path))
+    assert [stream.name for stream in replay._streams] == ['SC'] * 3
+    recorder.close()
+
+
+def test_restart_continues_last_segment(tmp_path):
+    recorder, sc = _recorder_and_sc(tmp_path, segment_rows=4)
+    for price in range(6):
+        recorder.append(sc, _row(price), time.time())
+    recorder.close()
+
+    recorder, sc = _recorder_and_sc(tmp_path, segment_rows=4)
+    for price in range(6, 9):
+        recorder.append(sc, _row(price), time.time())
+    recorder.flush()
+    assert _segment_prices(recorder) == [[0, 1, 2, 3], [4, 5, 6, 7], [8]]
+    recorder.close()
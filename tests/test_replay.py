@@ -0,0 +1,44 @@
+import numpy as np
+
+from conftest import api
+
+
+def _records(realtime_cls, code_field: str, codes: list) -> np.ndarray:
+    records = np.zeros([len(codes)], dtype=api.TickStore.with_rcv_time(realtime_cls.SINGLE_OUTPUT_DTYPE))
+    records[code_field] = codes
+    records[api.TickStore.RCV_TIME_FIELD] = 1704153600. + np.arange(len(codes))
+    return records
+
+
+def _collect(realtime_inst, received: list) -> None:
+    realtime_inst.subscribe(lambda code, tick: received.append((realtime_inst, code)))
+
+
+def test_index_replay_is_routed_by_code_field():
+    replay = api.Replay.Replay()
+    replay.add('IC', _records(api.IC, '업종코드', ['0001', '1001', '0001']))
+    kospi, kosdaq = api.IC(replay.indi), api.IC(replay.indi)
+    kospi.reg_realtime('0001')
+    kosdaq.reg_realtime('1001')
+    received = []
+    _collect(kospi, received)
+    _collect(kosdaq, received)
+
+    assert replay.run() == 3
+    assert received == [(kospi, '0001'), (kosdaq, '1001'), (kospi, '0001')]
+    assert kospi.get_output('1001') is None and kosdaq.get_output('1001') is not None
+
+
+def test_replay_routes_like_realtime():
+    """ 등록되지 않은 code는 실시간 수신과 같이 NAME의 모든 instance에 전달한다. """
+    replay = api.Replay.Replay()
+    replay.add('SC', _records(api.SC, '단축코드', ['005930', '000660']))
+    samsung, hynix = api.SC(replay.indi), api.SC(replay.indi)
+    samsung.reg_realtime('005930')
+    hynix.reg_realtime('035720')
+    received = []
+    _collect(samsung, received)
+    _collect(hynix, received)
+
+    assert replay.run() == 2
+    assert received == [(samsung, '005930'), (samsung, '000660'), (hynix, '000660')]
@@ -0,0 +1,53 @@
+import pytest
+
+from conftest import api
+
+_ROW = ['20240102', '090000', '100', '110', '90', '105', '1.0', '1.0', '', '10', '1000']
+
+
+def _fail_request_data_once(indi) -> list:
+    """ 첫 RequestData()만 실패(0)시킨다. :return: RequestData() 호출 기록 """
+    calls, dynamic_call = [], indi.dynamicCall
+
+    def call(signature, *args):
+        if signature.startswith("RequestData"):
+            calls.append(signature)
+            if len(calls) == 1:
+                return 0
+        return dynamic_call(signature, *args)
+    indi.dynamicCall = call
+    return calls
+
+
+def test_failed_send_does_not_stay_in_flight(indi):
+    indi.responder = lambda query, inputs: ([], [_ROW])
+    calls = _fail_request_data_once(indi)
+    tr = api.TR_SCHART(indi)
+
+    failed = tr.rq_data_async('005930')
+    assert failed.done() and isinstance(failed.exception(), api.APIErrors.RequestDataError)
+    assert not indi._inflight
+
+    retried = tr.rq_data_async('005930')
+    assert len(calls) == 2 and retried.rqid is not None
+    assert retried.result(1)['종가'].tolist() == [105]
+    assert not indi._inflight
+
+
+def test_rq_data_raises_when_send_fails(indi):
+    indi.responder = lambda query, inputs: ([], [_ROW])
+    _fail_request_data_once(indi)
+    tr = api.TR_SCHART(indi)
+    with pytest.raises(api.APIErrors.RequestDataError):
+        tr.rq_data('005930')
+    assert tr.rq_data('005930')['종가'].tolist() == [105]
+
+
+def test_identical_requests_in_flight_are_coalesced(indi):
+    indi.responder = lambda query, inputs: ([], [_ROW])
+    tr = api.TR_SCHART(indi)
+    primary, follower = tr.rq_data_async('005930'), tr.rq_data_async('005930')
+    assert follower.rqid == primary.rqid and len(indi._inflight) == 1
+    assert follower.result(1)['종가'].tolist() == [105]
+    assert follower.multi_output is not primary.multi_output
+    assert not indi._inflight
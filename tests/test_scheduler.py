@@ -0,0 +1,92 @@
+from conftest import api
+
+Scheduler = api.Scheduler
+
+
+class FakeClock:
+    """ 테스트용 시각 + call_later timer """
+
+    def __init__(self):
+        self.now = 0.
+        self.timers = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def call_later(self, delay: float, fn) -> None:
+        self.timers.append((self.now + delay, fn))
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        due = [timer for timer in self.timers if timer[0] <= self.now]
+        self.timers = [timer for timer in self.timers if timer[0] > self.now]
+        for _, fn in due:
+            fn()
+
+
+def _scheduler(clock: FakeClock, rate: float, by_name: dict = None) -> Scheduler.RequestScheduler:
+    return Scheduler.RequestScheduler(rate, by_name or {}, call_later=clock.call_later, clock=clock)
+
+
+def test_token_bucket_refills_at_rate_up_to_capacity():
+    bucket = Scheduler.TokenBucket(2, now=0.)
+    for _ in range(2):
+        assert bucket.available(0.)
+        bucket.take()
+    assert not bucket.available(0.)
+    assert bucket.wait_time(0.) == 0.5
+    assert bucket.available(0.5)
+    assert bucket.available(100.) and bucket.tokens == bucket.capacity == 2
+
+
+def test_queued_requests_are_sent_in_priority_order():
+    clock, sent = FakeClock(), []
+    scheduler = _scheduler(clock, rate=1)
+    scheduler.submit('first', Scheduler.PRIORITY_NORMAL, lambda: sent.append('first'))
+    for name, priority in (('bulk', Scheduler.PRIORITY_BULK), ('normal', Scheduler.PRIORITY_NORMAL),
+                           ('order', Scheduler.PRIORITY_ORDER)):
+        scheduler.submit(name, priority, lambda name=name: sent.append(name))
+    assert sent == ['first'] and scheduler.queue_depth == 3
+
+    for expected in (['first', 'order'], ['first', 'order', 'normal'], ['first', 'order', 'normal', 'bulk']):
+        clock.advance(1.)
+        assert sent == expected
+    stats = scheduler.stats()
+    assert stats['queue_depth'] == 0 and stats['dispatched'] == 4 and stats['delayed'] == 3
+    assert stats['max_wait'] == 3.
+
+
+def test_name_limit_delays_only_that_name_and_keeps_its_order():
+    clock, sent = FakeClock(), []
+    scheduler = _scheduler(clock, rate=100, by_name={'SCDA601U4': 0.5})
+    for name, tag in (('SCDA601U4', 'a'), ('SCDA601U4', 'b'), ('TR_SCHART', 'c'), ('SCDA601U4', 'd')):
+        scheduler.submit(name, Scheduler.PRIORITY_NORMAL, lambda tag=tag: sent.append(tag))
+    assert sent == ['a', 'c']
+    assert [due for due, _ in clock.timers] == [2.]
+
+    clock.advance(1.9)
+    assert sent == ['a', 'c']
+    clock.advance(0.1)
+    assert sent == ['a', 'c', 'b']
+    clock.advance(2.)
+    assert sent == ['a', 'c', 'b', 'd']
+
+
+def test_set_rate_changes_and_removes_name_limit():
+    clock, sent = FakeClock(), []
+    scheduler = _scheduler(clock, rate=100, by_name={'TR_SCHART': 1})
+    scheduler.set_rate('TR_SCHART', None)
+    for i in range(3):
+        scheduler.submit('TR_SCHART', Scheduler.PRIORITY_BULK, lambda i=i: sent.append(i))
+    assert sent == [0, 1, 2]
+
+
+def test_failing_send_does_not_stop_dispatch():
+    clock, sent = FakeClock(), []
+    scheduler = _scheduler(clock, rate=100)
+
+    def fail():
+        raise RuntimeError('boom')
+    scheduler.submit('TR_SCHART', Scheduler.PRIORITY_NORMAL, fail)
+    scheduler.submit('TR_SCHART', Scheduler.PRIORITY_NORMAL, lambda: sent.append('ok'))
+    assert sent == ['ok'] and scheduler.n_dispatched == 2
@@ -0,0 +1,24 @@
+from conftest import api
+
+
+def test_rebalance_rolls_back_when_unregistering_from_hot_shard_fails():
+    manager = api.Shard.RealtimeManager(n_shards=1, max_shards=2, max_load=10, rebalance_interval=None,
+                                        owner='test_shard')
+    assert manager.register('SC', ['005930', '000660']) == []
+    hot = manager.shards[0]
+    manager.rates = {key: 100. for key in hot.keys}
+
+    control = hot.indi_instance
+    dynamic_call = control.dynamicCall
+    control.dynamicCall = lambda signature, *args: \
+        False if signature.startswith("UnRequestRTReg") else dynamic_call(signature, *args)
+
+    assert manager.rebalance() == 0
+    cold = manager.shards[1]
+    assert hot.keys == {('SC', '005930'), ('SC', '000660')} and not cold.keys
+    assert not cold.indi_instance._rtD.get('SC')
+    assert manager.get('SC', '005930') is hot.realtime_insts['SC']
+
+    control.dynamicCall = dynamic_call
+    assert manager.rebalance() == 1
+    assert len(hot.keys) == 1 and len(cold.keys) == 1
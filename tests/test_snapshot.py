@@ -0,0 +1,23 @@
+import numpy as np
+
+from conftest import api
+
+_DTYPE = np.dtype([('단축코드', 'U6'), ('종목명', 'U20')])
+
+
+def test_empty_last_table(tmp_path):
+    snap_dir = str(tmp_path)
+    stocks = np.array([('005930', '삼성전자'), ('000660', 'SK하이닉스')], dtype=_DTYPE)
+    api.Snapshot.write_snapshot({'stock_mst': stocks, 'elw_mst': np.empty([0], dtype=_DTYPE)}, snap_dir)
+
+    snap = api.Snapshot.MasterSnapshot(snap_dir)
+    assert snap['stock_mst'].tolist() == stocks.tolist()
+    assert len(snap['elw_mst']) == 0 and snap['elw_mst'].dtype == _DTYPE
+    assert snap.row('elw_mst', '005930') is None
+    assert snap.row('stock_mst', '000660')['종목명'] == 'SK하이닉스'
+
+
+def test_all_tables_empty(tmp_path):
+    snap_dir = str(tmp_path)
+    api.Snapshot.write_snapshot({'stock_mst': np.empty([0], dtype=_DTYPE)}, snap_dir)
+    assert len(api.Snapshot.MasterSnapshot(snap_dir)['stock_mst']) == 0
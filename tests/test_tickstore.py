@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from conftest import api
+
+TickStore = api.TickStore
+
+_DTYPE = np.dtype([('단축코드', 'U6'), ('현재가', np.uint32)])
+
+
+def _tick(code: str, price: int) -> np.void:
+    return np.array([(code, price)], dtype=_DTYPE)[0]
+
+
+def _prices(ticks: np.ndarray) -> list:
+    return ticks['현재가'].tolist()
+
+
+def test_ring_keeps_last_size_ticks_across_wraparound():
+    ring = TickStore.TickRing(_DTYPE, 4)
+    assert len(ring) == 0 and ring.latest() is None and _prices(ring.last(3)) == []
+    assert [ring.append(('005930', 100 + i), float(i)) for i in range(6)] == list(range(6))
+
+    assert len(ring) == 4 and ring.first_seq == 2 and ring.seq == 6
+    assert ring.latest()['현재가'] == 105 and ring.latest()[TickStore.RCV_TIME_FIELD] == 5.
+    assert _prices(ring.last(10)) == [102, 103, 104, 105]     # 끝에서 처음으로 이어지는 구간은 복사본
+    assert _prices(ring.last(3)) == [103, 104, 105]
+    assert ring.last(3)[TickStore.RCV_TIME_FIELD].tolist() == [3., 4., 5.]
+
+
+def test_ring_last_is_view_when_contiguous():
+    ring = TickStore.TickRing(_DTYPE, 4)
+    for i in range(6):
+        ring.append(('005930', i), float(i))
+    contiguous, wrapped = ring.last(2), ring.last(4)
+    assert np.shares_memory(contiguous, ring._buf) and not np.shares_memory(wrapped, ring._buf)
+    ring.append(('005930', 99), 6.)
+    assert _prices(wrapped) == [2, 3, 4, 5]
+
+
+def test_ring_since_skips_overwritten_ticks():
+    ring = TickStore.TickRing(_DTYPE, 4)
+    ticks, next_seq = ring.since(0)
+    assert _prices(ticks) == [] and next_seq == 0
+    for i in range(3):
+        ring.append(('005930', i), float(i))
+    ticks, next_seq = ring.since(next_seq)
+    assert _prices(ticks) == [0, 1, 2] and next_seq == 3
+    for i in range(3, 10):
+        ring.append(('005930', i), float(i))
+    ticks, next_seq = ring.since(next_seq)      # 3 ~ 5는 덮어써졌다.
+    assert _prices(ticks) == [6, 7, 8, 9] and next_seq == 10
+    ring.append(('005930', 10), 10.)
+    assert _prices(ring.since(next_seq)[0]) == [10]
+    assert _prices(ring.since(11)[0]) == []
+
+
+def test_ring_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        TickStore.TickRing(_DTYPE, 0)
+
+
+def _brute_asof_rows(codes: list, rcv_times: list, n_codes: int, t: float) -> list:
+    rows = [-1] * n_codes
+    for i, (ci, rcv_time) in enumerate(zip(codes, rcv_times)):
+        if rcv_time <= t:
+            rows[ci] = i
+    return rows
+
+
+def test_arena_asof_rows_matches_full_scan_across_checkpoints():
+    rng = np.random.default_rng(0)
+    arena = TickStore.TickArena(_DTYPE, capacity=4, checkpoint_rows=8)
+    names = [f'{i:06d}' for i in range(12)]
+    code_idx, rcv_times, rcv_time = [], [], 0.
+    for i in range(100):
+        code = names[min(int(rng.integers(0, 4 + i // 10)), len(names) - 1)]      # 새 code가 점점 나타난다.
+        rcv_time += float(rng.integers(0, 2))        # 같은 수신시각도 있다.
+        arena.append(_tick(code, i), rcv_time)
+        code_idx.append(arena.code_index(code))
+        rcv_times.append(rcv_time)
+    assert len(arena._checkpoints) == 100 // 8
+
+    for t in [-1., rcv_times[-1], rcv_times[-1] + 1.] + sorted(set(rcv_times)) + [x + 0.5 for x in rcv_times[::7]]:
+        expected = _brute_asof_rows(code_idx, rcv_times, len(arena.codes), t)
+        assert arena.asof_rows(t).tolist() == expected, t
+    assert arena.asof_rows(rcv_times[-1]).tolist() == arena.latest_rows.tolist()
+
+
+def test_arena_asof_and_movers():
+    arena = TickStore.TickArena(_DTYPE, checkpoint_rows=2)
+    for code, price, rcv_time in (('A', 100, 0.), ('B', 200, 1.), ('A', 103, 30.), ('C', 50, 40.), ('B', 201, 60.)):
+        arena.append(_tick(code, price), rcv_time)
+    assert arena.codes == ['A', 'B', 'C']
+    base = arena.asof('현재가', 0.5)
+    assert base[0] == 100 and np.isnan(base[1:]).all()
+    assert arena.latest('현재가').tolist() == [103, 201, 50]
+
+    codes, change = arena.movers('현재가', window=59.5, threshold=0.02)
+    assert codes.tolist() == ['A'] and change.tolist() == pytest.approx([0.03])
+    codes, _ = arena.movers('현재가', window=59., threshold=0.001, now=60.)
+    assert codes.tolist() == ['A', 'B']
+
+
+def test_conflator_keeps_latest_tick_per_code():
+    conflator = TickStore.Conflator(_DTYPE, capacity=2)
+    for code, price, rcv_time in (('A', 100, 0.), ('B', 200, 1.), ('A', 101, 2.), ('C', 300, 3.)):     # C에서 slot을 늘린다.
+        conflator.update(_tick(code, price), rcv_time)
+    assert conflator.codes == ['A', 'B', 'C'] and len(conflator) == 3
+    latest = conflator.latest()
+    assert _prices(latest) == [101, 200, 300] and latest[TickStore.RCV_TIME_FIELD].tolist() == [2., 1., 3.]
+    assert conflator.update(_tick('X', 1), 4., code='B') == 1       # code를 주면 tick의 code field 대신 사용한다.
+    assert _prices(conflator.latest()) == [101, 1, 300]
+
+
+def test_conflated_readers_drain_independently():
+    conflator = TickStore.Conflator(_DTYPE, capacity=2)
+    conflator.update(_tick('A', 100), 0.)
+    early = conflator.reader()
+    codes, ticks = early.drain()        # 첫 drain()은 이미 수신된 모든 code
+    assert codes == ['A'] and _prices(ticks) == [100]
+    assert early.drain()[0] == [] and early.n_dirty == 0
+
+    for code, price in (('B', 200), ('A', 101), ('A', 102), ('C', 300)):
+        conflator.update(_tick(code, price), 1.)
+    late = conflator.reader()
+    assert early.n_dirty == 3
+    codes, ticks = early.drain()
+    assert codes == ['A', 'B', 'C'] and _prices(ticks) == [102, 200, 300]
+    ticks['현재가'] = 0     # 복사본
+    assert _prices(conflator.latest()) == [102, 200, 300]
+
+    conflator.update(_tick('B', 201), 2.)
+    assert early.drain()[0] == ['B']
+    assert late.drain()[0] == ['A', 'B', 'C']
+
+    late.close()
+    conflator.update(_tick('C', 301), 3.)
+    assert late.n_dirty == 0 and early.drain()[0] == ['C']